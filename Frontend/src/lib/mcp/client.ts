@@ -69,6 +69,69 @@ export class MCPClient {
         }
     }
 
+    /**
+     * Stream a *_list tool as NDJSON records
+     * Calls onItem for every record as it arrives so large lists render progressively
+     * Returns the number of records received
+     */
+    async streamTool(
+        toolName: string,
+        arguments_: Record<string, any>,
+        jwt: string,
+        onItem: (item: any) => void
+    ): Promise<number> {
+        const response = await fetch(`${this.baseUrl}/mcp/call-tool/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'application/x-ndjson',
+                'Authorization': `Bearer ${jwt}`,
+            },
+            body: JSON.stringify({
+                tool_name: toolName,
+                arguments: arguments_,
+            }),
+        });
+
+        if (!response.ok || !response.body) {
+            const errorData = await response.json().catch(() => ({}));
+            throw new Error(errorData.detail || `MCP stream failed: ${response.statusText}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let count = 0;
+
+        const handleLine = (line: string) => {
+            if (!line.trim()) return;
+            const event = JSON.parse(line);
+            if (event.type === 'item') {
+                count++;
+                onItem(event.data);
+            } else if (event.type === 'error') {
+                throw new Error(event.message);
+            }
+        };
+
+        try {
+            while (true) {
+                const { done, value } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                const lines = buffer.split('\n');
+                buffer = lines.pop() ?? '';
+                lines.forEach(handleLine);
+            }
+            handleLine(buffer + decoder.decode());
+        } finally {
+            // Release the connection when an error event or onItem throws mid-stream
+            await reader.cancel().catch(() => undefined);
+        }
+
+        return count;
+    }
+
     /**
      * List all available MCP tools (56 CRM tools)
      */
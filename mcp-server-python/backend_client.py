@@ -0,0 +1,281 @@
+"""
+Shared Backend HTTP Client for MCP Servers
+One pooled, long-lived httpx.AsyncClient per server instance
+"""
+
+import os
+import time
+import asyncio
+import logging
+import importlib.util
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Dict
+
+import httpx
+
+from resilience import (
+    RETRY_STATUSES,
+    FAILURE_STATUSES,
+    OPEN,
+    BackendTimeout,
+    ResiliencePolicy,
+    endpoint_family,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _env_flag(name: str, default: str = "false") -> bool:
+    """Read a boolean flag from the environment"""
+    return os.getenv(name, default).strip().lower() in ("1", "true", "yes", "on")
+
+
+class BackendClient:
+    """
+    Pooled HTTP client for the NestJS backend
+
+    Connections are reused across tool calls instead of paying TCP/TLS
+    setup on every request. Both transports share one instance; the
+    underlying client is reference counted so it is only closed once the
+    last transport shuts down.
+
+    Every request goes through the resilience policy: per-family circuit
+    breakers, adaptive timeouts and jittered retries for GETs.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        timeout: float = 30.0,
+        connect_timeout: float = 5.0,
+        resilience: Optional[ResiliencePolicy] = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.connect_timeout = connect_timeout
+        self.resilience = resilience or ResiliencePolicy(enabled=False, max_timeout=timeout)
+        self.http2 = http2 and self._http2_available()
+        self._client: Optional[httpx.AsyncClient] = None
+        self._users = 0
+        # Requests currently holding a pool connection (for metrics)
+        self.active = 0
+
+    @classmethod
+    def from_env(cls, base_url: str) -> "BackendClient":
+        """
+        Build a client from MCP_HTTP_* / MCP_BACKEND_* environment variables
+
+        Args:
+            base_url: Backend API root (e.g. http://localhost:3001/api)
+        """
+        timeout = float(os.getenv("MCP_BACKEND_TIMEOUT", "30"))
+        return cls(
+            base_url,
+            max_connections=int(os.getenv("MCP_HTTP_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("MCP_HTTP_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.getenv("MCP_HTTP_KEEPALIVE_EXPIRY", "30")),
+            http2=_env_flag("MCP_HTTP2"),
+            timeout=timeout,
+            connect_timeout=float(os.getenv("MCP_BACKEND_CONNECT_TIMEOUT", "5")),
+            resilience=ResiliencePolicy.from_env(max_timeout=timeout),
+        )
+
+    @staticmethod
+    def _http2_available() -> bool:
+        """HTTP/2 needs the optional 'h2' package (pip install httpx[http2])"""
+        if importlib.util.find_spec("h2") is None:
+            logger.warning("⚠️  MCP_HTTP2 requested but 'h2' is not installed - using HTTP/1.1")
+            return False
+        return True
+
+    # ==================== LIFECYCLE ====================
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                limits=self.limits,
+                timeout=self.timeout,
+                http2=self.http2,
+            )
+            logger.info(
+                f"🔌 Backend pool ready: max={self.limits.max_connections} "
+                f"keepalive={self.limits.max_keepalive_connections} "
+                f"http2={self.http2}"
+            )
+        return self._client
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """Underlying httpx client (created on first use)"""
+        return self._ensure_client()
+
+    async def open(self) -> None:
+        """Register a transport as a user of the pool (called on startup)"""
+        self._users += 1
+        self._ensure_client()
+
+    async def close(self) -> None:
+        """Release a transport; the pool is closed when the last one leaves"""
+        self._users = max(0, self._users - 1)
+        if self._users == 0 and self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            logger.info("🔌 Backend pool closed")
+
+    # ==================== REQUESTS ====================
+
+    def _timeout(self, family: str, override: Optional[float]) -> httpx.Timeout:
+        seconds = override if override is not None else self.resilience.timeout_for(family)
+        return httpx.Timeout(seconds, connect=min(self.connect_timeout, seconds))
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        jwt: Optional[str] = None,
+        json: Any = None,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: Optional[float] = None,
+    ) -> httpx.Response:
+        """
+        Send a request to the backend over the shared pool
+
+        Args:
+            method: HTTP method (GET, POST, PATCH, DELETE)
+            path: Path relative to the backend API root (e.g. /contacts)
+            jwt: Bearer token forwarded to the backend
+            json: JSON body for POST/PATCH requests
+            params: Query string parameters
+            headers: Extra request headers
+            timeout: Per-call timeout override in seconds (default: adaptive)
+
+        Returns:
+            httpx.Response
+
+        Raises:
+            BackendUnavailable: The endpoint family's circuit is open
+            BackendTimeout: Every attempt timed out
+        """
+        request_headers = dict(headers) if headers else {}
+        if jwt:
+            request_headers["Authorization"] = f"Bearer {jwt}"
+
+        policy = self.resilience
+        family = endpoint_family(path)
+        attempts = 1 + (policy.retries if policy.enabled and method == "GET" else 0)
+        for attempt in range(1, attempts + 1):
+            if policy.enabled:
+                policy.breaker(family).before_request()
+            request_timeout = self._timeout(family, timeout)
+            started = time.perf_counter()
+            self.active += 1
+            try:
+                response = await self.client.request(
+                    method,
+                    path,
+                    json=json,
+                    params=params,
+                    headers=request_headers,
+                    timeout=request_timeout,
+                )
+            except httpx.TransportError as e:
+                timed_out = isinstance(e, httpx.TimeoutException)
+                policy.record(family, time.perf_counter() - started, failed=True, timed_out=timed_out)
+                if attempt < attempts and self._may_retry(family):
+                    await self._retry_pause(family, attempt, e)
+                    continue
+                if timed_out:
+                    raise BackendTimeout(family, request_timeout.read or 0.0) from e
+                raise
+            finally:
+                self.active -= 1
+
+            status = response.status_code
+            policy.record(family, time.perf_counter() - started, failed=status in FAILURE_STATUSES)
+            if status in RETRY_STATUSES and attempt < attempts and self._may_retry(family):
+                await self._retry_pause(family, attempt, f"HTTP {status}")
+                continue
+            return response
+
+    def _may_retry(self, family: str) -> bool:
+        """No retry once the failure just recorded opened the circuit"""
+        return self.resilience.breaker(family).state != OPEN
+
+    async def _retry_pause(self, family: str, attempt: int, reason: Any) -> None:
+        delay = self.resilience.backoff(attempt)
+        self.resilience.retried += 1
+        logger.debug(f"🔁 Retrying {family} GET (attempt {attempt + 1}) in {delay * 1000:.0f}ms: {reason!r}")
+        await asyncio.sleep(delay)
+
+    @asynccontextmanager
+    async def stream(
+        self,
+        method: str,
+        path: str,
+        jwt: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Streaming variant of request() - the body is read incrementally
+
+        The breaker records one outcome per call when the block exits: a
+        failure if the connection breaks off, otherwise by the response status.
+
+        Usage:
+            async with backend.stream("GET", "/contacts", jwt=jwt) as response:
+                async for chunk in response.aiter_bytes():
+                    ...
+        """
+        headers = {"Authorization": f"Bearer {jwt}"} if jwt else {}
+        policy = self.resilience
+        family = endpoint_family(path)
+        if policy.enabled:
+            policy.breaker(family).before_request()
+        started = time.perf_counter()
+        latency: Optional[float] = None   # time to response headers (the body may stream for long)
+        failed = False
+        broken: Optional[httpx.TransportError] = None
+        self.active += 1
+        try:
+            async with self.client.stream(
+                method,
+                path,
+                params=params,
+                headers=headers,
+                timeout=self._timeout(family, timeout),
+            ) as response:
+                latency = time.perf_counter() - started
+                failed = response.status_code in FAILURE_STATUSES
+                yield response
+        except httpx.TransportError as e:
+            broken = e
+            raise
+        finally:
+            self.active -= 1
+            if broken is not None:
+                # A body that breaks off fails the call even after good headers
+                policy.record(family, time.perf_counter() - started, failed=True,
+                              timed_out=isinstance(broken, httpx.TimeoutException))
+            elif latency is not None:
+                policy.record(family, latency, failed=failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool utilization for /health and metrics"""
+        max_connections = self.limits.max_connections or 0
+        return {
+            "active": self.active,
+            "max_connections": max_connections,
+            "utilization": round(self.active / max_connections, 4) if max_connections else 0.0,
+        }
@@ -0,0 +1,193 @@
+"""
+Batch Tool Execution for Multi-Step Chatbot Workflows
+Runs an ordered list of tool calls in one round trip
+
+Steps may reference earlier results with "$<step>.<path>", e.g.
+"$0.id" or "$1.0.stages.2.id". Only an argument value that is exactly
+one reference is substituted - "$2 million renewal" is ordinary text -
+and "$$0.id" passes the literal "$0.id". Independent reads run
+concurrently; writes run in order after every earlier step.
+"""
+
+import re
+import time
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MAX_BATCH_STEPS = 20
+
+_REFERENCE = re.compile(r"\$(\d+)((?:\.[\w-]+)*)")
+_ESCAPED_REFERENCE = re.compile(r"\$(\$\d+(?:\.[\w-]+)*)")
+
+# (tool_name, arguments) -> (ok, data or error message)
+StepExecutor = Callable[[str, Dict[str, Any]], Awaitable[Tuple[bool, Any]]]
+
+
+class BatchError(ValueError):
+    """Invalid batch request (bad step, bad reference)"""
+
+
+def is_reference(value: Any) -> bool:
+    """True for a string that is exactly one "$N.path" reference"""
+    return isinstance(value, str) and _REFERENCE.fullmatch(value) is not None
+
+
+def find_references(value: Any) -> Set[int]:
+    """Collect the step indexes referenced anywhere inside an argument value"""
+    if isinstance(value, str):
+        whole = _REFERENCE.fullmatch(value)
+        return {int(whole.group(1))} if whole else set()
+    if isinstance(value, dict):
+        return set().union(*(find_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(find_references(v) for v in value)) if value else set()
+    return set()
+
+
+def _lookup(data: Any, path: str, reference: str) -> Any:
+    for part in filter(None, path.split(".")):
+        if isinstance(data, list) and part.lstrip("-").isdigit():
+            try:
+                data = data[int(part)]
+            except IndexError:
+                raise BatchError(f"{reference}: index {part} out of range")
+        elif isinstance(data, dict) and part in data:
+            data = data[part]
+        else:
+            raise BatchError(f"{reference}: field '{part}' not found")
+    return data
+
+
+def resolve_references(value: Any, results: List[Any]) -> Any:
+    """
+    Substitute "$N.path" references with data from earlier steps
+
+    Only a string that is exactly one reference is replaced, keeping the
+    referenced type (numbers stay numbers); other text is left alone and
+    an escaped "$$N.path" becomes the literal "$N.path".
+    """
+    if isinstance(value, str):
+        whole = _REFERENCE.fullmatch(value)
+        if whole:
+            return _lookup(results[int(whole.group(1))], whole.group(2), value)
+        escaped = _ESCAPED_REFERENCE.fullmatch(value)
+        return escaped.group(1) if escaped else value
+    if isinstance(value, dict):
+        return {k: resolve_references(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, results) for v in value]
+    return value
+
+
+def plan_dependencies(steps: List[Dict[str, Any]], is_read: Callable[[str], bool]) -> List[Set[int]]:
+    """
+    Work out which earlier steps each step must wait for
+
+    - explicit "$N" references
+    - a write waits for every earlier step (keeps side effects ordered)
+    - a read waits for earlier writes (so it observes them)
+    """
+    plan: List[Set[int]] = []
+    for index, step in enumerate(steps):
+        deps = find_references(step.get("arguments", {}))
+        invalid = [d for d in deps if d >= index]
+        if invalid:
+            raise BatchError(f"Step {index} references step {invalid[0]}, which has not run yet")
+
+        if is_read(step["tool_name"]):
+            deps |= {j for j in range(index) if not is_read(steps[j]["tool_name"])}
+        else:
+            deps |= set(range(index))
+        plan.append(deps)
+    return plan
+
+
+async def run_batch(
+    steps: List[Dict[str, Any]],
+    execute: StepExecutor,
+    is_read: Callable[[str], bool],
+) -> Dict[str, Any]:
+    """
+    Execute a batch of tool calls
+
+    Args:
+        steps: [{"tool_name": str, "arguments": dict}, ...] in order
+            (missing or null arguments mean {})
+        execute: Runs one tool call, returns (ok, data or error)
+        is_read: True when a tool has no side effects
+
+    Returns:
+        {"results": [...per-step result with timing...], "elapsedMs": float}
+    """
+    if not steps:
+        raise BatchError("Batch must contain at least one call")
+    if len(steps) > MAX_BATCH_STEPS:
+        raise BatchError(f"Batch is limited to {MAX_BATCH_STEPS} calls")
+    for index, step in enumerate(steps):
+        if not isinstance(step, dict) or not isinstance(step.get("tool_name"), str):
+            raise BatchError(f"Step {index} needs a tool_name")
+        if step.get("arguments") is not None and not isinstance(step["arguments"], dict):
+            raise BatchError(f"Step {index} arguments must be an object")
+    steps = [{"tool_name": step["tool_name"], "arguments": step.get("arguments") or {}} for step in steps]
+
+    plan = plan_dependencies(steps, is_read)
+    started = time.perf_counter()
+    data: List[Any] = [None] * len(steps)
+    results: List[Dict[str, Any]] = [{} for _ in steps]
+    tasks: List["asyncio.Task[bool]"] = []
+
+    async def run_step(index: int) -> bool:
+        step = steps[index]
+        deps = plan[index]
+        if deps:
+            outcomes = await asyncio.gather(*(tasks[d] for d in sorted(deps)))
+            failed = [d for d, ok in zip(sorted(deps), outcomes) if not ok]
+            if failed:
+                results[index] = {
+                    "index": index,
+                    "tool_name": step["tool_name"],
+                    "ok": False,
+                    "error": f"Skipped: step {failed[0]} failed",
+                    "startMs": None,
+                    "elapsedMs": 0.0,
+                }
+                return False
+
+        step_start = time.perf_counter()
+        try:
+            arguments = resolve_references(step["arguments"], data)
+            ok, payload = await execute(step["tool_name"], arguments)
+        except BatchError as e:
+            ok, payload = False, str(e)
+        except Exception as e:
+            # One broken step fails alone instead of the whole batch
+            logger.error(f"❌ Batch step {index} ({step['tool_name']}) failed: {e}")
+            ok, payload = False, f"Error: {e}"
+        step_end = time.perf_counter()
+
+        result: Dict[str, Any] = {
+            "index": index,
+            "tool_name": step["tool_name"],
+            "ok": ok,
+            "startMs": round((step_start - started) * 1000, 2),
+            "elapsedMs": round((step_end - step_start) * 1000, 2),
+        }
+        if ok:
+            data[index] = payload
+            result["data"] = payload
+        else:
+            result["error"] = payload
+        results[index] = result
+        return ok
+
+    for index in range(len(steps)):
+        tasks.append(asyncio.ensure_future(run_step(index)))
+    await asyncio.gather(*tasks)
+
+    return {
+        "results": results,
+        "elapsedMs": round((time.perf_counter() - started) * 1000, 2),
+    }
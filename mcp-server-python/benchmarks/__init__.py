@@ -0,0 +1,4 @@
+"""
+Synapse MCP Server Benchmarks
+Run from mcp-server-python/, e.g. python -m benchmarks.bench_workers
+"""
@@ -0,0 +1,282 @@
+"""
+Performance Baselines and Regression Reports
+Versioned JSON results of bench_server and a significance-tested compare
+
+A baseline holds, per (transport, tool): raw latency samples, throughput
+of each repeat, server RSS and - for the in-process pass - allocation
+figures, plus the git commit, host and benchmark arguments it came from.
+
+compare flags a regression only when it is both significant and large:
+- latency: Mann-Whitney U on the samples (p < --alpha) and median
+  slower by more than --threshold; p95 uses a test on the tail (how
+  often the head exceeds the base's p95) with the same threshold
+- throughput: Welch's t-test over repeats (needs --repeat >= 2) and
+  lower by more than --threshold
+- peak memory / allocations: larger by more than --memory-threshold
+  (these are near-deterministic, so no test is applied)
+
+Usage:
+    python -m benchmarks.bench_server --repeat 3 --allocations --save main
+    python -m benchmarks.bench_server --repeat 3 --allocations --save my-change
+    python -m benchmarks.baselines compare main my-change
+    python -m benchmarks.baselines list
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import platform
+import argparse
+import subprocess
+import statistics
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+BASELINE_DIR = Path(__file__).resolve().parent / "baselines"
+SCHEMA_VERSION = 1
+
+
+# ==================== STORAGE ====================
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BASELINE_DIR.parent,
+            capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def baseline_path(name: str) -> Path:
+    """A bare name lives in benchmarks/baselines/; anything with a suffix or slash is a path"""
+    path = Path(name)
+    return path if path.suffix or len(path.parts) > 1 else BASELINE_DIR / f"{name}.json"
+
+
+def save_baseline(name: str, results: List[Dict[str, Any]], args: Dict[str, Any]) -> Path:
+    """Write results with the metadata needed to judge comparisons"""
+    path = baseline_path(name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    document = {
+        "schema": SCHEMA_VERSION,
+        "name": path.stem,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "commit": _git_commit(),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+        },
+        "args": args,
+        "results": results,
+    }
+    path.write_text(json.dumps(document, indent=1))
+    return path
+
+
+def load_baseline(name: str) -> Dict[str, Any]:
+    path = baseline_path(name)
+    document = json.loads(path.read_text())
+    if document.get("schema") != SCHEMA_VERSION:
+        raise SystemExit(f"{path}: baseline schema {document.get('schema')} (expected {SCHEMA_VERSION}) - re-run it")
+    return document
+
+
+# ==================== STATISTICS ====================
+
+def _normal_sf(z: float) -> float:
+    """P(Z > z) for a standard normal"""
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _betainc(a: float, b: float, x: float) -> float:
+    """Regularized incomplete beta I_x(a, b) (Lentz continued fraction)"""
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - _betainc(b, a, 1 - x)
+    front = math.exp(math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)) / a
+    tiny = 1e-300
+    c, d = 1.0, 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    result = d
+    for m in range(1, 200):
+        for numerator in (
+            m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+            -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1)),
+        ):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            result *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return front * result
+
+
+def mann_whitney(a: List[float], b: List[float]) -> float:
+    """Two-sided p-value of Mann-Whitney U (normal approximation with tie correction)"""
+    n1, n2 = len(a), len(b)
+    if n1 < 2 or n2 < 2:
+        return 1.0
+    pooled = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    ranks_a = 0.0
+    ties = 0.0
+    i = 0
+    while i < len(pooled):
+        j = i
+        while j + 1 < len(pooled) and pooled[j + 1][0] == pooled[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        ranks_a += rank * sum(1 for k in range(i, j + 1) if pooled[k][1] == 0)
+        size = j - i + 1
+        ties += size ** 3 - size
+        i = j + 1
+    u = ranks_a - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    variance = n1 * n2 / 12 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (abs(u - n1 * n2 / 2) - 0.5) / math.sqrt(variance)
+    return min(1.0, 2 * _normal_sf(max(0.0, z)))
+
+
+def tail_shift(a: List[float], b: List[float], pct: float = 95) -> float:
+    """
+    Two-sided p-value that b exceeds a's pct-th percentile as often as a does
+
+    A two-proportion z-test on the tail, so a p95 verdict rests on the
+    tail itself rather than on a shift of the whole distribution.
+    """
+    if len(a) < 20 or len(b) < 20:
+        return 1.0
+    cut = sorted(a)[min(len(a) - 1, int(len(a) * pct / 100))]
+    pa = sum(1 for value in a if value > cut) / len(a)
+    pb = sum(1 for value in b if value > cut) / len(b)
+    pooled = (pa * len(a) + pb * len(b)) / (len(a) + len(b))
+    spread = math.sqrt(pooled * (1 - pooled) * (1 / len(a) + 1 / len(b)))
+    if spread == 0:
+        return 1.0
+    return min(1.0, 2 * _normal_sf(abs(pb - pa) / spread))
+
+
+def welch(a: List[float], b: List[float]) -> Optional[float]:
+    """Two-sided p-value of Welch's t-test (None with fewer than 2 values per side)"""
+    if len(a) < 2 or len(b) < 2:
+        return None
+    va, vb = statistics.variance(a) / len(a), statistics.variance(b) / len(b)
+    if va + vb == 0:
+        return 1.0 if statistics.mean(a) == statistics.mean(b) else 0.0
+    t = abs(statistics.mean(a) - statistics.mean(b)) / math.sqrt(va + vb)
+    df = (va + vb) ** 2 / (va ** 2 / (len(a) - 1) + vb ** 2 / (len(b) - 1))
+    return min(1.0, _betainc(df / 2, 0.5, df / (df + t * t)))
+
+
+def _change(old: Optional[float], new: Optional[float]) -> Optional[float]:
+    if old is None or new is None or old == 0:
+        return None
+    return (new - old) / old
+
+
+# ==================== COMPARISON ====================
+
+def compare(
+    base: Dict[str, Any],
+    head: Dict[str, Any],
+    alpha: float = 0.01,
+    threshold: float = 0.05,
+    memory_threshold: float = 0.10,
+) -> List[Dict[str, Any]]:
+    """
+    One finding per (transport, tool, metric) present in both baselines
+
+    Returns:
+        Dicts with metric, old, new, change, p and verdict
+        ("regression", "improvement" or "same")
+    """
+    def index(document: Dict[str, Any]) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        return {(r["transport"], r["tool"]): r for r in document["results"]}
+
+    old_results, new_results = index(base), index(head)
+    findings = []
+    for key in sorted(old_results.keys() & new_results.keys()):
+        old, new = old_results[key], new_results[key]
+
+        def add(metric: str, old_value, new_value, p: Optional[float], worse_if_higher: bool, limit: float) -> None:
+            change = _change(old_value, new_value)
+            verdict = "same"
+            if change is not None and (p is None or p < alpha) and abs(change) > limit:
+                worse = change > 0 if worse_if_higher else change < 0
+                verdict = "regression" if worse else "improvement"
+            findings.append({
+                "transport": key[0], "tool": key[1], "metric": metric,
+                "old": old_value, "new": new_value, "change": change, "p": p, "verdict": verdict,
+            })
+
+        if old.get("samples_ms") and new.get("samples_ms"):
+            p = mann_whitney(old["samples_ms"], new["samples_ms"])
+            add("p50_ms", statistics.median(old["samples_ms"]), statistics.median(new["samples_ms"]), p, True, threshold)
+            add("p95_ms", old.get("p95_ms"), new.get("p95_ms"),
+                tail_shift(old["samples_ms"], new["samples_ms"]), True, threshold)
+        if old.get("rps_runs") and new.get("rps_runs"):
+            p = welch(old["rps_runs"], new["rps_runs"])
+            # A single run cannot show significance - report it, never flag it
+            add("rps", statistics.mean(old["rps_runs"]), statistics.mean(new["rps_runs"]),
+                p if p is not None else 1.0, False, threshold)
+        for metric in ("peak_rss_mb", "alloc_peak_kb", "retained_kb"):
+            if old.get(metric) is not None and new.get(metric) is not None:
+                add(metric, old[metric], new[metric], None, True, memory_threshold)
+    return findings
+
+
+def print_report(base: Dict[str, Any], head: Dict[str, Any], findings: List[Dict[str, Any]], show_all: bool) -> None:
+    print(f"base: {base['name']} ({base.get('commit') or '?'}, {base['created']})")
+    print(f"head: {head['name']} ({head.get('commit') or '?'}, {head['created']})")
+    if base.get("host") != head.get("host"):
+        print("⚠️  baselines come from different hosts - differences may not be the code")
+    shown = [f for f in findings if show_all or f["verdict"] != "same"]
+    if not shown:
+        print("\nNo significant changes.")
+        return
+    print(f"\n{'transport':<9} {'tool':<22} {'metric':<14} {'old':>10} {'new':>10} {'change':>8} {'p':>8}  verdict")
+    for f in shown:
+        change = f"{f['change']:+.1%}" if f["change"] is not None else "n/a"
+        p = f"{f['p']:.3g}" if f["p"] is not None else "-"
+        print(f"{f['transport']:<9} {f['tool']:<22} {f['metric']:<14} {f['old']:>10.2f} {f['new']:>10.2f} "
+              f"{change:>8} {p:>8}  {f['verdict']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark baselines")
+    commands = parser.add_subparsers(dest="command", required=True)
+    cmp = commands.add_parser("compare", help="Flag significant regressions between two baselines")
+    cmp.add_argument("base", help="Baseline name (benchmarks/baselines/<name>.json) or path")
+    cmp.add_argument("head", help="Baseline name or path to judge against base")
+    cmp.add_argument("--alpha", type=float, default=0.01, help="Significance level")
+    cmp.add_argument("--threshold", type=float, default=0.05, help="Minimum latency/throughput change")
+    cmp.add_argument("--memory-threshold", type=float, default=0.10, help="Minimum memory/allocation change")
+    cmp.add_argument("--all", action="store_true", help="Also list unchanged metrics")
+    commands.add_parser("list", help="List saved baselines")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for path in sorted(BASELINE_DIR.glob("*.json")):
+            document = json.loads(path.read_text())
+            print(f"{path.stem:<24} {document.get('created', '?'):<22} {document.get('commit') or '?':<10} "
+                  f"{len(document.get('results', []))} results")
+        return
+
+    base, head = load_baseline(args.base), load_baseline(args.head)
+    findings = compare(base, head, args.alpha, args.threshold, args.memory_threshold)
+    print_report(base, head, findings, args.all)
+    sys.exit(1 if any(f["verdict"] == "regression" for f in findings) else 0)
+
+
+if __name__ == "__main__":
+    main()
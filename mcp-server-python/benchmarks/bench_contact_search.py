@@ -0,0 +1,57 @@
+"""
+Local Contact Search Benchmark
+Index build time and query latency of the trigram contact index
+
+Queries cover exact names, typos, emails, phone fragments and broad
+company terms; latency is reported as p50/p95 per query kind.
+
+Usage:
+    python -m benchmarks.bench_contact_search --sizes 1000,10000
+"""
+
+import time
+import argparse
+import statistics
+
+from contact_search import TenantContacts
+from benchmarks.mock_backend import make_contacts
+
+QUERIES = {
+    "exact name": "First{n} Last{n}",
+    "typo": "Frist{n} Lats{n}",
+    "email": "user{n}@example",
+    "phone": "555 {n:07d}",
+    "broad": "company",
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local contact search benchmark")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated contact counts")
+    parser.add_argument("--queries", type=int, default=200, help="Queries per kind")
+    args = parser.parse_args()
+
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        contacts = make_contacts(size)
+        index = TenantContacts(max_contacts=size)
+        started = time.perf_counter()
+        index.replace_all(contacts)
+        build_ms = (time.perf_counter() - started) * 1000
+
+        print(f"\n{size} contacts: build {build_ms:.0f} ms, {len(index.postings)} trigrams")
+        print(f"{'query':<12} {'p50 us':>9} {'p95 us':>9} {'top hit':>8}")
+        for kind, template in QUERIES.items():
+            samples, hits = [], 0
+            for i in range(args.queries):
+                n = (i * 7919) % size
+                query = template.format(n=n)
+                started = time.perf_counter()
+                results = index.search(query, limit=25, min_similarity=0.4)
+                samples.append((time.perf_counter() - started) * 1e6)
+                hits += bool(results) and results[0]["id"] == f"contact-{n}"
+            p95 = statistics.quantiles(samples, n=20)[-1]
+            print(f"{kind:<12} {statistics.median(samples):>9.0f} {p95:>9.0f} {hits / args.queries:>7.0%}")
+
+
+if __name__ == "__main__":
+    main()
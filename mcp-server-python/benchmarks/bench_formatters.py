@@ -0,0 +1,207 @@
+"""
+Formatter Microbenchmark
+Streamlined list formatters at 100 / 10k / 100k records: the previous
+string-concatenation versions versus the generator renderers in
+formatters.py (uncapped, and capped at MCP_FORMAT_MAX_RECORDS)
+
+Usage:
+    python -m benchmarks.bench_formatters --sizes 100,10000,100000
+"""
+
+import random
+import timeit
+import argparse
+
+import formatters
+
+
+# ==================== PREVIOUS IMPLEMENTATION (baseline) ====================
+
+
+def format_contacts(contacts: list) -> str:
+    """Format contacts in natural language"""
+    if not contacts:
+        return "📭 No contacts found."
+
+    result = f"📇 **Found {len(contacts)} contact(s):**\n\n"
+    for contact in contacts:
+        result += f"• **{contact.get('firstName', '')} {contact.get('lastName', '')}**\n"
+        if contact.get('email'):
+            result += f"  📧 {contact['email']}\n"
+        if contact.get('phone'):
+            result += f"  📱 {contact['phone']}\n"
+        if contact.get('company'):
+            result += f"  🏢 {contact['company']}"
+            if contact.get('jobTitle'):
+                result += f" - {contact['jobTitle']}"
+            result += "\n"
+
+        # Show related data counts
+        deals_count = len(contact.get('deals', []))
+        tickets_count = len(contact.get('tickets', []))
+        if deals_count or tickets_count:
+            result += f"  💼 {deals_count} deal(s), 🎫 {tickets_count} ticket(s)\n"
+        result += "\n"
+
+    return result.strip()
+
+def format_deals(deals: list) -> str:
+    """Format deals in natural language"""
+    if not deals:
+        return "📭 No deals found."
+
+    result = f"💼 **Found {len(deals)} deal(s):**\n\n"
+    total_value = 0
+
+    for deal in deals:
+        value = float(deal.get('value', 0))
+        total_value += value
+
+        result += f"• **{deal.get('title', 'Untitled')}** - ${value:,.2f}\n"
+
+        contact = deal.get('contact', {})
+        if contact:
+            result += f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')} ({contact.get('company', 'N/A')})\n"
+
+        stage = deal.get('stage', {})
+        pipeline = deal.get('pipeline', {})
+        if stage or pipeline:
+            result += f"  📊 {pipeline.get('name', 'N/A')} → {stage.get('name', 'N/A')}\n"
+
+        if deal.get('probability'):
+            result += f"  🎯 {deal['probability']}% probability\n"
+
+        if deal.get('expectedCloseDate'):
+            result += f"  📅 Expected close: {deal['expectedCloseDate'][:10]}\n"
+
+        result += "\n"
+
+    result += f"💰 **Total pipeline value:** ${total_value:,.2f}"
+    return result
+
+def format_leads(leads: list) -> str:
+    """Format leads in natural language"""
+    if not leads:
+        return "📭 No leads found."
+
+    result = f"🎯 **Found {len(leads)} lead(s):**\n\n"
+
+    for lead in leads:
+        result += f"• **{lead.get('title', 'Untitled')}**\n"
+        result += f"  📌 Status: {lead.get('status', 'N/A')}\n"
+        result += f"  📍 Source: {lead.get('source', 'N/A')}\n"
+
+        if lead.get('value'):
+            result += f"  💵 Value: ${float(lead['value']):,.2f}\n"
+
+        contact = lead.get('contact', {})
+        if contact:
+            result += f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')}\n"
+
+        result += "\n"
+
+    return result.strip()
+
+def format_tickets(tickets: list) -> str:
+    """Format tickets in natural language"""
+    if not tickets:
+        return "📭 No tickets found."
+
+    result = f"🎫 **Found {len(tickets)} ticket(s):**\n\n"
+
+    priority_emoji = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "URGENT": "🔴"}
+    status_emoji = {"OPEN": "🆕", "IN_PROGRESS": "⏳", "RESOLVED": "✅", "CLOSED": "🔒"}
+
+    for ticket in tickets:
+        priority = ticket.get('priority', 'MEDIUM')
+        status = ticket.get('status', 'OPEN')
+
+        result += f"• {priority_emoji.get(priority, '⚪')} **{ticket.get('title', 'Untitled')}**\n"
+        result += f"  {status_emoji.get(status, '⚪')} {status} | Priority: {priority}\n"
+
+        if ticket.get('description'):
+            desc = ticket['description'][:100]
+            result += f"  📝 {desc}{'...' if len(ticket['description']) > 100 else ''}\n"
+
+        contact = ticket.get('contact', {})
+        if contact:
+            result += f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')}\n"
+
+        result += "\n"
+
+    return result.strip()
+
+
+# ==================== DATA ====================
+
+def make_records(count: int, seed: int = 7, embed_related: bool = False):
+    """Synthetic lists; contacts carry _count (or embedded arrays, as the old formatter needed)"""
+    rng = random.Random(seed)
+    contacts, deals, leads, tickets = [], [], [], []
+    for i in range(count):
+        person = {"firstName": f"First{i}", "lastName": f"Last{i}", "company": f"Company {i % 97}"}
+        counts = {"deals": rng.randint(0, 4), "tickets": rng.randint(0, 2)}
+        contact = {
+            "id": f"c{i}", **person, "email": f"user{i}@example.com", "phone": f"+1555{i:07d}",
+            "jobTitle": "Buyer" if i % 3 else None,
+        }
+        if embed_related:
+            contact.update({relation: [{}] * n for relation, n in counts.items()})
+        else:
+            contact["_count"] = counts
+        contacts.append(contact)
+        deals.append({
+            "id": f"d{i}", "title": f"Deal {i}", "value": rng.randint(100, 100000),
+            "contact": person, "stage": {"name": "Proposal"}, "pipeline": {"name": "Sales"},
+            "probability": rng.choice([None, 25, 50, 75]), "expectedCloseDate": "2026-12-01T00:00:00.000Z",
+        })
+        leads.append({
+            "id": f"l{i}", "title": f"Lead {i}", "status": "NEW", "source": "Website",
+            "value": rng.choice([None, 5000]), "contact": person,
+        })
+        tickets.append({
+            "id": f"t{i}", "title": f"Ticket {i}", "priority": rng.choice(list(formatters.PRIORITY_EMOJI)),
+            "status": rng.choice(list(formatters.STATUS_EMOJI)), "description": "Printer on fire " * rng.randint(1, 12),
+            "contact": person,
+        })
+    return {"contacts": contacts, "deals": deals, "leads": leads, "tickets": tickets}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streamlined formatter microbenchmark")
+    parser.add_argument("--sizes", default="100,10000,100000", help="Comma-separated record counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    baseline = {"contacts": format_contacts, "deals": format_deals, "leads": format_leads, "tickets": format_tickets}
+    renderers = {
+        "contacts": formatters.format_contacts,
+        "deals": formatters.format_deals,
+        "leads": formatters.format_leads,
+        "tickets": formatters.format_tickets,
+    }
+
+    # Uncapped output must match the previous formatters exactly
+    for entity, records in make_records(500, embed_related=True).items():
+        assert baseline[entity](records) == renderers[entity](records, None), f"{entity}: output differs"
+
+    print(f"cap = {formatters.MAX_FORMAT_RECORDS} records")
+    print(f"{'entity':<9} {'records':>8} {'old ms':>9} {'new ms':>9} {'capped ms':>10} {'capped KiB':>11}")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        data = make_records(size, embed_related=True)
+        number = max(1, 20000 // size)
+        for entity, records in data.items():
+            old, new = baseline[entity], renderers[entity]
+
+            def timed(func):
+                return min(timeit.repeat(func, number=number, repeat=args.repeat)) / number * 1000
+
+            old_ms = timed(lambda: old(records))
+            new_ms = timed(lambda: new(records, None))
+            capped_ms = timed(lambda: new(records))
+            capped_kib = len(new(records).encode("utf-8")) / 1024
+            print(f"{entity:<9} {size:>8} {old_ms:>9.2f} {new_ms:>9.2f} {capped_ms:>10.3f} {capped_kib:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Logging Overhead Benchmark
+Per-call cost of hot-path logging: the old eager f-string + json.dumps
+line versus structured_logging.log_event (filtered, sampled, emitted)
+
+Usage:
+    python -m benchmarks.bench_logging --iterations 200000
+"""
+
+import io
+import json
+import timeit
+import logging
+import argparse
+
+import structured_logging
+from structured_logging import EventSampler, JsonLineFormatter, log_event
+
+# Per-call budgets in microseconds for the new path
+BUDGET_US = {
+    "log_event filtered (DEBUG off)": 1.0,
+    "log_event sampled out (1%)": 2.0,
+    "log_event emitted (text)": 50.0,
+    "log_event emitted (json)": 50.0,
+}
+
+BODY = {
+    "firstName": "John",
+    "lastName": "Smith",
+    "email": "john@example.com",
+    "company": "Acme",
+    "notes": "Met at the conference; interested in the enterprise plan. " * 4,
+    "password": "not-a-real-password",
+}
+
+
+def make_logger(level: int, json_format: bool = False) -> logging.Logger:
+    logger = logging.getLogger(f"bench-{level}-{json_format}")
+    logger.handlers.clear()
+    logger.propagate = False
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setFormatter(JsonLineFormatter() if json_format else logging.Formatter("%(asctime)s - %(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    return logger
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Logging overhead benchmark")
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    info = make_logger(logging.INFO)
+    warning = make_logger(logging.WARNING)
+    json_info = make_logger(logging.INFO, json_format=True)
+    endpoint = "/contacts"
+
+    cases = {
+        "old eager line (emitted)": lambda: info.info(
+            f"Calling POST http://localhost:3001/api{endpoint} with body: {json.dumps(BODY, indent=2)}"
+        ),
+        "old eager line (filtered)": lambda: warning.info(
+            f"Calling POST http://localhost:3001/api{endpoint} with body: {json.dumps(BODY, indent=2)}"
+        ),
+        "log_event filtered (DEBUG off)": lambda: log_event(
+            info, "backend_call", logging.DEBUG, method="POST", endpoint=endpoint, body=BODY
+        ),
+        "log_event sampled out (1%)": lambda: log_event(
+            info, "tool_call", transport="http", tool="contacts_create"
+        ),
+        "log_event emitted (text)": lambda: log_event(
+            info, "backend_call", logging.INFO, method="POST", endpoint=endpoint, body=BODY
+        ),
+        "log_event emitted (json)": lambda: log_event(
+            json_info, "backend_call", logging.INFO, method="POST", endpoint=endpoint, body=BODY
+        ),
+    }
+
+    structured_logging.sampler = EventSampler({"tool_call": 0.01})
+
+    print(f"{'case':<34} {'us/call':>9} {'budget':>8}")
+    failed = False
+    for name, case in cases.items():
+        per_call = min(timeit.repeat(case, number=args.iterations // 10, repeat=5)) / (args.iterations // 10) * 1e6
+        budget = BUDGET_US.get(name)
+        verdict = ""
+        if budget is not None:
+            verdict = "ok" if per_call <= budget else "OVER"
+            failed = failed or per_call > budget
+        print(f"{name:<34} {per_call:>9.2f} {budget if budget else '':>8} {verdict}")
+
+    if failed:
+        raise SystemExit("logging overhead budget exceeded")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Conversation Replay Load Generator
+Replays recorded tool-call chains against the HTTP transport
+
+Reads transcripts written with MCP_TRANSCRIPT_PATH (see transcripts.py)
+or builds synthetic ones from the chains STRICT_SYSTEM_PROMPT asks for
+(search -> pipelines -> stages -> create). Each conversation is replayed
+step by step with its recorded think time (scaled by --time-scale),
+--multiplier copies at once, each copy as its own Telegram user.
+Placeholders are filled with IDs and text that exist in the mock backend.
+
+Reports end-to-end conversation latency (wall time and time spent in
+calls) as well as per-step latency.
+
+Usage:
+    python -m benchmarks.bench_replay --synthetic 50 --multiplier 4
+    python -m benchmarks.bench_replay --transcript transcripts.jsonl --multiplier 10 --time-scale 0.1
+    python -m benchmarks.bench_replay --transcript transcripts.jsonl --url http://127.0.0.1:5000
+"""
+
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import subprocess
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_server import server_env
+from benchmarks.bench_workers import SERVER_DIR, ensure_port_free, percentile, wait_for
+
+_PLACEHOLDER = re.compile(r"<(id|text|num|list):([^>]*)>")
+
+# Chains the system prompt drives; offsets are think time before each step (seconds)
+SYNTHETIC_FLOWS = {
+    "create_deal": [
+        ("contacts_search", {"query": "<text:6>"}, 0.0),
+        ("pipelines_list", {}, 2.0),
+        ("stages_list", {"pipelineId": "<id:1>"}, 1.5),
+        ("deals_create", {"title": "<text:18>", "contactId": "<id:0>", "pipelineId": "<id:1>",
+                          "stageId": "<id:2>", "value": "<num:10000>"}, 3.0),
+    ],
+    "convert_lead": [
+        ("leads_list", {"status": "QUALIFIED"}, 0.0),
+        ("pipelines_list", {}, 2.0),
+        ("stages_list", {"pipelineId": "<id:1>"}, 1.5),
+        ("leads_convert", {"leadId": "<id:0>", "pipelineId": "<id:1>", "stageId": "<id:2>"}, 2.5),
+    ],
+    "triage_ticket": [
+        ("tickets_list", {"status": "OPEN"}, 0.0),
+        ("tickets_get", {"ticketId": "<id:0>"}, 2.0),
+        ("tickets_comment", {"ticketId": "<id:0>", "comment": "<text:40>"}, 4.0),
+        ("tickets_update", {"ticketId": "<id:0>", "status": "IN_PROGRESS"}, 1.0),
+    ],
+    "review_pipeline": [
+        ("analytics_dashboard", {}, 0.0),
+        ("deals_list", {"pipelineId": "<id:0>"}, 3.0),
+        ("analytics_revenue", {}, 2.0),
+    ],
+}
+
+# Mock backend ID for an argument name (n = placeholder number)
+ID_FAMILIES = {
+    "contactId": lambda n: f"contact-{n}",
+    "dealId": lambda n: f"deal-{n}",
+    "leadId": lambda n: f"lead-{n}",
+    "ticketId": lambda n: f"ticket-{n}",
+    "userId": lambda n: f"user-{n % 10}",
+    "assignedUserId": lambda n: f"user-{n % 10}",
+    "pipelineId": lambda n: "pipeline-1",
+    "stageId": lambda n: f"stage-1-{1 + n % 6}",
+}
+
+
+def load_transcript(path: str) -> List[List[Dict[str, Any]]]:
+    """Recorded events grouped into conversations, each in step order"""
+    conversations: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                event = json.loads(line)
+                conversations[event["conversation"]].append(event)
+    return [sorted(events, key=lambda e: e["step"]) for events in conversations.values()]
+
+
+def synthetic_transcript(count: int, seed: int = 7) -> List[List[Dict[str, Any]]]:
+    """`count` conversations drawn from SYNTHETIC_FLOWS, in the recorded format"""
+    rng = random.Random(seed)
+    names = sorted(SYNTHETIC_FLOWS)
+    conversations = []
+    for c in range(count):
+        offset = 0.0
+        events = []
+        for step, (tool, args, think) in enumerate(SYNTHETIC_FLOWS[names[rng.randrange(len(names))]]):
+            offset += think * rng.uniform(0.5, 1.5)
+            events.append({"conversation": f"synthetic-{c}", "step": step, "offset_ms": offset * 1000,
+                           "tool": tool, "args": args})
+        conversations.append(events)
+    return conversations
+
+
+class Materializer:
+    """Fills placeholders with values that exist in the mock backend (per conversation copy)"""
+
+    def __init__(self, rng: random.Random, contacts: int):
+        self.rng = rng
+        self.contacts = contacts
+        self.base = rng.randrange(1_000_000)
+
+    def value(self, key: str, value: Any) -> Any:
+        if isinstance(value, list):
+            return [
+                {"tool_name": call.get("tool_name"),
+                 "arguments": {k: self.value(k, v) for k, v in (call.get("arguments") or {}).items()}}
+                if isinstance(call, dict) else call
+                for call in value
+            ]
+        if not isinstance(value, str):
+            return value
+        match = _PLACEHOLDER.fullmatch(value)
+        if match is None:
+            return value
+        kind, detail = match.groups()
+        if kind == "id":
+            number = (self.base + int(detail)) % max(1, self.contacts)
+            family = ID_FAMILIES.get(key)
+            return family(number) if family else f"{key.removesuffix('Id')}-{number}"
+        if kind == "num":
+            return float(detail) if detail else 0
+        if kind == "text":
+            length = max(1, int(detail))
+            if key == "query":
+                return f"First{self.rng.randrange(max(1, self.contacts))}"
+            if key == "email":
+                return f"replay{self.rng.randrange(1_000_000)}@example.com"
+            return ("replay " * (length // 7 + 1))[:length].strip() or "replay"
+        return []
+
+    def arguments(self, args: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: self.value(key, value) for key, value in args.items()}
+
+
+async def replay_conversation(
+    client: httpx.AsyncClient,
+    events: List[Dict[str, Any]],
+    token: str,
+    materializer: Materializer,
+    time_scale: float,
+    steps: Dict[str, List[float]],
+) -> Dict[str, Any]:
+    """Run one conversation in order; returns wall time, time in calls and errors"""
+    started = time.perf_counter()
+    in_calls = 0.0
+    errors = 0
+    headers = {"Authorization": f"Bearer {token}"}
+    for event in events:
+        due = started + event.get("offset_ms", 0) / 1000 * time_scale
+        # Think time is measured from the conversation start, so slow calls eat into it
+        delay = due - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        body = {"tool_name": event["tool"], "arguments": materializer.arguments(event.get("args", {}))}
+        call_started = time.perf_counter()
+        response = await client.post("/mcp/call-tool", json=body, headers=headers)
+        elapsed = time.perf_counter() - call_started
+        in_calls += elapsed
+        steps[event["tool"]].append(elapsed)
+        if response.status_code != 200 or response.json()["result"][0]["text"].startswith("❌"):
+            errors += 1
+    return {"wall": time.perf_counter() - started, "in_calls": in_calls, "errors": errors}
+
+
+async def replay(
+    base_url: str,
+    conversations: List[List[Dict[str, Any]]],
+    multiplier: int,
+    time_scale: float,
+    tenants: int,
+    contacts: int,
+    seed: int,
+) -> None:
+    rng = random.Random(seed)
+    steps: Dict[str, List[float]] = defaultdict(list)
+    limits = httpx.Limits(max_connections=max(10, multiplier * 4))
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+        async def copy(index: int, events: List[Dict[str, Any]]) -> Dict[str, Any]:
+            token = f"telegram:{index}:tenant-{index % tenants}"
+            return await replay_conversation(
+                client, events, token, Materializer(random.Random(rng.random()), contacts), time_scale, steps
+            )
+
+        started = time.perf_counter()
+        jobs = [(c * multiplier + m, events) for c, events in enumerate(conversations) for m in range(multiplier)]
+        # Every copy of every conversation runs at once; think time spreads the load
+        results = await asyncio.gather(*(copy(index, events) for index, events in jobs))
+        elapsed = time.perf_counter() - started
+
+    calls = sum(len(events) for _, events in jobs)
+    errors = sum(r["errors"] for r in results)
+    print(f"{len(results)} conversations ({len(conversations)} x {multiplier}), {calls} calls, "
+          f"{errors} errors in {elapsed:.1f}s - {len(results) / elapsed:.1f} conv/s, {calls / elapsed:.0f} calls/s")
+    print(f"\n{'conversation':<16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for label, key in (("wall time", "wall"), ("in calls", "in_calls")):
+        values = [r[key] for r in results]
+        print(f"{label:<16} {percentile(values, 50) * 1000:>9.1f} {percentile(values, 95) * 1000:>9.1f} "
+              f"{percentile(values, 99) * 1000:>9.1f}")
+    print(f"\n{'step':<22} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for tool, values in sorted(steps.items()):
+        print(f"{tool:<22} {len(values):>6} {percentile(values, 50) * 1000:>9.1f} "
+              f"{percentile(values, 95) * 1000:>9.1f} {percentile(values, 99) * 1000:>9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay tool-call conversations against the HTTP transport")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--transcript", help="JSONL written with MCP_TRANSCRIPT_PATH")
+    source.add_argument("--synthetic", type=int, help="Replay N synthetic system-prompt chains instead")
+    parser.add_argument("--multiplier", type=int, default=1, help="Concurrent copies of each conversation")
+    parser.add_argument("--time-scale", type=float, default=1.0, help="Think time factor (0 = back to back)")
+    parser.add_argument("--conversations", type=int, help="Replay at most N recorded conversations")
+    parser.add_argument("--tenants", type=int, default=10, help="Tenants the copies are spread over")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--url", help="Replay against a running server instead of starting one")
+    parser.add_argument("--port", type=int, default=5057)
+    parser.add_argument("--backend-port", type=int, default=3996)
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Mock backend delay")
+    parser.add_argument("--contacts", type=int, default=500, help="Mock backend size (IDs are drawn below it)")
+    parser.add_argument("--no-cache", action="store_true")
+    args = parser.parse_args()
+
+    if args.transcript:
+        conversations = load_transcript(args.transcript)[: args.conversations]
+    else:
+        conversations = synthetic_transcript(args.synthetic, args.seed)
+    if not conversations:
+        parser.error("no conversations to replay")
+
+    def run(base_url: str) -> None:
+        asyncio.run(replay(base_url, conversations, args.multiplier, args.time_scale,
+                           max(1, args.tenants), args.contacts, args.seed))
+
+    if args.url:
+        run(args.url)
+        return
+
+    size = str(args.contacts)
+    ensure_port_free(args.backend_port)
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_backend", "--port", str(args.backend_port),
+         "--latency-ms", str(args.latency_ms),
+         "--contacts", size, "--deals", size, "--leads", size, "--tickets", size],
+        cwd=SERVER_DIR,
+    )
+    server: Optional[subprocess.Popen] = None
+    try:
+        backend_url = f"http://127.0.0.1:{args.backend_port}"
+        wait_for(f"{backend_url}/api/pipelines", process=backend)
+        ensure_port_free(args.port)
+        server = subprocess.Popen(
+            [sys.executable, "server_unified.py"],
+            cwd=SERVER_DIR,
+            env=server_env(args, backend_url, "http"),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        base = f"http://127.0.0.1:{args.port}"
+        wait_for(f"{base}/health", process=server)
+        run(base)
+    finally:
+        for process in (server, backend):
+            if process is not None:
+                process.terminate()
+                process.wait(timeout=15)
+
+
+if __name__ == "__main__":
+    main()
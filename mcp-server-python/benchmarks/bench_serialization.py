@@ -0,0 +1,65 @@
+"""
+Serialization Benchmark
+Backend-body -> tool-result-text cost for 1k / 10k contact lists
+
+Compares the old path (response.json() + json.dumps(indent=2)) with the
+compact stdlib path, the orjson fast path and raw passthrough.
+
+Usage:
+    python -m benchmarks.bench_serialization --sizes 1000,10000
+"""
+
+import json
+import timeit
+import argparse
+
+import serialization
+from benchmarks.mock_backend import make_contacts
+
+
+def old_path(body: bytes) -> str:
+    return json.dumps(json.loads(body), indent=2)
+
+
+def stdlib_compact(body: bytes) -> str:
+    return json.dumps(json.loads(body), separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+def fast_path(body: bytes) -> str:
+    return serialization.dumps(serialization.loads(body), pretty=False)
+
+
+def passthrough(body: bytes) -> str:
+    return serialization.to_text(serialization.RawJson(body))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON serialization benchmark")
+    parser.add_argument("--sizes", default="1000,10000", help="Comma-separated contact counts")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = {
+        "old (json + indent=2)": old_path,
+        "stdlib compact": stdlib_compact,
+        f"fast path ({serialization.JSON_BACKEND})": fast_path,
+        "raw passthrough": passthrough,
+    }
+
+    print(f"serializer backend: {serialization.JSON_BACKEND}")
+    for size in [int(s) for s in args.sizes.split(",") if s.strip()]:
+        body = json.dumps(make_contacts(size), separators=(",", ":")).encode("utf-8")
+        number = max(1, 20000 // size)
+        print(f"\n{size} contacts ({len(body) / 1024:.0f} KiB backend body)")
+        print(f"{'path':<26} {'ms/call':>9} {'MB/s':>9} {'out KiB':>9} {'speedup':>8}")
+        baseline = None
+        for name, func in cases.items():
+            seconds = min(timeit.repeat(lambda: func(body), number=number, repeat=args.repeat)) / number
+            baseline = baseline or seconds
+            out = len(func(body).encode("utf-8"))
+            print(f"{name:<26} {seconds * 1000:>9.2f} {len(body) / seconds / 1e6:>9.0f} "
+                  f"{out / 1024:>9.0f} {baseline / seconds:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
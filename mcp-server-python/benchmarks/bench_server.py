@@ -0,0 +1,370 @@
+"""
+End-to-End Server Benchmark
+Per-tool latency, throughput and RSS of UnifiedMCPServer over HTTP and stdio
+
+Starts the mock backend and the server as subprocesses (no NestJS or
+Supabase needed), then runs a fixed number of calls per tool at the given
+concurrency on each transport: POST /mcp/call-tool for HTTP, an MCP
+client session for stdio. Server RSS is read from /proc (Linux).
+
+--repeat runs each tool several times (throughput per run is kept for
+significance tests), --allocations adds an in-process tracemalloc pass
+and --save writes a versioned baseline for `benchmarks.baselines compare`.
+
+Usage:
+    python -m benchmarks.bench_server
+    python -m benchmarks.bench_server --transports http --tools contacts_list,deals_list --requests 500
+    python -m benchmarks.bench_server --latency-ms 5 --contacts 5000 --no-cache --json results.json
+    python -m benchmarks.bench_server --data-dir /tmp/tenant-100k --tools contacts_list,deals_list
+    python -m benchmarks.bench_server --repeat 3 --allocations --save main
+"""
+
+import gc
+import os
+import sys
+import json
+import time
+import tracemalloc
+import asyncio
+import argparse
+import subprocess
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.baselines import save_baseline
+from benchmarks.bench_workers import SERVER_DIR, ensure_port_free, percentile, wait_for
+
+TOKEN = "bench-token"
+
+# Arguments per benchmarked tool (i = call number, so writes and gets vary their IDs)
+WORKLOAD: Dict[str, Callable[[int], Dict[str, Any]]] = {
+    "contacts_list": lambda i: {},
+    "contacts_search": lambda i: {"query": f"First{i % 100}"},
+    "contacts_get": lambda i: {"contactId": f"contact-{i % 100}"},
+    "contacts_create": lambda i: {"firstName": f"Bench{i}", "email": f"bench{i}@example.com"},
+    "deals_list": lambda i: {},
+    "deals_create": lambda i: {
+        "title": f"Bench deal {i}", "contactId": f"contact-{i % 100}",
+        "pipelineId": "pipeline-1", "stageId": "stage-1-1", "value": 1000 + i,
+    },
+    "leads_list": lambda i: {},
+    "tickets_list": lambda i: {"status": "OPEN"},
+    "pipelines_list": lambda i: {},
+    "stages_list": lambda i: {"pipelineId": "pipeline-1"},
+    "analytics_dashboard": lambda i: {},
+    "analytics_revenue": lambda i: {},
+    "resolve": lambda i: {"type": "contact", "query": f"First{i % 100} Last{i % 100}"},
+}
+
+# Calls one tool once: returns True on success
+CallFn = Callable[[str, Dict[str, Any]], Awaitable[bool]]
+
+
+def read_rss(pid: int) -> Tuple[Optional[float], Optional[float]]:
+    """Current and peak resident memory of a process in MB (None off Linux)"""
+    try:
+        with open(f"/proc/{pid}/status", "r") as f:
+            fields = dict(line.split(":", 1) for line in f if ":" in line)
+    except OSError:
+        return None, None
+
+    def mb(key: str) -> Optional[float]:
+        value = fields.get(key)
+        return int(value.split()[0]) / 1024 if value else None
+
+    return mb("VmRSS"), mb("VmHWM")
+
+
+def find_child(pattern: str) -> Optional[int]:
+    """PID of a child process whose command line contains `pattern` (Linux)"""
+    me = str(os.getpid())
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            stat = (entry / "stat").read_text()
+            cmdline = (entry / "cmdline").read_bytes().replace(b"\0", b" ").decode(errors="replace")
+        except OSError:
+            continue
+        if stat.rsplit(")", 1)[1].split()[1] == me and pattern in cmdline:
+            return int(entry.name)
+    return None
+
+
+def server_env(args: argparse.Namespace, backend_url: str, transport: str) -> Dict[str, str]:
+    return dict(
+        os.environ,
+        BACKEND_URL=backend_url,
+        BACKEND_API_PREFIX="/api",
+        MCP_TRANSPORT=transport,
+        MCP_HTTP_WORKERS="1",
+        MCP_HTTP_PORT=str(args.port),
+        MCP_HTTP_HOST="127.0.0.1",
+        MCP_CACHE_ENABLED="false" if args.no_cache else "true",
+        MCP_RATE_LIMIT_ENABLED="false",
+        LOG_LEVEL="WARNING",
+    )
+
+
+async def run_tool(call: CallFn, tool: str, requests: int, concurrency: int, warmup: int) -> Dict[str, Any]:
+    """`requests` calls of one tool with at most `concurrency` in flight"""
+    make_args = WORKLOAD[tool]
+    for i in range(warmup):
+        await call(tool, make_args(i))
+
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            started = time.perf_counter()
+            ok = await call(tool, make_args(i))
+            latencies.append(time.perf_counter() - started)
+            errors += not ok
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {
+        "tool": tool,
+        "requests": requests,
+        "errors": errors,
+        "rps": requests / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "samples_ms": [round(value * 1000, 3) for value in latencies],
+    }
+
+
+def merge_runs(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One result from repeated runs of a tool: pooled samples, throughput per run"""
+    samples = [value for run in runs for value in run["samples_ms"]]
+    rps_runs = [run["rps"] for run in runs]
+    return {
+        "tool": runs[0]["tool"],
+        "requests": sum(run["requests"] for run in runs),
+        "errors": sum(run["errors"] for run in runs),
+        "rps": sum(rps_runs) / len(rps_runs),
+        "rps_runs": rps_runs,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "samples_ms": samples,
+    }
+
+
+async def bench_transport(
+    call: CallFn,
+    pid: Optional[int],
+    transport: str,
+    args: argparse.Namespace,
+    tools: List[str],
+) -> List[Dict[str, Any]]:
+    results = []
+    for tool in tools:
+        result = merge_runs([
+            await run_tool(call, tool, args.requests, args.concurrency, args.warmup if run == 0 else 0)
+            for run in range(args.repeat)
+        ])
+        rss, peak = read_rss(pid) if pid else (None, None)
+        result.update(transport=transport, rss_mb=rss, peak_rss_mb=peak)
+        results.append(result)
+        print_row(result)
+    return results
+
+
+async def bench_http(args: argparse.Namespace, backend_url: str, tools: List[str]) -> List[Dict[str, Any]]:
+    """Server subprocess with MCP_TRANSPORT=http, driven through /mcp/call-tool"""
+    ensure_port_free(args.port)
+    server = subprocess.Popen(
+        [sys.executable, "server_unified.py"],
+        cwd=SERVER_DIR,
+        env=server_env(args, backend_url, "http"),
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://127.0.0.1:{args.port}"
+        wait_for(f"{base}/health", process=server)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        headers = {"Authorization": f"Bearer {TOKEN}"}
+
+        async with httpx.AsyncClient(base_url=base, limits=limits, timeout=60.0) as client:
+            async def call(tool: str, arguments: Dict[str, Any]) -> bool:
+                response = await client.post("/mcp/call-tool", json={"tool_name": tool, "arguments": arguments},
+                                             headers=headers)
+                if response.status_code != 200:
+                    return False
+                result = response.json()["result"]
+                return not (result and result[0]["text"].startswith("❌"))
+
+            return await bench_transport(call, server.pid, "http", args, tools)
+    finally:
+        server.terminate()
+        server.wait(timeout=15)
+
+
+async def bench_stdio(args: argparse.Namespace, backend_url: str, tools: List[str]) -> List[Dict[str, Any]]:
+    """Server spawned by an MCP stdio client, driven through tools/call"""
+    from mcp import ClientSession
+    from mcp.client.stdio import StdioServerParameters, stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["server_unified.py"],
+        env=server_env(args, backend_url, "stdio"),
+        cwd=SERVER_DIR,
+    )
+    async with stdio_client(params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            await session.initialize()
+
+            async def call(tool: str, arguments: Dict[str, Any]) -> bool:
+                result = await session.call_tool(tool, {"jwt": TOKEN, **arguments})
+                text = result.content[0].text if result.content else ""
+                return not (result.isError or text.startswith("❌"))
+
+            return await bench_transport(call, find_child("server_unified.py"), "stdio", args, tools)
+
+
+async def bench_allocations(args: argparse.Namespace, backend_url: str, tools: List[str]) -> List[Dict[str, Any]]:
+    """
+    UnifiedMCPServer in this process under tracemalloc, calls one at a time
+
+    alloc_peak_kb is the mean peak of Python allocations above the starting
+    point during one call; retained_kb is what all calls of the tool left
+    allocated (caches and indexes grow here, so compare, don't read alone).
+    Latency is not reported - tracemalloc slows every allocation.
+    """
+    os.environ.update(server_env(args, backend_url, "http"))
+    sys.path.insert(0, str(SERVER_DIR))
+    from server_unified import UnifiedMCPServer
+
+    server = UnifiedMCPServer()
+    await server.backend.open()
+    requests = min(args.requests, args.alloc_requests)
+    results = []
+    tracemalloc.start()
+    try:
+        for tool in tools:
+            make_args = WORKLOAD[tool]
+            for i in range(args.warmup):
+                await server.execute_tool(tool, {"jwt": TOKEN, **make_args(i)}, "inproc")
+            gc.collect()
+            start_traced = tracemalloc.get_traced_memory()[0]
+            peaks = []
+            errors = 0
+            for i in range(requests):
+                before = tracemalloc.get_traced_memory()[0]
+                tracemalloc.reset_peak()
+                result = await server.execute_tool(tool, {"jwt": TOKEN, **make_args(i)}, "inproc")
+                peaks.append(tracemalloc.get_traced_memory()[1] - before)
+                errors += bool(result and result[0].text.startswith("❌"))
+            gc.collect()
+            result = {
+                "transport": "inproc",
+                "tool": tool,
+                "requests": requests,
+                "errors": errors,
+                "alloc_peak_kb": sum(peaks) / len(peaks) / 1024 if peaks else 0.0,
+                "retained_kb": (tracemalloc.get_traced_memory()[0] - start_traced) / 1024,
+            }
+            results.append(result)
+            print(f"{'inproc':<9} {tool:<22} {requests:>6} {errors:>5} "
+                  f"alloc peak {result['alloc_peak_kb']:>9.1f} KB/call  retained {result['retained_kb']:>9.1f} KB")
+    finally:
+        tracemalloc.stop()
+        await server.backend.close()
+    return results
+
+
+def print_header() -> None:
+    print(f"{'transport':<9} {'tool':<22} {'req':>6} {'err':>5} {'req/s':>8} "
+          f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'rss MB':>7} {'peak MB':>8}")
+
+
+def print_row(r: Dict[str, Any]) -> None:
+    def mb(value: Optional[float]) -> str:
+        return f"{value:.1f}" if value is not None else "n/a"
+
+    print(f"{r['transport']:<9} {r['tool']:<22} {r['requests']:>6} {r['errors']:>5} {r['rps']:>8.0f} "
+          f"{r['p50_ms']:>8.2f} {r['p95_ms']:>8.2f} {r['p99_ms']:>8.2f} {mb(r['rss_mb']):>7} {mb(r['peak_rss_mb']):>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end MCP server benchmark (HTTP + stdio)")
+    parser.add_argument("--transports", default="http,stdio", help="Comma-separated: http, stdio")
+    parser.add_argument("--tools", default=",".join(WORKLOAD), help="Comma-separated tools to run")
+    parser.add_argument("--requests", type=int, default=200, help="Calls per tool")
+    parser.add_argument("--concurrency", type=int, default=8, help="Calls in flight per tool")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured calls per tool")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per tool (>= 2 to test throughput changes)")
+    parser.add_argument("--allocations", action="store_true", help="Add an in-process tracemalloc pass")
+    parser.add_argument("--alloc-requests", type=int, default=50, help="Calls per tool in the allocation pass")
+    parser.add_argument("--port", type=int, default=5056)
+    parser.add_argument("--backend-port", type=int, default=3998)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Mock backend delay")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Mock backend random extra delay")
+    parser.add_argument("--contacts", type=int, default=200)
+    parser.add_argument("--deals", type=int, default=200)
+    parser.add_argument("--leads", type=int, default=200)
+    parser.add_argument("--tickets", type=int, default=200)
+    parser.add_argument("--pad-bytes", type=int, default=0, help="Notes field size per record")
+    parser.add_argument("--data-dir", help="Serve a tenant written by benchmarks.synthetic_data instead")
+    parser.add_argument("--no-cache", action="store_true", help="Send every call to the backend")
+    parser.add_argument("--json", help="Also write the results to this file")
+    parser.add_argument("--save", metavar="NAME", help="Save a baseline (benchmarks/baselines/NAME.json)")
+    args = parser.parse_args()
+
+    tools = [t.strip() for t in args.tools.split(",") if t.strip()]
+    unknown = [t for t in tools if t not in WORKLOAD]
+    if unknown:
+        parser.error(f"no workload for {', '.join(unknown)} (known: {', '.join(WORKLOAD)})")
+
+    ensure_port_free(args.backend_port)
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_backend",
+         "--port", str(args.backend_port),
+         "--latency-ms", str(args.latency_ms),
+         "--jitter-ms", str(args.jitter_ms),
+         "--contacts", str(args.contacts),
+         "--deals", str(args.deals),
+         "--leads", str(args.leads),
+         "--tickets", str(args.tickets),
+         "--pad-bytes", str(args.pad_bytes)] + (["--data-dir", args.data_dir] if args.data_dir else []),
+        cwd=SERVER_DIR,
+    )
+    results: List[Dict[str, Any]] = []
+    try:
+        backend_url = f"http://127.0.0.1:{args.backend_port}"
+        wait_for(f"{backend_url}/api/pipelines", process=backend)
+
+        print(f"cpu={os.cpu_count()} requests={args.requests} concurrency={args.concurrency} "
+              f"backend latency={args.latency_ms}ms cache={'off' if args.no_cache else 'on'}")
+        print_header()
+        drivers = {"http": bench_http, "stdio": bench_stdio}
+        for transport in [t.strip() for t in args.transports.split(",") if t.strip()]:
+            results += asyncio.run(drivers[transport](args, backend_url, tools))
+        if args.allocations:
+            print()
+            results += asyncio.run(bench_allocations(args, backend_url, tools))
+    finally:
+        backend.terminate()
+        backend.wait(timeout=10)
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({"args": vars(args), "results": results}, indent=2))
+        print(f"\nWrote {len(results)} results to {args.json}")
+    if args.save:
+        path = save_baseline(args.save, results, vars(args))
+        print(f"\nSaved baseline {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+HTTP Worker Scaling Benchmark
+Throughput of /mcp/call-tool with 1..N uvicorn workers against the mock backend
+
+Usage:
+    python -m benchmarks.bench_workers --workers 1,2,4 --duration 10
+    python -m benchmarks.bench_workers --state sqlite --tool analytics_dashboard
+"""
+
+import os
+import sys
+import time
+import socket
+import asyncio
+import argparse
+import subprocess
+import multiprocessing
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+
+
+def ensure_port_free(port: int) -> None:
+    """Fail fast when something already listens on the port (a stale server would be measured)"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        try:
+            probe.bind(("127.0.0.1", port))
+        except OSError as e:
+            raise RuntimeError(f"Port {port} is already in use - stop the process holding it or pick another") from e
+
+
+def wait_for(url: str, timeout: float = 30.0, process: Optional[subprocess.Popen] = None) -> None:
+    """
+    Poll a URL until it answers (server subprocess startup)
+
+    Args:
+        process: The subprocess expected to answer - fails as soon as it exits
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process is not None and process.poll() is not None:
+            raise RuntimeError(f"Process for {url} exited with code {process.returncode}")
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                if process is not None and process.poll() is not None:
+                    raise RuntimeError(f"Process for {url} exited with code {process.returncode}")
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"Timed out waiting for {url}")
+
+
+async def drive(url: str, tool: str, concurrency: int, duration: float) -> List[float]:
+    """Closed-loop load: `concurrency` callers repeat one tool for `duration` seconds"""
+    latencies: List[float] = []
+    body = {"tool_name": tool, "arguments": {}}
+    headers = {"Authorization": "Bearer bench-token"}
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=30.0) as client:
+        async def caller():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.post(url, json=body, headers=headers)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return latencies
+
+
+def drive_process(url: str, tool: str, concurrency: int, duration: float, queue) -> None:
+    queue.put(asyncio.run(drive(url, tool, concurrency, duration)))
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def run_case(workers: int, args: argparse.Namespace, backend_url: str) -> Dict[str, float]:
+    """Start the server with N workers, load it, stop it"""
+    env = dict(
+        os.environ,
+        BACKEND_URL=backend_url,
+        BACKEND_API_PREFIX="/api",
+        MCP_TRANSPORT="http",
+        MCP_HTTP_WORKERS=str(workers),
+        MCP_HTTP_PORT=str(args.port),
+        MCP_HTTP_HOST="127.0.0.1",
+        MCP_STATE_BACKEND=args.state,
+        MCP_CACHE_ENABLED="false" if args.no_cache else "true",
+        MCP_RATE_LIMIT_ENABLED="false",
+        LOG_LEVEL="WARNING",
+    )
+    ensure_port_free(args.port)
+    server = subprocess.Popen(
+        [sys.executable, "server_unified.py"],
+        cwd=SERVER_DIR,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        base = f"http://127.0.0.1:{args.port}"
+        wait_for(f"{base}/health", process=server)
+
+        # Warm up pools and caches in every worker
+        asyncio.run(drive(f"{base}/mcp/call-tool", args.tool, args.concurrency, 1.0))
+
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        per_client = max(1, args.concurrency // args.clients)
+        clients = [
+            ctx.Process(target=drive_process, args=(f"{base}/mcp/call-tool", args.tool, per_client, args.duration, queue))
+            for _ in range(args.clients)
+        ]
+        for client in clients:
+            client.start()
+        latencies = [value for _ in clients for value in queue.get()]
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(timeout=15)
+
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "rps": len(latencies) / args.duration,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="HTTP worker scaling benchmark")
+    parser.add_argument("--workers", default="1,2,4", help="Comma-separated worker counts")
+    parser.add_argument("--tool", default="contacts_list")
+    parser.add_argument("--concurrency", type=int, default=64, help="Concurrent callers in total")
+    parser.add_argument("--clients", type=int, default=max(1, min(4, os.cpu_count() or 1)),
+                        help="Load generator processes")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per case")
+    parser.add_argument("--port", type=int, default=5055)
+    parser.add_argument("--backend-port", type=int, default=3999)
+    parser.add_argument("--latency-ms", type=float, default=2.0, help="Mock backend delay")
+    parser.add_argument("--contacts", type=int, default=200)
+    parser.add_argument("--state", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--no-cache", action="store_true", help="Send every call to the backend")
+    args = parser.parse_args()
+
+    ensure_port_free(args.backend_port)
+    backend = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.mock_backend",
+         "--port", str(args.backend_port),
+         "--latency-ms", str(args.latency_ms),
+         "--contacts", str(args.contacts)],
+        cwd=SERVER_DIR,
+    )
+    try:
+        backend_url = f"http://127.0.0.1:{args.backend_port}"
+        wait_for(f"{backend_url}/api/pipelines", process=backend)
+
+        print(f"cpu={os.cpu_count()} tool={args.tool} concurrency={args.concurrency} "
+              f"state={args.state} cache={'off' if args.no_cache else 'on'}")
+        print(f"{'workers':>8} {'requests':>9} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8} {'speedup':>8}")
+        baseline = None
+        for workers in [int(w) for w in args.workers.split(",") if w.strip()]:
+            result = run_case(workers, args, backend_url)
+            baseline = baseline or result["rps"]
+            print(f"{result['workers']:>8} {result['requests']:>9} {result['rps']:>9.0f} "
+                  f"{result['p50_ms']:>8.1f} {result['p99_ms']:>8.1f} {result['rps'] / baseline:>7.2f}x")
+    finally:
+        backend.terminate()
+        backend.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
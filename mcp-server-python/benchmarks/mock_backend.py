@@ -0,0 +1,463 @@
+"""
+Mock Synapse Backend for Benchmarks
+In-memory stand-in for the NestJS API with configurable latency and sizes
+
+Serves every route the tool registry calls (contacts, deals, leads,
+tickets, pipelines, stages, users, portal, analytics, auth) from
+generated records shaped like the real API: deals carry nested
+stage/pipeline/contact objects, leads and tickets a nested contact.
+
+Usage:
+    python -m benchmarks.mock_backend --port 3999 --latency-ms 5 --contacts 500
+    python -m benchmarks.mock_backend --latency-ms 5 --jitter-ms 10 --route-latency analytics=50 --pad-bytes 512
+    python -m benchmarks.mock_backend --data-dir /tmp/tenant-100k   # from benchmarks.synthetic_data
+"""
+
+import random
+import asyncio
+import argparse
+import itertools
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+
+from serialization import dumps_bytes, loads
+
+# Families stored as collections (URL prefix -> id prefix)
+FAMILIES = {
+    "contacts": "contact",
+    "deals": "deal",
+    "leads": "lead",
+    "tickets": "ticket",
+    "pipelines": "pipeline",
+    "stages": "stage",
+    "users": "user",
+    "portal/customers": "customer",
+    "portal/tickets": "portal-ticket",
+}
+
+LEAD_STATUSES = ("NEW", "CONTACTED", "QUALIFIED", "UNQUALIFIED", "CONVERTED")
+LEAD_SOURCES = ("Website", "Referral", "Cold Call", "Event")
+TICKET_STATUSES = ("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED")
+TICKET_PRIORITIES = ("LOW", "MEDIUM", "HIGH", "URGENT")
+STAGE_NAMES = ("Lead", "Qualified", "Proposal", "Negotiation", "Won", "Lost")
+
+
+def make_contacts(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"contact-{i}",
+            "firstName": f"First{i}",
+            "lastName": f"Last{i}",
+            "email": f"user{i}@example.com",
+            "company": f"Company {i % 50}",
+            "phone": f"+1555{i:07d}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_pipelines(count: int) -> List[Dict[str, Any]]:
+    """Pipelines with their stages nested, like GET /pipelines"""
+    return [
+        {
+            "id": f"pipeline-{p}",
+            "name": "Sales" if p == 1 else f"Pipeline {p}",
+            "stages": [
+                {"id": f"stage-{p}-{s}", "name": name, "order": s, "pipelineId": f"pipeline-{p}"}
+                for s, name in enumerate(STAGE_NAMES, start=1)
+            ],
+        }
+        for p in range(1, count + 1)
+    ]
+
+
+def _contact_ref(contact: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: contact[key] for key in ("id", "firstName", "lastName", "company") if key in contact}
+
+
+def make_deals(count: int, contacts: List[Dict[str, Any]], pipelines: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    deals = []
+    for i in range(count):
+        pipeline = pipelines[i % len(pipelines)]
+        stage = pipeline["stages"][i % len(pipeline["stages"])]
+        contact = contacts[i % len(contacts)] if contacts else None
+        deals.append({
+            "id": f"deal-{i}",
+            "title": f"Deal {i}",
+            "value": 1000 + (i * 37) % 50000,
+            "probability": (i * 13) % 100,
+            "pipelineId": pipeline["id"],
+            "stageId": stage["id"],
+            "contactId": contact["id"] if contact else None,
+            "stage": {"id": stage["id"], "name": stage["name"]},
+            "pipeline": {"id": pipeline["id"], "name": pipeline["name"]},
+            "contact": _contact_ref(contact) if contact else None,
+        })
+    return deals
+
+
+def make_leads(count: int, contacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"lead-{i}",
+            "title": f"Lead {i}",
+            "status": LEAD_STATUSES[i % len(LEAD_STATUSES)],
+            "source": LEAD_SOURCES[i % len(LEAD_SOURCES)],
+            "value": 500 + (i * 29) % 20000,
+            "contactId": contacts[i % len(contacts)]["id"] if contacts else None,
+            "contact": _contact_ref(contacts[i % len(contacts)]) if contacts else None,
+        }
+        for i in range(count)
+    ]
+
+
+def make_tickets(count: int, contacts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"ticket-{i}",
+            "title": f"Ticket {i} needs attention",
+            "description": f"Customer reported issue #{i}",
+            "status": TICKET_STATUSES[i % len(TICKET_STATUSES)],
+            "priority": TICKET_PRIORITIES[i % len(TICKET_PRIORITIES)],
+            "contactId": contacts[i % len(contacts)]["id"] if contacts else None,
+            "contact": _contact_ref(contacts[i % len(contacts)]) if contacts else None,
+        }
+        for i in range(count)
+    ]
+
+
+def make_users(count: int) -> List[Dict[str, Any]]:
+    return [
+        {
+            "id": f"user-{i}",
+            "firstName": f"Agent{i}",
+            "lastName": "Synapse",
+            "email": f"agent{i}@example.com",
+            "role": "ADMIN" if i == 0 else "MEMBER",
+        }
+        for i in range(count)
+    ]
+
+
+class MockStore:
+    """Records per family, keyed by id (insertion order = list order)"""
+
+    def __init__(self):
+        self.collections: Dict[str, Dict[str, Dict[str, Any]]] = {family: {} for family in FAMILIES}
+        self._ids = itertools.count(1_000_000)
+
+    def load(self, family: str, records: Iterable[Dict[str, Any]], pad_bytes: int = 0) -> None:
+        """Add records to a family (pad_bytes adds a notes field to grow payloads)"""
+        collection = self.collections[family]
+        padding = "x" * pad_bytes if pad_bytes else None
+        for record in records:
+            if padding:
+                record = {**record, "notes": padding}
+            collection[str(record["id"])] = record
+
+    def load_jsonl(self, family: str, path: Path) -> int:
+        """Add records from a <family>.jsonl file (see benchmarks.synthetic_data)"""
+        before = len(self.collections[family])
+        with open(path, "rb") as f:
+            self.load(family, (loads(line) for line in f if line.strip()))
+        return len(self.collections[family]) - before
+
+    def new_id(self, family: str) -> str:
+        return f"{FAMILIES[family]}-{next(self._ids)}"
+
+    def stages(self) -> List[Dict[str, Any]]:
+        """Stages flattened out of the pipelines plus standalone ones"""
+        nested = [stage for pipeline in self.collections["pipelines"].values() for stage in pipeline.get("stages", ())]
+        return nested + list(self.collections["stages"].values())
+
+
+def seed_store(
+    contacts: int = 100,
+    deals: int = 100,
+    leads: int = 100,
+    tickets: int = 100,
+    pipelines: int = 2,
+    users: int = 10,
+    pad_bytes: int = 0,
+) -> MockStore:
+    """Store filled with generated records of the given sizes"""
+    store = MockStore()
+    contact_records = make_contacts(contacts)
+    pipeline_records = make_pipelines(max(1, pipelines))
+    store.load("contacts", contact_records, pad_bytes)
+    store.load("pipelines", pipeline_records)
+    store.load("deals", make_deals(deals, contact_records, pipeline_records), pad_bytes)
+    store.load("leads", make_leads(leads, contact_records), pad_bytes)
+    store.load("tickets", make_tickets(tickets, contact_records), pad_bytes)
+    store.load("users", make_users(users))
+    store.load("portal/customers", contact_records[: min(len(contact_records), 50)])
+    store.load("portal/tickets", make_tickets(min(tickets, 50), contact_records))
+    return store
+
+
+def create_app(
+    latency_ms: float = 0.0,
+    contacts: int = 100,
+    deals: int = 100,
+    leads: int = 100,
+    tickets: int = 100,
+    pipelines: int = 2,
+    jitter_ms: float = 0.0,
+    route_latency_ms: Optional[Dict[str, float]] = None,
+    pad_bytes: int = 0,
+    store: Optional[MockStore] = None,
+) -> FastAPI:
+    """
+    Build the mock API (all routes under /api like the real backend)
+
+    Args:
+        latency_ms: Delay added to every request
+        jitter_ms: Extra uniform random delay (0..jitter_ms)
+        route_latency_ms: Per-family delay overriding latency_ms (e.g. {"analytics": 50})
+        pad_bytes: Size of a notes field added to contacts/deals/leads/tickets
+        store: Prefilled store (sizes are ignored when given)
+    """
+    app = FastAPI(title="Mock Synapse Backend")
+    store = store or seed_store(contacts, deals, leads, tickets, pipelines, pad_bytes=pad_bytes)
+    collections = store.collections
+    route_latency_ms = route_latency_ms or {}
+
+    async def wait(family: str) -> None:
+        delay = route_latency_ms.get(family, latency_ms)
+        if jitter_ms:
+            delay += random.uniform(0, jitter_ms)
+        if delay:
+            await asyncio.sleep(delay / 1000.0)
+
+    def reply(data: Any, status_code: int = 200) -> Response:
+        return Response(content=dumps_bytes(data, pretty=False), status_code=status_code, media_type="application/json")
+
+    def not_found(family: str, record_id: str) -> Response:
+        return reply({"statusCode": 404, "message": f"{FAMILIES[family]} {record_id} not found"}, 404)
+
+    def filtered(records: Iterable[Dict[str, Any]], params: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Equality filters on top-level fields (pipelineId=..., status=...)"""
+        checks = [(key, value) for key, value in params.items() if key not in ("limit", "cursor", "sort", "fields")]
+        if not checks:
+            return records if isinstance(records, list) else list(records)
+        return [record for record in records if all(str(record.get(key)) == value for key, value in checks)]
+
+    # ---------- specific routes (before the /{id} catch-alls) ----------
+
+    @app.post("/api/_mock/load/{family}")
+    async def bulk_load(family: str, request: Request, replace: bool = False):
+        """Stream NDJSON records into a family (benchmarks.synthetic_data --post)"""
+        if family not in collections:
+            return reply({"statusCode": 404, "message": f"unknown family {family}"}, 404)
+        if replace:
+            collections[family].clear()
+        before = len(collections[family])
+        pending = b""
+        async for chunk in request.stream():
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            store.load(family, (loads(line) for line in lines if line.strip()))
+        if pending.strip():
+            store.load(family, [loads(pending)])
+        return reply({"family": family, "loaded": len(collections[family]) - before})
+
+    @app.post("/api/auth/signin")
+    async def signin(request: Request):
+        await wait("auth")
+        body = await request.json()
+        return reply({
+            "session": {"access_token": "mock-token"},
+            "dbUser": {"id": "user-0", "role": "ADMIN", "tenantId": "tenant-1", "email": body.get("email")},
+        }, 201)
+
+    @app.get("/api/contacts/search")
+    async def contacts_search(q: str = ""):
+        await wait("contacts")
+        q = q.lower()
+        return reply([
+            c for c in collections["contacts"].values()
+            if q in c["firstName"].lower() or q in c.get("lastName", "").lower() or q in c.get("email", "")
+        ][:50])
+
+    @app.get("/api/stages")
+    async def stages_list(request: Request):
+        await wait("stages")
+        return reply(filtered(store.stages(), dict(request.query_params)))
+
+    @app.get("/api/analytics/dashboard")
+    async def analytics_dashboard():
+        await wait("analytics")
+        deal_records = collections["deals"].values()
+        return reply({
+            "totalContacts": len(collections["contacts"]),
+            "totalDeals": len(collections["deals"]),
+            "totalLeads": len(collections["leads"]),
+            "openTickets": sum(1 for t in collections["tickets"].values() if t.get("status") == "OPEN"),
+            "pipelineValue": sum(d.get("value") or 0 for d in deal_records),
+        })
+
+    @app.get("/api/analytics/revenue")
+    async def analytics_revenue():
+        await wait("analytics")
+        by_stage: Dict[str, float] = {}
+        for deal in collections["deals"].values():
+            name = (deal.get("stage") or {}).get("name", "Unknown")
+            by_stage[name] = by_stage.get(name, 0) + (deal.get("value") or 0)
+        return reply({"byStage": by_stage, "forecast": sum(by_stage.values()) * 0.4})
+
+    @app.post("/api/users/invite")
+    async def users_invite(request: Request):
+        await wait("users")
+        body = await request.json()
+        record = {"id": store.new_id("users"), "email": body.get("email"), "role": body.get("role", "MEMBER")}
+        collections["users"][record["id"]] = record
+        return reply(record, 201)
+
+    @app.patch("/api/deals/{record_id}/move")
+    async def deals_move(record_id: str, request: Request):
+        await wait("deals")
+        deal = collections["deals"].get(record_id)
+        if deal is None:
+            return not_found("deals", record_id)
+        stage_id = (await request.json()).get("stageId")
+        stage = next((s for s in store.stages() if s["id"] == stage_id), None)
+        deal.update(stageId=stage_id, stage={"id": stage_id, "name": stage["name"] if stage else stage_id})
+        return reply(deal)
+
+    @app.post("/api/leads/{record_id}/convert")
+    async def leads_convert(record_id: str, request: Request):
+        await wait("leads")
+        lead = collections["leads"].get(record_id)
+        if lead is None:
+            return not_found("leads", record_id)
+        body = await request.json()
+        lead["status"] = "CONVERTED"
+        deal = {
+            "id": store.new_id("deals"), "title": lead.get("title"), "value": lead.get("value"),
+            "pipelineId": body.get("pipelineId"), "stageId": body.get("stageId"), "contact": lead.get("contact"),
+        }
+        collections["deals"][deal["id"]] = deal
+        return reply(deal, 201)
+
+    @app.post("/api/tickets/{record_id}/comments")
+    async def tickets_comment(record_id: str, request: Request):
+        await wait("tickets")
+        if record_id not in collections["tickets"]:
+            return not_found("tickets", record_id)
+        body = await request.json()
+        return reply({"id": store.new_id("tickets"), "ticketId": record_id, "comment": body.get("comment")}, 201)
+
+    @app.patch("/api/tickets/{record_id}/assign")
+    async def tickets_assign(record_id: str, request: Request):
+        await wait("tickets")
+        ticket = collections["tickets"].get(record_id)
+        if ticket is None:
+            return not_found("tickets", record_id)
+        ticket["assignedUserId"] = (await request.json()).get("userId")
+        return reply(ticket)
+
+    @app.patch("/api/users/{record_id}/role")
+    async def users_update_role(record_id: str, request: Request):
+        await wait("users")
+        user = collections["users"].get(record_id)
+        if user is None:
+            return not_found("users", record_id)
+        user["role"] = (await request.json()).get("role")
+        return reply(user)
+
+    # ---------- generic CRUD per family ----------
+
+    def add_crud(family: str) -> None:
+        collection = collections[family]
+        timing = family.split("/", 1)[0]
+
+        async def list_records(request: Request):
+            await wait(timing)
+            return reply(filtered(collection.values(), dict(request.query_params)))
+
+        async def get_record(record_id: str):
+            await wait(timing)
+            record = collection.get(record_id)
+            return reply(record) if record is not None else not_found(family, record_id)
+
+        async def create_record(request: Request):
+            await wait(timing)
+            record = {"id": store.new_id(family), **(await request.json())}
+            collection[record["id"]] = record
+            return reply(record, 201)
+
+        async def update_record(record_id: str, request: Request):
+            await wait(timing)
+            record = collection.get(record_id)
+            if record is None:
+                return not_found(family, record_id)
+            record.update(await request.json())
+            return reply(record)
+
+        async def delete_record(record_id: str):
+            await wait(timing)
+            record = collection.pop(record_id, None)
+            return reply({"deleted": True, "id": record_id}) if record is not None else not_found(family, record_id)
+
+        app.add_api_route(f"/api/{family}", list_records, methods=["GET"])
+        app.add_api_route(f"/api/{family}", create_record, methods=["POST"])
+        app.add_api_route(f"/api/{family}/{{record_id}}", get_record, methods=["GET"])
+        app.add_api_route(f"/api/{family}/{{record_id}}", update_record, methods=["PATCH"])
+        app.add_api_route(f"/api/{family}/{{record_id}}", delete_record, methods=["DELETE"])
+
+    for family in FAMILIES:
+        add_crud(family)
+
+    return app
+
+
+def parse_route_latency(text: str) -> Dict[str, float]:
+    """'analytics=50,deals=10' -> {"analytics": 50.0, "deals": 10.0}"""
+    pairs = (item.split("=", 1) for item in text.split(",") if "=" in item)
+    return {family.strip(): float(value) for family, value in pairs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock Synapse backend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3999)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Added delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Extra random delay (uniform 0..N ms)")
+    parser.add_argument("--route-latency", default="", help="Per-family delay, e.g. analytics=50,deals=10")
+    parser.add_argument("--contacts", type=int, default=100, help="Contacts returned by /contacts")
+    parser.add_argument("--deals", type=int, default=100)
+    parser.add_argument("--leads", type=int, default=100)
+    parser.add_argument("--tickets", type=int, default=100)
+    parser.add_argument("--pipelines", type=int, default=2)
+    parser.add_argument("--pad-bytes", type=int, default=0, help="Notes field size per record (payload size)")
+    parser.add_argument("--data-dir", help="Serve <family>.jsonl files from benchmarks.synthetic_data instead")
+    args = parser.parse_args()
+
+    store = None
+    if args.data_dir:
+        store = MockStore()
+        for family in FAMILIES:
+            path = Path(args.data_dir) / f"{family.replace('/', '_')}.jsonl"
+            if path.exists():
+                print(f"{family}: {store.load_jsonl(family, path)} records")
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        contacts=args.contacts,
+        deals=args.deals,
+        leads=args.leads,
+        tickets=args.tickets,
+        pipelines=args.pipelines,
+        jitter_ms=args.jitter_ms,
+        route_latency_ms=parse_route_latency(args.route_latency),
+        pad_bytes=args.pad_bytes,
+        store=store,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+"""
+Synthetic Tenant Data Generator
+Seeded, streaming contacts/deals/leads/tickets for scale tests
+
+Every record is a pure function of (seed, kind, index), so any record
+can be rebuilt without keeping the others: deals point at contact
+contact-<n> and embed that contact's name by regenerating it. Memory
+stays flat from 100 to 1,000,000+ contacts; only the pipelines (a few
+dozen records) are held.
+
+Records use the field shapes the servers read: firstName/lastName/email,
+deal value with nested stage/pipeline/contact, lead status/source,
+ticket status/priority.
+
+Usage:
+    python -m benchmarks.synthetic_data --contacts 100000 --out /tmp/tenant-100k
+    python -m benchmarks.synthetic_data --contacts 1000000 --post http://127.0.0.1:3999
+    python -m benchmarks.mock_backend --data-dir /tmp/tenant-100k
+"""
+
+import math
+import time
+import argparse
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from serialization import dumps_bytes
+
+FIRST_NAMES = (
+    "James", "Mary", "Robert", "Patricia", "John", "Jennifer", "Michael", "Linda", "David", "Elizabeth",
+    "William", "Barbara", "Richard", "Susan", "Joseph", "Jessica", "Thomas", "Sarah", "Carlos", "Karen",
+    "Wei", "Aisha", "Mohammed", "Olga", "Hiroshi", "Priya", "José", "Chloé", "Lars", "Fatima",
+)
+LAST_NAMES = (
+    "Smith", "Johnson", "Williams", "Brown", "Jones", "Garcia", "Miller", "Davis", "Rodriguez", "Martinez",
+    "Hernandez", "Lopez", "Wilson", "Anderson", "Thomas", "Taylor", "Moore", "Jackson", "Martin", "Lee",
+    "Nguyen", "Kim", "Müller", "Rossi", "Dubois", "Kowalski", "Silva", "Tanaka", "Okafor", "Novak",
+)
+COMPANY_WORDS = (
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli", "Vandelay", "Soylent", "Tyrell",
+    "Cyberdyne", "Wonka", "Gringotts", "Oscorp", "Aperture", "Massive", "Pied Piper", "Dunder", "Vehement", "Monarch",
+)
+COMPANY_SUFFIXES = ("Inc", "LLC", "Ltd", "GmbH", "Group", "Labs", "Systems", "Partners")
+JOB_TITLES = ("CEO", "CTO", "Head of Sales", "Account Manager", "Procurement Lead", "Engineer", "Office Manager", "Founder")
+DOMAINS = ("example.com", "mail.test", "corp.example", "inbox.test")
+LEAD_STATUSES = ("NEW", "CONTACTED", "QUALIFIED", "UNQUALIFIED", "CONVERTED")
+LEAD_SOURCES = ("Website", "Referral", "Cold Call", "Event", "LinkedIn", "Partner")
+TICKET_STATUSES = ("OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED")
+TICKET_PRIORITIES = ("LOW", "MEDIUM", "HIGH", "URGENT")
+TICKET_SOURCES = ("EMAIL", "PHONE", "CHAT", "PORTAL", "WEB_FORM")
+TICKET_TOPICS = ("Login fails", "Invoice is wrong", "Export times out", "Cannot add user", "Sync is slow", "Need a refund")
+STAGE_NAMES = ("Lead", "Qualified", "Proposal", "Negotiation", "Won", "Lost")
+DEAL_WORDS = ("Renewal", "Expansion", "Pilot", "Enterprise plan", "Onboarding", "Support contract")
+
+KINDS = ("pipelines", "contacts", "deals", "leads", "tickets")
+
+_MASK = (1 << 64) - 1
+_EPOCH = 1_700_000_000  # fixed "now" so output does not depend on the clock
+
+
+def _mix(value: int) -> int:
+    """splitmix64 finalizer: well-spread 64-bit hash of an integer"""
+    value = (value + 0x9E3779B97F4A7C15) & _MASK
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK
+    return value ^ (value >> 31)
+
+
+class Draw:
+    """Deterministic draws for one record: (seed, kind, index) -> a stream of numbers"""
+
+    __slots__ = ("state",)
+
+    def __init__(self, seed: int, kind: int, index: int):
+        self.state = _mix(_mix(seed * 31 + kind) ^ index)
+
+    def next(self) -> int:
+        self.state = _mix(self.state)
+        return self.state
+
+    def uniform(self) -> float:
+        return (self.next() >> 11) / float(1 << 53)
+
+    def below(self, n: int) -> int:
+        return self.next() % n
+
+    def choice(self, items: tuple) -> Any:
+        return items[self.next() % len(items)]
+
+    def lognormal(self, mu: float, sigma: float) -> float:
+        # Box-Muller on two draws
+        u1 = max(self.uniform(), 1e-12)
+        z = math.sqrt(-2.0 * math.log(u1)) * math.cos(2.0 * math.pi * self.uniform())
+        return math.exp(mu + sigma * z)
+
+
+def _iso(seconds: float) -> str:
+    return time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime(seconds))
+
+
+@dataclass
+class TenantSpec:
+    """Size and shape of one synthetic tenant"""
+    contacts: int = 1000
+    deals_per_contact: float = 0.5
+    leads_per_contact: float = 0.3
+    tickets_per_contact: float = 0.2
+    pipelines: int = 3
+    seed: int = 42
+    companies: Optional[int] = None   # distinct companies (default contacts / 20)
+
+    def count(self, kind: str) -> int:
+        if kind == "pipelines":
+            return self.pipelines
+        if kind == "contacts":
+            return self.contacts
+        ratio = {"deals": self.deals_per_contact, "leads": self.leads_per_contact, "tickets": self.tickets_per_contact}[kind]
+        return int(self.contacts * ratio)
+
+
+class TenantGenerator:
+    """Streams the records of one TenantSpec (same spec, same records)"""
+
+    def __init__(self, spec: TenantSpec):
+        self.spec = spec
+        self.companies = max(1, spec.companies or spec.contacts // 20)
+        self.pipelines = list(self._pipelines())
+
+    # ---------- single records ----------
+
+    def contact(self, index: int) -> Dict[str, Any]:
+        draw = Draw(self.spec.seed, 1, index)
+        first = draw.choice(FIRST_NAMES)
+        last = draw.choice(LAST_NAMES)
+        company = self.company(draw.below(self.companies))
+        return {
+            "id": f"contact-{index}",
+            "firstName": first,
+            "lastName": last,
+            "email": f"{first.lower()}.{last.lower()}{index}@{draw.choice(DOMAINS)}",
+            "phone": f"+1{200 + draw.below(800):03d}{draw.below(10_000_000):07d}",
+            "company": company,
+            "jobTitle": draw.choice(JOB_TITLES),
+            "createdAt": _iso(_EPOCH - draw.below(730 * 86400)),
+        }
+
+    def company(self, index: int) -> str:
+        draw = Draw(self.spec.seed, 2, index)
+        name = f"{draw.choice(COMPANY_WORDS)} {draw.choice(COMPANY_SUFFIXES)}"
+        return name if index < len(COMPANY_WORDS) * len(COMPANY_SUFFIXES) else f"{name} {index}"
+
+    def contact_ref(self, index: int) -> Dict[str, Any]:
+        """The nested contact object deals/leads/tickets carry"""
+        contact = self.contact(index)
+        return {key: contact[key] for key in ("id", "firstName", "lastName", "email", "company")}
+
+    def deal(self, index: int) -> Dict[str, Any]:
+        draw = Draw(self.spec.seed, 3, index)
+        pipeline = self.pipelines[draw.below(len(self.pipelines))]
+        stage = pipeline["stages"][draw.below(len(pipeline["stages"]))]
+        contact = self.contact_ref(draw.below(max(1, self.spec.contacts)))
+        created = _EPOCH - draw.below(365 * 86400)
+        return {
+            "id": f"deal-{index}",
+            "title": f"{contact['company']} - {draw.choice(DEAL_WORDS)}",
+            "value": round(draw.lognormal(9.0, 1.0), 2),
+            "probability": draw.below(101),
+            "expectedCloseDate": _iso(created + draw.below(180 * 86400)),
+            "pipelineId": pipeline["id"],
+            "stageId": stage["id"],
+            "contactId": contact["id"],
+            "pipeline": {"id": pipeline["id"], "name": pipeline["name"]},
+            "stage": {"id": stage["id"], "name": stage["name"], "order": stage["order"]},
+            "contact": contact,
+            "createdAt": _iso(created),
+        }
+
+    def lead(self, index: int) -> Dict[str, Any]:
+        draw = Draw(self.spec.seed, 4, index)
+        contact = self.contact_ref(draw.below(max(1, self.spec.contacts)))
+        return {
+            "id": f"lead-{index}",
+            "title": f"{contact['company']} inbound",
+            "status": draw.choice(LEAD_STATUSES),
+            "source": draw.choice(LEAD_SOURCES),
+            "value": round(draw.lognormal(8.0, 1.2), 2),
+            "contactId": contact["id"],
+            "contact": contact,
+            "createdAt": _iso(_EPOCH - draw.below(365 * 86400)),
+        }
+
+    def ticket(self, index: int) -> Dict[str, Any]:
+        draw = Draw(self.spec.seed, 5, index)
+        contact = self.contact_ref(draw.below(max(1, self.spec.contacts)))
+        topic = draw.choice(TICKET_TOPICS)
+        return {
+            "id": f"ticket-{index}",
+            "title": f"{topic} ({contact['company']})",
+            "description": f"{contact['firstName']} reports: {topic.lower()} since the last update.",
+            "status": draw.choice(TICKET_STATUSES),
+            "priority": draw.choice(TICKET_PRIORITIES),
+            "source": draw.choice(TICKET_SOURCES),
+            "contactId": contact["id"],
+            "contact": contact,
+            "createdAt": _iso(_EPOCH - draw.below(90 * 86400)),
+        }
+
+    def _pipelines(self) -> Iterator[Dict[str, Any]]:
+        for p in range(1, self.spec.pipelines + 1):
+            draw = Draw(self.spec.seed, 6, p)
+            name = "Sales" if p == 1 else f"{draw.choice(('Renewals', 'Partners', 'Enterprise', 'SMB'))} {p}"
+            yield {
+                "id": f"pipeline-{p}",
+                "name": name,
+                "stages": [
+                    {"id": f"stage-{p}-{s}", "name": stage, "order": s, "pipelineId": f"pipeline-{p}"}
+                    for s, stage in enumerate(STAGE_NAMES, start=1)
+                ],
+            }
+
+    # ---------- streams ----------
+
+    def records(self, kind: str) -> Iterator[Dict[str, Any]]:
+        """All records of one kind, generated lazily in index order"""
+        if kind == "pipelines":
+            yield from self.pipelines
+            return
+        make = {"contacts": self.contact, "deals": self.deal, "leads": self.lead, "tickets": self.ticket}[kind]
+        for index in range(self.spec.count(kind)):
+            yield make(index)
+
+
+def ndjson_chunks(records: Iterator[Dict[str, Any]], chunk_bytes: int = 1 << 20) -> Iterator[bytes]:
+    """Records as NDJSON, joined into chunks of about chunk_bytes"""
+    buffer: List[bytes] = []
+    size = 0
+    for record in records:
+        line = dumps_bytes(record, pretty=False) + b"\n"
+        buffer.append(line)
+        size += len(line)
+        if size >= chunk_bytes:
+            yield b"".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield b"".join(buffer)
+
+
+def write_jsonl(generator: TenantGenerator, out_dir: Path, kinds: tuple = KINDS) -> Dict[str, int]:
+    """Write <kind>.jsonl files; returns bytes written per kind"""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    written = {}
+    for kind in kinds:
+        total = 0
+        with open(out_dir / f"{kind}.jsonl", "wb") as f:
+            for chunk in ndjson_chunks(generator.records(kind)):
+                f.write(chunk)
+                total += len(chunk)
+        written[kind] = total
+    return written
+
+
+def post_to_mock(generator: TenantGenerator, base_url: str, kinds: tuple = KINDS, replace: bool = True) -> Dict[str, int]:
+    """Stream records into a running mock backend (POST /api/_mock/load/<kind>, NDJSON body)"""
+    import httpx
+
+    loaded = {}
+    with httpx.Client(base_url=base_url, timeout=None) as client:
+        for kind in kinds:
+            response = client.post(
+                f"/api/_mock/load/{kind}",
+                params={"replace": str(replace).lower()},
+                content=ndjson_chunks(generator.records(kind)),
+                headers={"Content-Type": "application/x-ndjson"},
+            )
+            response.raise_for_status()
+            loaded[kind] = response.json()["loaded"]
+    return loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic tenant data generator")
+    parser.add_argument("--contacts", type=int, default=1000)
+    parser.add_argument("--deals-per-contact", type=float, default=0.5)
+    parser.add_argument("--leads-per-contact", type=float, default=0.3)
+    parser.add_argument("--tickets-per-contact", type=float, default=0.2)
+    parser.add_argument("--pipelines", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--kinds", default=",".join(KINDS), help="Comma-separated record kinds")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="Directory for <kind>.jsonl files")
+    target.add_argument("--post", help="Mock backend base URL to load into, e.g. http://127.0.0.1:3999")
+    args = parser.parse_args()
+
+    spec = TenantSpec(
+        contacts=args.contacts,
+        deals_per_contact=args.deals_per_contact,
+        leads_per_contact=args.leads_per_contact,
+        tickets_per_contact=args.tickets_per_contact,
+        pipelines=args.pipelines,
+        seed=args.seed,
+    )
+    kinds = tuple(k.strip() for k in args.kinds.split(",") if k.strip() in KINDS)
+    generator = TenantGenerator(spec)
+    started = time.perf_counter()
+    if args.out:
+        result = write_jsonl(generator, Path(args.out), kinds)
+        summary = ", ".join(f"{kind} {size / 1e6:.1f} MB" for kind, size in result.items())
+    else:
+        result = post_to_mock(generator, args.post, kinds)
+        summary = ", ".join(f"{kind} {count}" for kind, count in result.items())
+    print(f"{summary} in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
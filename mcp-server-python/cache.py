@@ -1,9 +1,16 @@
 """
 Session Management for MCP Server
 Supports file-based session storage for CLI clients
+
+The parsed session is kept in memory by SessionManager. The file is only
+re-checked (one stat) every SESSION_RECHECK_SECONDS to notice logins from
+another process, so the per-call hot path does no filesystem work.
 """
 
+import os
 import json
+import time
+import tempfile
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
@@ -14,80 +21,158 @@ logger = logging.getLogger(__name__)
 # Session file location
 SESSION_FILE = Path.home() / ".synapse" / "session.json"
 SESSION_EXPIRY_HOURS = 24
+SESSION_RECHECK_SECONDS = float(os.getenv("MCP_SESSION_RECHECK_SECONDS", "2"))
+
+
+def _expiry_timestamp(session: Dict[str, Any]) -> float:
+    """Epoch seconds at which a session expires (computed once per load)"""
+    created_at_str = session.get('created_at', '2000-01-01T00:00:00')
+    created_at = datetime.fromisoformat(created_at_str)
+    return (created_at + timedelta(hours=SESSION_EXPIRY_HOURS)).timestamp()
+
+
+class SessionManager:
+    """
+    In-memory view of the CLI session file
+
+    - get() serves the parsed session from memory
+    - file changes are detected by mtime, at most once per recheck interval
+    - expiry is precomputed as an epoch timestamp
+    - writes are atomic (temp file + rename)
+    """
+
+    def __init__(self, path: Path = SESSION_FILE, recheck_seconds: float = SESSION_RECHECK_SECONDS):
+        self.path = path
+        self.recheck_seconds = recheck_seconds
+        self._session: Optional[Dict[str, Any]] = None
+        self._expires_at = 0.0
+        self._mtime_ns: Optional[int] = None
+        self._next_check = 0.0
+
+    def get(self) -> Optional[Dict[str, Any]]:
+        """
+        Current session, or None if missing/expired
+
+        Returns:
+            Session data dict (shared - do not mutate)
+        """
+        now = time.monotonic()
+        if now >= self._next_check:
+            self._refresh()
+            self._next_check = now + self.recheck_seconds
+
+        if self._session is None:
+            return None
+
+        if time.time() >= self._expires_at:
+            logger.info("⚠️  Session expired (24 hours)")
+            self.delete()
+            return None
+
+        return self._session
+
+    def _refresh(self) -> None:
+        """Reload the file only if it changed since the last read"""
+        try:
+            mtime_ns = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            if self._session is not None:
+                logger.debug("Session file removed")
+            self._session, self._mtime_ns = None, None
+            return
+
+        if mtime_ns == self._mtime_ns:
+            return
+
+        try:
+            session = json.loads(self.path.read_text())
+            self._expires_at = _expiry_timestamp(session)
+            self._session = session
+            logger.debug(f"Loaded session for {session.get('email')}")
+        except Exception as e:
+            logger.error(f"❌ Error loading session: {e}")
+            self._session = None
+        self._mtime_ns = mtime_ns
+
+    def save(self, data: Dict[str, Any]) -> None:
+        """Write the session atomically and update the in-memory copy"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Temp file in the same directory so the rename is atomic
+        fd, tmp_path = tempfile.mkstemp(dir=self.path.parent, prefix=".session-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(data, f, indent=2, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            raise
+
+        self._session = data
+        self._expires_at = _expiry_timestamp(data)
+        self._mtime_ns = os.stat(self.path).st_mtime_ns
+        self._next_check = time.monotonic() + self.recheck_seconds
+
+    def delete(self) -> None:
+        """Forget the session and remove the file"""
+        self._session, self._mtime_ns = None, None
+        try:
+            self.path.unlink()
+            logger.info("🗑️  Session deleted")
+        except FileNotFoundError:
+            pass
+
+
+# Process-wide manager used by the module functions below
+session_manager = SessionManager()
 
 
 def save_session(data: Dict[str, Any]) -> None:
     """
     Save session to file for CLI clients
-    
+
     Args:
         data: Session data including email, jwt, userId, role, tenantId
     """
-    # Create directory if doesn't exist
-    SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-    
     # Add timestamp
     data["created_at"] = datetime.now().isoformat()
-    
-    # Write JSON to file
-    SESSION_FILE.write_text(json.dumps(data, indent=2))
-    
+
+    session_manager.save(data)
+
     logger.info(f"✅ Session saved for {data.get('email')}")
 
 
 def load_session() -> Optional[Dict[str, Any]]:
     """
-    Load session from file if not expired
-    
+    Load session if not expired (served from memory)
+
     Returns:
         Session data dict or None if not found/expired
     """
-    # Check if file exists
-    if not SESSION_FILE.exists():
-        logger.debug("No session file found")
-        return None
-    
-    try:
-        # Read and parse JSON
-        session = json.loads(SESSION_FILE.read_text())
-        
-        # Check expiration (24 hours)
-        created_at_str = session.get('created_at', '2000-01-01T00:00:00')
-        created_at = datetime.fromisoformat(created_at_str)
-        age = datetime.now() - created_at
-        
-        if age > timedelta(hours=SESSION_EXPIRY_HOURS):
-            logger.info("⚠️  Session expired (24 hours)")
-            delete_session()
-            return None
-        
-        logger.debug(f"Loaded session for {session.get('email')}")
-        return session
-        
-    except Exception as e:
-        logger.error(f"❌ Error loading session: {e}")
-        return None
+    return session_manager.get()
 
 
 def delete_session() -> None:
     """Delete session file"""
-    if SESSION_FILE.exists():
-        SESSION_FILE.unlink()
-        logger.info("🗑️  Session deleted")
+    session_manager.delete()
 
 
 def is_session_expired(session: Dict[str, Any]) -> bool:
     """
     Check if session is expired
-    
+
     Args:
         session: Session data dict
-        
+
     Returns:
         True if expired, False otherwise
     """
-    created_at_str = session.get('created_at', '2000-01-01T00:00:00')
-    created_at = datetime.fromisoformat(created_at_str)
-    age = datetime.now() - created_at
-    
-    return age > timedelta(hours=SESSION_EXPIRY_HOURS)
+    try:
+        return time.time() >= _expiry_timestamp(session)
+    except ValueError:
+        return True
@@ -0,0 +1,75 @@
+"""
+Request Coalescing (singleflight) for Backend Reads
+Concurrent identical read calls share one in-flight backend request
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+logger = logging.getLogger(__name__)
+
+
+class RequestCoalescer:
+    """
+    Deduplicate identical in-flight requests
+
+    The first caller for a key (the leader) starts the backend request in
+    its own task; callers arriving while it runs await the same task.
+    The task is shielded so a disconnecting leader does not cancel the
+    request for everyone else.
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._inflight: Dict[Hashable, "asyncio.Task[Any]"] = {}
+        self._counters: Dict[str, Dict[str, int]] = {}
+
+    async def run(
+        self,
+        key: Hashable,
+        tool_name: str,
+        factory: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Run factory() once per key among concurrent callers
+
+        Args:
+            key: Identity of the request (subject, tool, normalized args)
+            tool_name: Tool name for per-tool counters
+            factory: Coroutine function performing the backend call
+
+        Returns:
+            The shared result (exceptions propagate to every waiter)
+        """
+        counters = self._counters.setdefault(tool_name, {"requests": 0, "deduplicated": 0})
+        counters["requests"] += 1
+
+        if not self.enabled:
+            return await factory()
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(factory())
+            self._inflight[key] = task
+            task.add_done_callback(lambda done, key=key: self._forget(key, done))
+        else:
+            counters["deduplicated"] += 1
+            logger.debug(f"Coalesced {tool_name} with in-flight request")
+
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark exceptions as retrieved when every waiter has gone away
+        if not task.cancelled():
+            task.exception()
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._inflight)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-tool request and deduplication counts"""
+        return {tool: dict(counts) for tool, counts in self._counters.items()}
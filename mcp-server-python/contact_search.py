@@ -0,0 +1,307 @@
+"""
+Local Fuzzy Contact Search
+Trigram index over each tenant's cached contacts
+
+With MCP_CONTACT_SEARCH=local, contacts_search is answered from memory:
+the tenant's full contact list is loaded once (through the response
+cache), indexed by name/email/company/phone trigrams and kept current by
+contacts_* results. Ranking tolerates typos ("jhon smith") and prefers
+exact and prefix matches. Tenants above the per-tenant contact cap fall
+back to the backend search endpoint.
+"""
+
+import os
+import re
+import heapq
+import math
+import time
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from entity_index import normalize
+
+logger = logging.getLogger(__name__)
+
+SEARCH_MODES = ("backend", "local")
+
+# Fields kept per contact (the rest of the record is not needed to answer a search)
+CONTACT_FIELDS = ("id", "firstName", "lastName", "email", "phone", "company", "jobTitle")
+
+
+_PHONE = re.compile(r"[\d\s()+.-]+")
+
+# Joins the searchable fields of a contact; never appears in a query
+_FIELD_SEP = " \x00 "
+
+
+def trigrams(text: str) -> Set[str]:
+    """Space-padded character trigrams (" jo" marks a word start, so prefixes match)"""
+    if not text:
+        return set()
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def query_trigrams(text: str, anchored: bool = True) -> Set[str]:
+    """
+    Trigrams of a search query
+
+    Only the start is padded: the query may be a prefix ("user12@exa"), so
+    it must not require a word end. Unanchored queries (phone fragments)
+    match anywhere inside a field.
+    """
+    padded = f" {text}" if anchored or len(text) < 3 else text
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _digits(text: Any) -> str:
+    return "".join(ch for ch in str(text or "") if ch.isdigit())
+
+
+class TenantContacts:
+    """Trigram postings for one tenant's contacts, bounded by max_contacts"""
+
+    def __init__(self, max_contacts: int):
+        self.max_contacts = max_contacts
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self.fields: Dict[str, Tuple[str, ...]] = {}          # id -> normalized searchable fields
+        self.grams: Dict[str, Set[str]] = {}                  # id -> trigrams (for removal)
+        self.postings: Dict[str, Set[str]] = {}               # trigram -> ids
+        self.complete = False                                 # holds the tenant's full list
+        self.loaded_at = 0.0
+        self.overflowed = False                               # last full list exceeded max_contacts
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def upsert(self, record: Dict[str, Any]) -> bool:
+        """Index one contact; False when the tenant is at capacity"""
+        contact_id = str(record["id"])
+        if contact_id not in self.records and len(self.records) >= self.max_contacts:
+            self.complete = False
+            return False
+        self.remove(contact_id)
+
+        slim = {key: record[key] for key in CONTACT_FIELDS if record.get(key) is not None}
+        name = normalize(f"{record.get('firstName') or ''} {record.get('lastName') or ''}")
+        fields = (name, normalize(record.get("email")), normalize(record.get("company")), _digits(record.get("phone")))
+        grams = trigrams(_FIELD_SEP.join(value for value in fields if value))
+
+        self.records[contact_id] = slim
+        self.fields[contact_id] = fields
+        self.grams[contact_id] = grams
+        postings = self.postings
+        for gram in grams:
+            ids = postings.get(gram)
+            if ids is None:
+                postings[gram] = {contact_id}
+            else:
+                ids.add(contact_id)
+        return True
+
+    def remove(self, contact_id: str) -> None:
+        if self.records.pop(contact_id, None) is None:
+            return
+        del self.fields[contact_id]
+        for gram in self.grams.pop(contact_id):
+            ids = self.postings.get(gram)
+            if ids is not None:
+                ids.discard(contact_id)
+                if not ids:
+                    del self.postings[gram]
+
+    def replace_all(self, records: Iterable[Any]) -> None:
+        """Rebuild from a full contacts_list result"""
+        self.records.clear()
+        self.fields.clear()
+        self.grams.clear()
+        self.postings.clear()
+        self.complete = True
+        self.overflowed = False
+        for record in records:
+            if isinstance(record, dict) and record.get("id") is not None:
+                if not self.upsert(record):
+                    self.overflowed = True
+                    break
+        self.loaded_at = time.monotonic()
+
+    def search(self, query: str, limit: int, min_similarity: float) -> List[Dict[str, Any]]:
+        """
+        Rank contacts by trigram overlap with exact/prefix/substring boosts
+
+        Returns:
+            Contact records, best match first
+        """
+        text = normalize(query)
+        digits = _digits(query)
+        phone = len(digits) >= 3 and _PHONE.fullmatch(query.strip()) is not None
+        if phone:
+            text = digits
+        query_grams = query_trigrams(text, anchored=not phone)
+        if not query_grams:
+            return []
+
+        # Exact pass: contacts holding every query trigram (set intersection in C)
+        postings = [self.postings.get(gram) for gram in query_grams]
+        if all(postings):
+            postings.sort(key=len)
+            full = postings[0].intersection(*postings[1:])
+            if full:
+                return self._rank(text, [(len(query_grams), contact_id) for contact_id in full], len(query_grams), limit)
+
+        # Typo pass: a contact sharing `needed` grams must appear in one of the
+        # len - needed + 1 rarest postings, so only those are scanned
+        needed = max(1, math.ceil(len(query_grams) * min_similarity))
+        rarest = sorted(query_grams, key=lambda gram: len(self.postings.get(gram, ())))
+        candidates: Set[str] = set()
+        for gram in rarest[:len(query_grams) - needed + 1]:
+            candidates.update(self.postings.get(gram, ()))
+
+        grams = self.grams
+        overlap = [
+            (count, contact_id)
+            for contact_id in candidates
+            for count in (len(query_grams & grams[contact_id]),)
+            if count >= needed
+        ]
+        return self._rank(text, overlap, len(query_grams), limit)
+
+    def _rank(self, text: str, overlap: List[Tuple[int, str]], total: int, limit: int) -> List[Dict[str, Any]]:
+        """
+        Best `limit` of (shared trigrams, id) pairs with exact/prefix/substring boosts
+
+        Every candidate is scored before the limit applies, so exact and
+        prefix matches win even for broad queries with thousands of hits.
+        """
+        ranked = []
+        for count, contact_id in overlap:
+            score = count / total
+            for value in self.fields[contact_id]:
+                if not value:
+                    continue
+                if value == text:
+                    score += 1.0
+                elif value.startswith(text) or f" {text}" in f" {value}":
+                    score += 0.5
+                elif text in value:
+                    score += 0.25
+            ranked.append((-score, self.fields[contact_id][0], contact_id))
+
+        return [self.records[contact_id] for _, _, contact_id in heapq.nsmallest(limit, ranked)]
+
+
+class ContactSearch:
+    """
+    Per-tenant local contact search (LRU over tenants)
+
+    observe() follows contacts_* results; search() answers from memory
+    when the tenant's full list is indexed and fresh.
+    """
+
+    def __init__(
+        self,
+        mode: str = "backend",
+        max_tenants: int = 64,
+        max_contacts: int = 20000,
+        ttl: float = 300,
+        limit: int = 25,
+        min_similarity: float = 0.4,
+    ):
+        self.enabled = mode == "local"
+        self.max_tenants = max_tenants
+        self.max_contacts = max_contacts
+        self.ttl = ttl
+        self.limit = limit
+        self.min_similarity = min_similarity
+        self._tenants: "OrderedDict[str, TenantContacts]" = OrderedDict()
+        self.local_hits = 0
+        self.fallbacks = 0
+
+    @classmethod
+    def from_env(cls) -> "ContactSearch":
+        mode = os.getenv("MCP_CONTACT_SEARCH", "backend").strip().lower()
+        if mode not in SEARCH_MODES:
+            logger.warning(f"⚠️  Unknown MCP_CONTACT_SEARCH={mode!r}, using backend")
+            mode = "backend"
+        return cls(
+            mode=mode,
+            max_tenants=int(os.getenv("MCP_CONTACT_SEARCH_MAX_TENANTS", "64")),
+            max_contacts=int(os.getenv("MCP_CONTACT_SEARCH_MAX_CONTACTS", "20000")),
+            ttl=float(os.getenv("MCP_CONTACT_SEARCH_TTL", "300")),
+            limit=int(os.getenv("MCP_CONTACT_SEARCH_LIMIT", "25")),
+        )
+
+    def tenant(self, subject: str) -> TenantContacts:
+        contacts = self._tenants.get(subject)
+        if contacts is None:
+            contacts = self._tenants[subject] = TenantContacts(self.max_contacts)
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+        else:
+            self._tenants.move_to_end(subject)
+        return contacts
+
+    def is_ready(self, subject: str) -> bool:
+        """True when the tenant's full contact list is indexed and within TTL"""
+        contacts = self._tenants.get(subject)
+        return (
+            contacts is not None
+            and contacts.complete
+            and time.monotonic() - contacts.loaded_at <= self.ttl
+        )
+
+    def should_load(self, subject: str) -> bool:
+        """True when a full contacts_list would make the tenant searchable"""
+        if self.is_ready(subject):
+            return False
+        contacts = self._tenants.get(subject)
+        # Too many contacts last time - leave search to the backend until the TTL passes
+        return not (
+            contacts is not None
+            and contacts.overflowed
+            and time.monotonic() - contacts.loaded_at <= self.ttl
+        )
+
+    # ==================== UPDATES ====================
+
+    def tracks(self, tool_name: str) -> bool:
+        return self.enabled and tool_name.startswith("contacts_")
+
+    def observe(self, subject: str, tool_name: str, args: Dict[str, Any], data: Any, refresh: bool = True) -> None:
+        """Follow contacts_* results (full lists rebuild, writes update in place)"""
+        if not self.tracks(tool_name):
+            return
+        if tool_name == "contacts_list":
+            # Rebuilt at most once per TTL; writes keep it current in between
+            if not args and isinstance(data, list) and not self.is_ready(subject):
+                self.tenant(subject).replace_all(data)
+            return
+        if subject not in self._tenants:
+            return  # nothing indexed yet - the next full list covers it
+        contacts = self.tenant(subject)
+        if tool_name == "contacts_delete":
+            if args.get("contactId"):
+                contacts.remove(str(args["contactId"]))
+        elif tool_name in ("contacts_create", "contacts_update", "contacts_get"):
+            if isinstance(data, dict) and data.get("id") is not None:
+                contacts.upsert(data)
+
+    # ==================== SEARCH ====================
+
+    def search(self, subject: str, query: str) -> Optional[List[Dict[str, Any]]]:
+        """Ranked local matches, or None when the backend must answer"""
+        if not self.is_ready(subject):
+            self.fallbacks += 1
+            return None
+        self.local_hits += 1
+        return self.tenant(subject).search(query, self.limit, self.min_similarity)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "tenants": len(self._tenants),
+            "contacts": sum(len(contacts) for contacts in self._tenants.values()),
+            "local_hits": self.local_hits,
+            "fallbacks": self.fallbacks,
+        }
@@ -0,0 +1,338 @@
+"""
+Entity Name -> ID Index per Tenant
+Local resolution of contact names, emails, companies, pipeline names and
+stage names to IDs
+
+The index is filled from the results of tools the server already runs
+(contacts_list/search/get, pipelines_list, stages_list) and kept current
+by create/update/delete tool calls, so "john smith" or "proposal stage"
+becomes a dictionary lookup instead of a backend round trip.
+
+Entries and full-list loads expire after ttl seconds, so records changed
+outside this server (web UI, other integrations) stop resolving once they
+are stale instead of living until the tenant is evicted.
+"""
+
+import os
+import re
+import time
+import logging
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ENTITY_KINDS = ("contact", "company", "pipeline", "stage")
+
+# Tool families whose results feed the index
+INDEXED_FAMILIES = {"contacts": "contact", "pipelines": "pipeline", "stages": "stage"}
+
+_NON_WORD = re.compile(r"[^\w@.+-]+")
+
+
+def normalize(text: Any) -> str:
+    """Lowercase, strip accents and collapse punctuation/whitespace"""
+    if text is None:
+        return ""
+    folded = str(text)
+    if not folded.isascii():
+        folded = unicodedata.normalize("NFKD", folded)
+        folded = "".join(ch for ch in folded if not unicodedata.combining(ch))
+    return " ".join(_NON_WORD.sub(" ", folded.lower()).split())
+
+
+@dataclass
+class IndexedEntity:
+    """One resolvable record"""
+    id: str
+    kind: str                           # contact / pipeline / stage
+    label: str                          # display name
+    keys: Tuple[Tuple[str, str], ...]   # (kind, normalized key) entries pointing here
+    detail: Dict[str, Any]              # small extra fields returned with matches
+    seen: float = 0.0                   # monotonic time of the last backend result
+
+
+class TenantIndex:
+    """Name/email/company -> IDs for one tenant, bounded by max_entities"""
+
+    def __init__(self, max_entities: int = 50000, ttl: float = 300):
+        self.max_entities = max_entities
+        self.ttl = ttl
+        self._entities: "OrderedDict[str, IndexedEntity]" = OrderedDict()
+        self._keys: Dict[Tuple[str, str], Set[str]] = {}      # (kind, key) -> entity refs
+        self._tokens: Dict[Tuple[str, str], Set[str]] = {}    # (kind, word) -> entity refs
+        self.loaded: Dict[str, float] = {}                     # kind -> time of the last full list
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    @staticmethod
+    def _ref(kind: str, entity_id: str) -> str:
+        return f"{kind}:{entity_id}"
+
+    def get(self, kind: str, entity_id: str) -> Optional[IndexedEntity]:
+        return self._entities.get(self._ref(kind, entity_id))
+
+    def upsert(self, kind: str, entity_id: str, label: str, keys: Iterable[Tuple[str, str]], detail: Dict[str, Any]) -> None:
+        ref = self._ref(kind, entity_id)
+        self.remove(kind, entity_id)
+
+        normalized = tuple({(k, normalize(v)) for k, v in keys if normalize(v)})
+        self._entities[ref] = IndexedEntity(entity_id, kind, label, normalized, detail, time.monotonic())
+        for key in normalized:
+            self._keys.setdefault(key, set()).add(ref)
+            for word in key[1].split():
+                self._tokens.setdefault((key[0], word), set()).add(ref)
+
+        while len(self._entities) > self.max_entities:
+            oldest = next(iter(self._entities.values()))
+            self.remove(oldest.kind, oldest.id)
+            self.loaded.pop(oldest.kind, None)  # the full list is no longer complete
+
+    def remove(self, kind: str, entity_id: str) -> None:
+        entity = self._entities.pop(self._ref(kind, entity_id), None)
+        if entity is None:
+            return
+        ref = self._ref(kind, entity_id)
+        for key in entity.keys:
+            self._discard(self._keys, key, ref)
+            for word in key[1].split():
+                self._discard(self._tokens, (key[0], word), ref)
+
+    @staticmethod
+    def _discard(index: Dict[Tuple[str, str], Set[str]], key: Tuple[str, str], ref: str) -> None:
+        refs = index.get(key)
+        if refs is not None:
+            refs.discard(ref)
+            if not refs:
+                del index[key]
+
+    def of_kind(self, kind: str) -> List[IndexedEntity]:
+        return [entity for entity in self._entities.values() if entity.kind == kind]
+
+    def clear_kind(self, kind: str, pipeline_id: Optional[str] = None) -> None:
+        """Drop every entry of a kind (stages: optionally only one pipeline's)"""
+        for entity in self.of_kind(kind):
+            if pipeline_id is None or str(entity.detail.get("pipelineId")) == str(pipeline_id):
+                self.remove(entity.kind, entity.id)
+        self.loaded.pop(kind, None)
+
+    def mark_loaded(self, kind: str) -> None:
+        self.loaded[kind] = time.monotonic()
+
+    def is_fresh(self, kind: str) -> bool:
+        """True when a full list of this kind was indexed within ttl"""
+        loaded_at = self.loaded.get(kind)
+        return loaded_at is not None and time.monotonic() - loaded_at <= self.ttl
+
+    def lookup(self, key_kind: str, query: str) -> List[Tuple[IndexedEntity, str]]:
+        """
+        Exact key match first, then records containing every query word
+
+        Returns:
+            [(entity, "exact" | "words")]
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        refs = self._keys.get((key_kind, query))
+        if refs:
+            return [(entity, "exact") for entity in self._current(refs)]
+
+        word_sets = [self._tokens.get((key_kind, word), set()) for word in query.split()]
+        if not word_sets or not all(word_sets):
+            return []
+        refs = set.intersection(*word_sets)
+        return [(entity, "words") for entity in self._current(refs)]
+
+    def _current(self, refs: Set[str]) -> List[IndexedEntity]:
+        """Entities behind refs, dropping those not seen within ttl"""
+        now = time.monotonic()
+        current = []
+        for ref in sorted(refs):
+            entity = self._entities[ref]
+            if now - entity.seen <= self.ttl:
+                current.append(entity)
+            else:
+                self.remove(entity.kind, entity.id)
+        return current
+
+
+class EntityIndex:
+    """
+    Per-tenant TenantIndex collection (LRU over tenants)
+
+    observe() is called with every successful backend result; resolve()
+    answers lookups from memory.
+    """
+
+    def __init__(self, max_tenants: int = 256, max_entities: int = 50000, ttl: float = 300, enabled: bool = True):
+        self.max_tenants = max_tenants
+        self.max_entities = max_entities
+        self.ttl = ttl
+        self.enabled = enabled
+        self._tenants: "OrderedDict[str, TenantIndex]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls) -> "EntityIndex":
+        return cls(
+            max_tenants=int(os.getenv("MCP_INDEX_MAX_TENANTS", "256")),
+            max_entities=int(os.getenv("MCP_INDEX_MAX_ENTITIES", "50000")),
+            ttl=float(os.getenv("MCP_INDEX_TTL", "300")),
+            enabled=os.getenv("MCP_INDEX_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+        )
+
+    def tenant(self, subject: str) -> TenantIndex:
+        index = self._tenants.get(subject)
+        if index is None:
+            index = self._tenants[subject] = TenantIndex(self.max_entities, self.ttl)
+            while len(self._tenants) > self.max_tenants:
+                self._tenants.popitem(last=False)
+        else:
+            self._tenants.move_to_end(subject)
+        return index
+
+    # ==================== POPULATION ====================
+
+    def tracks(self, tool_name: str) -> bool:
+        """True when results of this tool update the index"""
+        return self.enabled and tool_name.partition("_")[0] in INDEXED_FAMILIES
+
+    def observe(self, subject: str, tool_name: str, args: Dict[str, Any], data: Any, refresh: bool = True) -> None:
+        """
+        Update the tenant index from a successful tool result
+
+        Args:
+            subject: Tenant/session key
+            tool_name: Tool that produced the data
+            args: Tool arguments without page arguments (empty for a full list)
+            data: Full backend result (before paging)
+            refresh: False for cached results - fresh full lists already indexed are skipped
+
+        A full list replaces the kind's entries (stages_list: the stages of
+        its pipeline), so records deleted elsewhere stop resolving.
+        """
+        if not self.tracks(tool_name):
+            return
+        family, _, action = tool_name.partition("_")
+        index = self.tenant(subject)
+        full_list = action == "list" and (not args or (family == "stages" and set(args) == {"pipelineId"}))
+        if full_list and not refresh and family != "stages" and index.is_fresh(INDEXED_FAMILIES[family]):
+            return
+
+        if action == "delete":
+            kind = family[:-1]
+            entity_id = args.get(f"{kind}Id")
+            if entity_id:
+                index.remove(kind, str(entity_id))
+                if kind == "pipeline":
+                    for stage in index.of_kind("stage"):
+                        if str(stage.detail.get("pipelineId")) == str(entity_id):
+                            index.remove("stage", stage.id)
+            return
+
+        records = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+        if family == "contacts":
+            if full_list:
+                index.clear_kind("contact")
+            for record in records:
+                self._add_contact(index, record)
+            if full_list:
+                index.mark_loaded("contact")
+        elif family == "pipelines":
+            # Stages nested in a full pipelines list are complete as well
+            with_stages = full_list and any(isinstance(r, dict) and isinstance(r.get("stages"), list) for r in records)
+            if full_list:
+                index.clear_kind("pipeline")
+            if with_stages:
+                index.clear_kind("stage")
+            for record in records:
+                self._add_pipeline(index, record)
+            if full_list:
+                index.mark_loaded("pipeline")
+            if with_stages:
+                index.mark_loaded("stage")
+        else:
+            if full_list:
+                index.clear_kind("stage", pipeline_id=args["pipelineId"])
+            for record in records:
+                self._add_stage(index, record, record.get("pipelineId") or args.get("pipelineId"))
+
+    @staticmethod
+    def _add_contact(index: TenantIndex, record: Dict[str, Any]) -> None:
+        if not isinstance(record, dict) or not record.get("id"):
+            return
+        name = f"{record.get('firstName') or ''} {record.get('lastName') or ''}".strip()
+        keys = [("contact", name), ("contact", record.get("email")), ("company", record.get("company"))]
+        detail = {k: record.get(k) for k in ("email", "company") if record.get(k)}
+        index.upsert("contact", str(record["id"]), name or record.get("email") or str(record["id"]), keys, detail)
+
+    def _add_pipeline(self, index: TenantIndex, record: Dict[str, Any]) -> None:
+        if not isinstance(record, dict) or not record.get("id"):
+            return
+        index.upsert("pipeline", str(record["id"]), record.get("name") or "", [("pipeline", record.get("name"))], {})
+        stages = record.get("stages")
+        if isinstance(stages, list):
+            for stage in stages:
+                self._add_stage(index, stage, record["id"], record.get("name"))
+
+    @staticmethod
+    def _add_stage(
+        index: TenantIndex,
+        record: Dict[str, Any],
+        pipeline_id: Optional[str],
+        pipeline_name: Optional[str] = None,
+    ) -> None:
+        if not isinstance(record, dict) or not record.get("id"):
+            return
+        # stages_update results may omit the pipeline - keep what is known
+        known = index.get("stage", str(record["id"]))
+        detail = dict(known.detail) if known else {}
+        if pipeline_id:
+            detail["pipelineId"] = pipeline_id
+        if pipeline_name:
+            detail["pipeline"] = pipeline_name
+        index.upsert("stage", str(record["id"]), record.get("name") or "", [("stage", record.get("name"))], detail)
+
+    # ==================== RESOLUTION ====================
+
+    def resolve(
+        self,
+        subject: str,
+        kind: str,
+        query: str,
+        pipeline_id: Optional[str] = None,
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Local lookup of IDs by name
+
+        Args:
+            subject: Tenant/session key
+            kind: contact, company, pipeline or stage
+            query: Name, email or company as typed by the user
+            pipeline_id: Restrict stage matches to one pipeline
+
+        Returns:
+            [{"id", "type", "name", "match", ...detail}]
+        """
+        index = self.tenant(subject)
+        matches = index.lookup(kind, query)
+        results = []
+        for entity, match in matches:
+            if pipeline_id and entity.kind == "stage" and str(entity.detail.get("pipelineId")) != str(pipeline_id):
+                continue
+            results.append({"id": entity.id, "type": entity.kind, "name": entity.label, "match": match, **entity.detail})
+            if len(results) >= limit:
+                break
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "tenants": len(self._tenants),
+            "entities": sum(len(index) for index in self._tenants.values()),
+        }
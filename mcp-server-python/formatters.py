@@ -0,0 +1,168 @@
+"""
+Natural-Language List Formatters (Streamlined Server)
+Generator-based renderers for contacts, deals, leads and tickets
+
+Each iter_* function yields the text in small chunks, so callers can
+stream it or join it once with format_*(). Output stops after
+max_records records with an "... and N more" line. Related-record counts
+come from the backend's _count aggregate when present, so list endpoints
+need not embed whole related arrays.
+"""
+
+import os
+from typing import Any, Dict, Iterator, List, Optional
+
+MAX_FORMAT_RECORDS = int(os.getenv("MCP_FORMAT_MAX_RECORDS", "100"))
+
+PRIORITY_EMOJI = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "URGENT": "🔴"}
+STATUS_EMOJI = {"OPEN": "🆕", "IN_PROGRESS": "⏳", "RESOLVED": "✅", "CLOSED": "🔒"}
+
+
+def _related_count(record: Dict[str, Any], relation: str) -> int:
+    """Count of related records: _count aggregate first, embedded array as fallback"""
+    counts = record.get("_count")
+    if isinstance(counts, dict) and relation in counts:
+        return int(counts[relation] or 0)
+    related = record.get(relation)
+    return len(related) if isinstance(related, list) else 0
+
+
+def _more(total: int, shown: int) -> Iterator[str]:
+    if total > shown:
+        yield f"… and {total - shown} more (showing first {shown})\n\n"
+
+
+def iter_contacts(contacts: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> Iterator[str]:
+    """Yield the contact list text chunk by chunk"""
+    if not contacts:
+        yield "📭 No contacts found."
+        return
+
+    shown = len(contacts) if max_records is None else min(len(contacts), max_records)
+    yield f"📇 **Found {len(contacts)} contact(s):**\n\n"
+    for contact in contacts[:shown]:
+        yield f"• **{contact.get('firstName', '')} {contact.get('lastName', '')}**\n"
+        if contact.get('email'):
+            yield f"  📧 {contact['email']}\n"
+        if contact.get('phone'):
+            yield f"  📱 {contact['phone']}\n"
+        if contact.get('company'):
+            if contact.get('jobTitle'):
+                yield f"  🏢 {contact['company']} - {contact['jobTitle']}\n"
+            else:
+                yield f"  🏢 {contact['company']}\n"
+
+        # Show related data counts
+        deals_count = _related_count(contact, 'deals')
+        tickets_count = _related_count(contact, 'tickets')
+        if deals_count or tickets_count:
+            yield f"  💼 {deals_count} deal(s), 🎫 {tickets_count} ticket(s)\n"
+        yield "\n"
+    yield from _more(len(contacts), shown)
+
+
+def iter_deals(deals: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> Iterator[str]:
+    """Yield the deal list text chunk by chunk (total covers every deal)"""
+    if not deals:
+        yield "📭 No deals found."
+        return
+
+    shown = len(deals) if max_records is None else min(len(deals), max_records)
+    yield f"💼 **Found {len(deals)} deal(s):**\n\n"
+    for deal in deals[:shown]:
+        value = float(deal.get('value') or 0)
+        yield f"• **{deal.get('title', 'Untitled')}** - ${value:,.2f}\n"
+
+        contact = deal.get('contact') or {}
+        if contact:
+            yield f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')} ({contact.get('company', 'N/A')})\n"
+
+        stage = deal.get('stage') or {}
+        pipeline = deal.get('pipeline') or {}
+        if stage or pipeline:
+            yield f"  📊 {pipeline.get('name', 'N/A')} → {stage.get('name', 'N/A')}\n"
+
+        if deal.get('probability'):
+            yield f"  🎯 {deal['probability']}% probability\n"
+
+        if deal.get('expectedCloseDate'):
+            yield f"  📅 Expected close: {deal['expectedCloseDate'][:10]}\n"
+
+        yield "\n"
+    yield from _more(len(deals), shown)
+
+    total_value = sum(float(deal.get('value') or 0) for deal in deals)
+    yield f"💰 **Total pipeline value:** ${total_value:,.2f}"
+
+
+def iter_leads(leads: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> Iterator[str]:
+    """Yield the lead list text chunk by chunk"""
+    if not leads:
+        yield "📭 No leads found."
+        return
+
+    shown = len(leads) if max_records is None else min(len(leads), max_records)
+    yield f"🎯 **Found {len(leads)} lead(s):**\n\n"
+    for lead in leads[:shown]:
+        yield (
+            f"• **{lead.get('title', 'Untitled')}**\n"
+            f"  📌 Status: {lead.get('status', 'N/A')}\n"
+            f"  📍 Source: {lead.get('source', 'N/A')}\n"
+        )
+
+        if lead.get('value'):
+            yield f"  💵 Value: ${float(lead['value']):,.2f}\n"
+
+        contact = lead.get('contact') or {}
+        if contact:
+            yield f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')}\n"
+
+        yield "\n"
+    yield from _more(len(leads), shown)
+
+
+def iter_tickets(tickets: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> Iterator[str]:
+    """Yield the ticket list text chunk by chunk"""
+    if not tickets:
+        yield "📭 No tickets found."
+        return
+
+    shown = len(tickets) if max_records is None else min(len(tickets), max_records)
+    yield f"🎫 **Found {len(tickets)} ticket(s):**\n\n"
+    for ticket in tickets[:shown]:
+        priority = ticket.get('priority', 'MEDIUM')
+        status = ticket.get('status', 'OPEN')
+
+        yield (
+            f"• {PRIORITY_EMOJI.get(priority, '⚪')} **{ticket.get('title', 'Untitled')}**\n"
+            f"  {STATUS_EMOJI.get(status, '⚪')} {status} | Priority: {priority}\n"
+        )
+
+        description = ticket.get('description')
+        if description:
+            yield f"  📝 {description[:100]}{'...' if len(description) > 100 else ''}\n"
+
+        contact = ticket.get('contact') or {}
+        if contact:
+            yield f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')}\n"
+
+        yield "\n"
+    yield from _more(len(tickets), shown)
+
+
+# ==================== JOINED TEXT ====================
+
+def format_contacts(contacts: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> str:
+    return "".join(iter_contacts(contacts, max_records)).strip()
+
+
+def format_deals(deals: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> str:
+    return "".join(iter_deals(deals, max_records))
+
+
+def format_leads(leads: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> str:
+    return "".join(iter_leads(leads, max_records)).strip()
+
+
+def format_tickets(tickets: List[Dict[str, Any]], max_records: Optional[int] = MAX_FORMAT_RECORDS) -> str:
+    return "".join(iter_tickets(tickets, max_records)).strip()
@@ -0,0 +1,285 @@
+"""
+Prometheus-Style Metrics for the MCP Servers
+Dependency-free counters, gauges and histograms rendered in the
+Prometheus text exposition format (GET /metrics)
+
+Recording is a dict lookup plus an integer add (a bisect for
+histograms), cheap enough to stay on in production. With several HTTP
+workers each process reports its own series - scrape every worker or
+aggregate in Prometheus.
+"""
+
+import os
+import math
+import time
+import bisect
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+METRICS_ENABLED = os.getenv("MCP_METRICS_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Latency buckets in seconds (5ms .. 30s, the backend timeout)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class Metric:
+    """Base class: name, help text and label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    """Monotonic counter per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in sorted(self._values.items())
+        ]
+
+
+class Gauge(Metric):
+    """Value that goes up and down; optionally read from a callback at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        callback: Optional[Callable[[], Iterable[Tuple[LabelValues, float]]]] = None,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, *labels: str) -> None:
+        self._values[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) - amount
+
+    def render(self) -> List[str]:
+        items = list(self.callback()) if self.callback else sorted(self._values.items())
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in items
+        ]
+
+
+class CallbackCounter(Gauge):
+    """Counter whose values are read from an existing stats source at scrape time"""
+
+    kind = "counter"
+
+
+class Histogram(Metric):
+    """Cumulative bucket histogram per label set"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket..., +Inf count], sum
+        self._counts: Dict[LabelValues, List[int]] = {}
+        self._sums: Dict[LabelValues, float] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        counts = self._counts.get(labels)
+        if counts is None:
+            counts = self._counts[labels] = [0] * (len(self.buckets) + 1)
+            self._sums[labels] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[labels] += value
+
+    def count(self, *labels: str) -> int:
+        return sum(self._counts.get(labels, ()))
+
+    def render(self) -> List[str]:
+        lines = []
+        for labels, counts in sorted(self._counts.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(self._sums[labels])}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: Metric) -> Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Duplicate metric: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def unregister(self, name: str) -> None:
+        with self._lock:
+            self._metrics.pop(name, None)
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = (), callback=None) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames, callback))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            body = metric.render()
+            if body:
+                lines.extend(metric.header())
+                lines.extend(body)
+        return "\n".join(lines) + "\n"
+
+
+# ==================== SERVER METRICS ====================
+
+REGISTRY = MetricsRegistry()
+
+TOOL_CALLS = REGISTRY.counter(
+    "mcp_tool_calls_total",
+    "Tool calls by tool, transport and outcome (ok/error)",
+    ("tool", "transport", "outcome"),
+)
+TOOL_LATENCY = REGISTRY.histogram(
+    "mcp_tool_call_duration_seconds",
+    "End-to-end tool call latency inside the MCP server",
+    ("tool", "transport"),
+)
+TOOLS_IN_FLIGHT = REGISTRY.gauge(
+    "mcp_tool_calls_in_flight",
+    "Tool calls currently executing",
+    ("transport",),
+)
+BACKEND_LATENCY = REGISTRY.histogram(
+    "mcp_backend_request_duration_seconds",
+    "Backend API latency per tool (cache hits and coalesced waits excluded)",
+    ("tool", "method"),
+)
+BACKEND_ERRORS = REGISTRY.counter(
+    "mcp_backend_errors_total",
+    "Failed backend requests by tool and HTTP status ('exception' for transport errors)",
+    ("tool", "status"),
+)
+
+
+class track_tool_call:
+    """
+    Context manager recording one tool call (count, latency, in-flight)
+
+    Usage:
+        with track_tool_call(name, "http") as call:
+            result = ...
+            call.outcome = "error"
+    """
+
+    __slots__ = ("tool", "transport", "outcome", "started")
+
+    def __init__(self, tool: str, transport: str):
+        self.tool = tool
+        self.transport = transport
+        self.outcome = "ok"
+
+    def __enter__(self) -> "track_tool_call":
+        if METRICS_ENABLED:
+            TOOLS_IN_FLIGHT.inc(self.transport)
+            self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if not METRICS_ENABLED:
+            return
+        if exc_type is not None:
+            self.outcome = "error"
+        TOOLS_IN_FLIGHT.dec(self.transport)
+        TOOL_LATENCY.observe(time.perf_counter() - self.started, self.tool, self.transport)
+        TOOL_CALLS.inc(self.tool, self.transport, self.outcome)
+
+
+def record_backend_call(tool: str, method: str, seconds: float, status: Optional[int]) -> None:
+    """Record one backend request (status None = transport error)"""
+    if not METRICS_ENABLED:
+        return
+    BACKEND_LATENCY.observe(seconds, tool, method)
+    if status is None:
+        BACKEND_ERRORS.inc(tool, "exception")
+    elif status >= 400:
+        BACKEND_ERRORS.inc(tool, str(status))
@@ -0,0 +1,176 @@
+"""
+Cursor Pagination for List Tools
+limit / cursor / sort / fields - emulated in the MCP server when the
+backend returns whole tables
+"""
+
+import os
+import json
+import base64
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+PAGE_ARGS = ("limit", "cursor", "sort", "fields")
+
+DEFAULT_PAGE_LIMIT = int(os.getenv("MCP_DEFAULT_PAGE_LIMIT", "50"))
+MAX_PAGE_LIMIT = int(os.getenv("MCP_MAX_PAGE_LIMIT", "500"))
+
+# Added to the input schema of every paginated list tool
+PAGINATION_PROPERTIES: Dict[str, Any] = {
+    "limit": {
+        "type": "integer",
+        "description": f"Optional: Page size (default {DEFAULT_PAGE_LIMIT}, max {MAX_PAGE_LIMIT})",
+    },
+    "cursor": {
+        "type": "string",
+        "description": "Optional: nextCursor from the previous page",
+    },
+    "sort": {
+        "type": "string",
+        "description": "Optional: Sort fields, comma separated, '-' for descending (e.g. '-value,title')",
+    },
+    "fields": {
+        "type": "string",
+        "description": (
+            "Optional: Fields to return, comma separated, dots for nested fields "
+            "(e.g. 'id,title,contact.email'). id is always included."
+        ),
+    },
+}
+
+
+class PaginationError(ValueError):
+    """Invalid limit, cursor or sort argument"""
+
+
+def split_page_args(args: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Separate pagination arguments from the backend (filter) arguments"""
+    page = {k: v for k, v in args.items() if k in PAGE_ARGS and v not in (None, "")}
+    rest = {k: v for k, v in args.items() if k not in PAGE_ARGS}
+    return page, rest
+
+
+def encode_cursor(offset: int, sort: Optional[str]) -> str:
+    raw = json.dumps({"o": offset, "s": sort or ""}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: Optional[str]) -> int:
+    """Return the offset stored in a cursor (which must match the sort order)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        offset = int(state["o"])
+    except (ValueError, KeyError, TypeError):
+        raise PaginationError("Invalid cursor - pass nextCursor from the previous page unchanged")
+    if state.get("s", "") != (sort or ""):
+        raise PaginationError("Cursor was created with a different sort order")
+    if offset < 0:
+        raise PaginationError("Invalid cursor")
+    return offset
+
+
+def _split_list(value: Any) -> List[str]:
+    if isinstance(value, (list, tuple)):
+        return [str(v).strip() for v in value if str(v).strip()]
+    return [part.strip() for part in str(value).split(",") if part.strip()]
+
+
+def _field(item: Any, path: str) -> Any:
+    for part in path.split("."):
+        if not isinstance(item, dict):
+            return None
+        item = item.get(part)
+    return item
+
+
+def _sort_key(value: Any) -> Tuple[int, Any]:
+    # Numbers before strings so mixed columns still sort
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return (0, value)
+    return (1, str(value).lower())
+
+
+def sort_items(items: List[Any], sort: str) -> List[Any]:
+    """Stable multi-key sort; '-field' sorts descending; missing values last either way"""
+    ordered = list(items)
+    for spec in reversed(_split_list(sort)):
+        descending = spec.startswith("-")
+        field = spec.lstrip("+-")
+        present = [item for item in ordered if _field(item, field) is not None]
+        missing = [item for item in ordered if _field(item, field) is None]
+        present.sort(key=lambda item: _sort_key(_field(item, field)), reverse=descending)
+        ordered = present + missing
+    return ordered
+
+
+def project(item: Any, fields: List[str]) -> Any:
+    """
+    Keep only the requested fields (plus id)
+
+    Dotted names select nested fields and keep their nesting:
+    "contact.email" gives {"contact": {"email": ...}}.
+    """
+    if not isinstance(item, dict):
+        return item
+    keep = ["id", *fields] if "id" not in fields else fields
+    projected: Dict[str, Any] = {}
+    whole: Set[str] = set()
+    for name in keep:
+        parts = name.split(".")
+        if any(".".join(parts[:depth]) in whole for depth in range(1, len(parts))):
+            continue  # a parent field is already kept whole
+        value = item
+        for part in parts:
+            if not isinstance(value, dict) or part not in value:
+                break
+            value = value[part]
+        else:
+            target = projected
+            for part in parts[:-1]:
+                child = target.get(part)
+                if not isinstance(child, dict):
+                    child = target[part] = {}
+                target = child
+            target[parts[-1]] = value
+            whole.add(name)
+    return projected
+
+
+def paginate(items: List[Any], page_args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Slice a full list into one page
+
+    Args:
+        items: Complete list from the backend (or cache)
+        page_args: limit / cursor / sort / fields from the tool call
+
+    Returns:
+        {"items": [...], "nextCursor": str | None, "total": int}
+    """
+    try:
+        limit = int(page_args.get("limit", DEFAULT_PAGE_LIMIT))
+    except (TypeError, ValueError):
+        raise PaginationError("limit must be an integer")
+    if limit < 1:
+        raise PaginationError("limit must be at least 1")
+    limit = min(limit, MAX_PAGE_LIMIT)
+
+    sort = page_args.get("sort")
+    if isinstance(sort, (list, tuple)):
+        sort = ",".join(sort)
+    offset = decode_cursor(page_args["cursor"], sort) if "cursor" in page_args else 0
+
+    if sort:
+        items = sort_items(items, sort)
+
+    page = items[offset:offset + limit]
+    if "fields" in page_args:
+        fields = _split_list(page_args["fields"])
+        page = [project(item, fields) for item in page]
+
+    next_offset = offset + limit
+    return {
+        "items": page,
+        "nextCursor": encode_cursor(next_offset, sort) if next_offset < len(items) else None,
+        "total": len(items),
+    }
@@ -0,0 +1,198 @@
+"""
+Pipeline/Stage Metadata Cache
+Per-tenant pipeline -> stages tree for local ID validation
+
+The tree is prefetched when a session is first seen, refreshed from
+pipelines_list/stages_list results and dropped on pipelines_*/stages_*
+writes. deals_create, deals_move and leads_convert are checked against it
+before they reach the backend, so a wrong stageId comes back at once
+with the valid choices instead of as a backend 400.
+"""
+
+import os
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Tools whose pipelineId/stageId arguments are validated locally
+VALIDATED_TOOLS = frozenset({"deals_create", "deals_move", "leads_convert"})
+
+
+@dataclass
+class PipelineTree:
+    """One tenant's pipelines and their stages"""
+    pipelines: Dict[str, str] = field(default_factory=dict)               # pipelineId -> name
+    stages: Dict[str, Tuple[str, str]] = field(default_factory=dict)      # stageId -> (pipelineId, name)
+    stages_known: Set[str] = field(default_factory=set)                   # pipelines whose stages are all listed
+    loaded_at: float = field(default_factory=time.monotonic)
+
+    def stage_choices(self, pipeline_id: Optional[str] = None) -> str:
+        choices = [
+            f"{name}={stage_id}"
+            for stage_id, (owner, name) in self.stages.items()
+            if pipeline_id is None or owner == pipeline_id
+        ]
+        return ", ".join(choices) or "none"
+
+    def pipeline_choices(self) -> str:
+        return ", ".join(f"{name}={pipeline_id}" for pipeline_id, name in self.pipelines.items()) or "none"
+
+
+class PipelineMetadataCache:
+    """
+    Pipeline -> stages trees per tenant (LRU over tenants, TTL per tree)
+
+    Trees are built from full pipelines_list results (stages nested in each
+    pipeline) and completed by stages_list results.
+    """
+
+    def __init__(self, ttl: float = 600, max_tenants: int = 1024, enabled: bool = True, prefetch: bool = True):
+        self.ttl = ttl
+        self.max_tenants = max_tenants
+        self.enabled = enabled
+        self.prefetch = enabled and prefetch
+        self._trees: "OrderedDict[str, PipelineTree]" = OrderedDict()
+        self._seen: "OrderedDict[str, None]" = OrderedDict()   # subjects already prefetched
+        self.rejected = 0
+
+    @classmethod
+    def from_env(cls) -> "PipelineMetadataCache":
+        return cls(
+            ttl=float(os.getenv("MCP_PIPELINE_CACHE_TTL", "600")),
+            max_tenants=int(os.getenv("MCP_PIPELINE_CACHE_MAX_TENANTS", "1024")),
+            enabled=os.getenv("MCP_PIPELINE_CACHE_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+            prefetch=os.getenv("MCP_PIPELINE_PREFETCH", "true").lower() in ("1", "true", "yes", "on"),
+        )
+
+    # ==================== TREES ====================
+
+    def get(self, subject: str) -> Optional[PipelineTree]:
+        """Fresh tree for the tenant, or None"""
+        tree = self._trees.get(subject)
+        if tree is None:
+            return None
+        if time.monotonic() - tree.loaded_at > self.ttl:
+            del self._trees[subject]
+            return None
+        self._trees.move_to_end(subject)
+        return tree
+
+    def store(self, subject: str, pipelines: Any) -> None:
+        """Replace the tenant tree with a full pipelines_list result"""
+        if not self.enabled or not isinstance(pipelines, list):
+            return
+        tree = PipelineTree()
+        for pipeline in pipelines:
+            if not isinstance(pipeline, dict) or not pipeline.get("id"):
+                continue
+            pipeline_id = str(pipeline["id"])
+            tree.pipelines[pipeline_id] = pipeline.get("name") or pipeline_id
+            stages = pipeline.get("stages")
+            if isinstance(stages, list):
+                self._add_stages(tree, pipeline_id, stages)
+        self._trees[subject] = tree
+        self._trees.move_to_end(subject)
+        while len(self._trees) > self.max_tenants:
+            self._trees.popitem(last=False)
+
+    def add_stages(self, subject: str, pipeline_id: Any, stages: Any) -> None:
+        """Complete one pipeline of an existing tree with a stages_list result"""
+        tree = self.get(subject)
+        if tree is None or not pipeline_id or not isinstance(stages, list):
+            return
+        self._add_stages(tree, str(pipeline_id), stages)
+
+    @staticmethod
+    def _add_stages(tree: PipelineTree, pipeline_id: str, stages: List[Any]) -> None:
+        for stage_id in [sid for sid, (owner, _) in tree.stages.items() if owner == pipeline_id]:
+            del tree.stages[stage_id]
+        for stage in stages:
+            if isinstance(stage, dict) and stage.get("id"):
+                tree.stages[str(stage["id"])] = (pipeline_id, stage.get("name") or str(stage["id"]))
+        tree.stages_known.add(pipeline_id)
+
+    def tracks(self, tool_name: str) -> bool:
+        """True for tools whose results or side effects change the tree"""
+        return self.enabled and tool_name.startswith(("pipelines_", "stages_"))
+
+    def observe(self, subject: str, tool_name: str, args: Dict[str, Any], data: Any, refresh: bool = True) -> None:
+        """
+        Update the tenant tree from a successful tool result
+
+        Args:
+            args: Tool arguments without page arguments (empty for a full list)
+            refresh: False for cached results - only fills a missing tree
+        """
+        if not self.tracks(tool_name):
+            return
+        if tool_name == "pipelines_list":
+            if not args and (refresh or self.get(subject) is None):
+                self.store(subject, data)
+        elif tool_name == "stages_list":
+            self.add_stages(subject, args.get("pipelineId"), data)
+        else:
+            self.invalidate(subject)
+
+    def invalidate(self, subject: str) -> None:
+        """Drop the tenant tree after a pipelines_*/stages_* write"""
+        self._trees.pop(subject, None)
+
+    def should_prefetch(self, subject: str) -> bool:
+        """True once per newly seen session subject (prefetch enabled)"""
+        if not self.prefetch or subject in self._seen:
+            return False
+        self._seen[subject] = None
+        while len(self._seen) > self.max_tenants:
+            self._seen.popitem(last=False)
+        return True
+
+    # ==================== VALIDATION ====================
+
+    def validate(self, tree: PipelineTree, tool_name: str, args: Dict[str, Any]) -> Optional[str]:
+        """
+        Check pipelineId/stageId arguments against a tenant tree
+
+        Returns:
+            Error message listing the valid IDs, or None when the arguments
+            are valid (or cannot be checked from what is known)
+        """
+        if tool_name not in VALIDATED_TOOLS:
+            return None
+        pipeline_id = args.get("pipelineId")
+        stage_id = args.get("stageId")
+
+        if pipeline_id is not None and str(pipeline_id) not in tree.pipelines:
+            return f"Unknown pipelineId '{pipeline_id}'. Pipelines: {tree.pipeline_choices()}"
+
+        if stage_id is None:
+            return None
+        stage = tree.stages.get(str(stage_id))
+        if stage is None:
+            # Only reject when every candidate pipeline's stages are known
+            candidates = {str(pipeline_id)} if pipeline_id is not None else set(tree.pipelines)
+            if not candidates <= tree.stages_known:
+                return None
+            scope = str(pipeline_id) if pipeline_id is not None else None
+            where = f" in pipeline {tree.pipelines[scope]}" if scope else ""
+            return f"Unknown stageId '{stage_id}'. Stages{where}: {tree.stage_choices(scope)}"
+
+        owner = stage[0]
+        if pipeline_id is not None and owner != str(pipeline_id):
+            return (
+                f"Stage '{stage[1]}' ({stage_id}) belongs to pipeline {tree.pipelines.get(owner, owner)}, "
+                f"not {tree.pipelines[str(pipeline_id)]}. "
+                f"Stages in {tree.pipelines[str(pipeline_id)]}: {tree.stage_choices(str(pipeline_id))}"
+            )
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "prefetch": self.prefetch,
+            "tenants": len(self._trees),
+            "rejected": self.rejected,
+        }
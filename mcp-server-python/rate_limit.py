@@ -0,0 +1,379 @@
+"""
+Per-Tenant and Per-User Rate Limiting for the HTTP Transport
+Token buckets, in-flight caps and fair queueing
+
+- identities come from the session token: tenant/user claims of a JWT
+  (verified or not) or the telegram:userId:tenantId pseudo-JWT; tokens
+  without claims, or failing verification, count as their own digest
+- token buckets per tenant and per user, with separate read/write rates
+- in-flight caps per tenant and per user; over the cap, requests wait in
+  a per-tenant FIFO and free slots are handed out round-robin across
+  tenants, so one chatty tenant cannot starve the others
+- rejected requests raise RateLimited, answered as 429 with Retry-After
+
+With a shared state backend (MCP_STATE_BACKEND=sqlite) the buckets become
+fixed-window counters shared by every worker; in-flight caps stay per process.
+"""
+
+import os
+import time
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from shared_state import StateBackend, get_state_backend
+from session_claims import session_claims
+
+logger = logging.getLogger(__name__)
+
+TOOL_CLASSES = ("read", "write")
+
+
+class RateLimited(Exception):
+    """Request rejected by a rate or concurrency limit"""
+
+    def __init__(self, scope: str, reason: str, retry_after: float):
+        self.scope = scope
+        self.reason = reason
+        self.retry_after = max(1, int(retry_after + 0.999))
+        super().__init__(f"Rate limit exceeded ({scope} {reason}) - retry in {self.retry_after}s")
+
+
+@dataclass(frozen=True)
+class Identity:
+    """Who a request is accounted to"""
+    tenant: str
+    user: str
+
+
+def request_identity(jwt: Optional[str]) -> Identity:
+    """
+    Tenant and user a call is accounted to (from the claims cache; "cli" without a token)
+
+    Unlike cache subjects, limits use the tenant/user claims even when
+    they are not verified: keyed by digest, a tenant would escape its
+    limits by switching tokens, and per-tenant limits would never apply
+    without a verification key. The trade-off is that a forged token
+    naming a tenant can spend that tenant's budget - set MCP_JWT_SECRET
+    or MCP_JWT_JWKS_FILE so such tokens fail verification (and are then
+    accounted to their digest).
+    """
+    if not jwt:
+        return Identity("cli", "cli")
+    claims = session_claims(jwt)
+    return Identity(claims.tenant, claims.user)
+
+
+@dataclass
+class RateRule:
+    """Tokens per second and bucket size for one scope and tool class"""
+    rate: float
+    burst: float
+
+
+class TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, burst: float):
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def wait(self, rule: RateRule, cost: float) -> float:
+        """Refill; returns 0 when cost is available or the seconds until enough refill"""
+        now = time.monotonic()
+        self.tokens = min(rule.burst, self.tokens + (now - self.updated) * rule.rate)
+        self.updated = now
+        if self.tokens >= cost:
+            return 0.0
+        return (cost - self.tokens) / rule.rate if rule.rate > 0 else 60.0
+
+
+class FairSlots:
+    """
+    In-flight caps per tenant and per user with round-robin handoff
+
+    Waiters queue per tenant (FIFO); when a slot frees, tenants with
+    waiters are visited in turn so each gets the next slot fairly.
+    """
+
+    def __init__(self, tenant_cap: int, user_cap: int, max_queue: int):
+        self.tenant_cap = tenant_cap
+        self.user_cap = user_cap
+        self.max_queue = max_queue
+        self.in_flight: Dict[str, int] = {}
+        self.user_in_flight: Dict[str, int] = {}
+        self.waiters: Dict[str, Deque[Tuple[str, asyncio.Future]]] = {}
+        self.turns: Deque[str] = deque()  # tenants with waiters, round-robin order
+
+    def _fits(self, identity: Identity) -> bool:
+        return (
+            self.in_flight.get(identity.tenant, 0) < self.tenant_cap
+            and self.user_in_flight.get(identity.user, 0) < self.user_cap
+        )
+
+    def _take(self, tenant: str, user: str) -> None:
+        self.in_flight[tenant] = self.in_flight.get(tenant, 0) + 1
+        self.user_in_flight[user] = self.user_in_flight.get(user, 0) + 1
+
+    async def acquire(self, identity: Identity, timeout: float) -> None:
+        queue = self.waiters.get(identity.tenant)
+        if not queue and self._fits(identity):
+            self._take(identity.tenant, identity.user)
+            return
+
+        waiting = sum(len(q) for q in self.waiters.values())
+        if waiting >= self.max_queue or timeout <= 0:
+            raise RateLimited("tenant", "concurrency", timeout or 1)
+
+        future = asyncio.get_running_loop().create_future()
+        if queue is None:
+            queue = self.waiters[identity.tenant] = deque()
+            self.turns.append(identity.tenant)
+        queue.append((identity.user, future))
+        try:
+            await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                return  # granted at the deadline - the slot is ours
+            future.cancel()
+            self._forget(identity.tenant, future)
+            raise RateLimited("tenant", "concurrency", timeout)
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release(identity)  # granted, but the caller went away
+            else:
+                future.cancel()
+                self._forget(identity.tenant, future)
+            raise
+
+    def _forget(self, tenant: str, future: asyncio.Future) -> None:
+        queue = self.waiters.get(tenant)
+        if queue is None:
+            return
+        for item in list(queue):
+            if item[1] is future:
+                queue.remove(item)
+        if not queue:
+            del self.waiters[tenant]
+            self.turns.remove(tenant)
+
+    def release(self, identity: Identity) -> None:
+        for counts, key in ((self.in_flight, identity.tenant), (self.user_in_flight, identity.user)):
+            remaining = counts.get(key, 0) - 1
+            if remaining > 0:
+                counts[key] = remaining
+            else:
+                counts.pop(key, None)
+        self._hand_off()
+
+    def _hand_off(self) -> None:
+        """Grant free slots to waiting tenants in round-robin order"""
+        for _ in range(len(self.turns)):
+            tenant = self.turns[0]
+            self.turns.rotate(-1)
+            queue = self.waiters[tenant]
+            for index, (user, future) in enumerate(queue):
+                if future.done():
+                    continue
+                if self._fits(Identity(tenant, user)):
+                    del queue[index]
+                    self._take(tenant, user)
+                    future.set_result(None)
+                    break
+                if self.in_flight.get(tenant, 0) >= self.tenant_cap:
+                    break
+            if not queue:
+                del self.waiters[tenant]
+                self.turns.remove(tenant)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "in_flight": sum(self.in_flight.values()),
+            "queued": sum(len(q) for q in self.waiters.values()),
+            "tenants_in_flight": len(self.in_flight),
+        }
+
+
+class RateLimiter:
+    """
+    Admission control for HTTP tool calls
+
+    Usage:
+        async with limiter.admit(jwt, "read"):
+            ...
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        rules: Optional[Dict[Tuple[str, str], RateRule]] = None,
+        tenant_in_flight: int = 16,
+        user_in_flight: int = 4,
+        max_queue: int = 256,
+        queue_timeout: float = 5.0,
+        shared: Optional[StateBackend] = None,
+    ):
+        self.enabled = enabled
+        self.rules = rules or {}
+        self.slots = FairSlots(tenant_in_flight, user_in_flight, max_queue)
+        self.queue_timeout = queue_timeout
+        self.shared = shared
+        self._buckets: Dict[Tuple[str, str, str], TokenBucket] = {}
+        self.rejected: Dict[Tuple[str, str], int] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        MCP_RATE_LIMIT_ENABLED plus MCP_RATE_{TENANT,USER}_{READ,WRITE} rules
+        written as "<requests per second>" or "<rps>:<burst>", e.g. "20:40"
+        """
+        rules: Dict[Tuple[str, str], RateRule] = {}
+        defaults = {
+            ("tenant", "read"): "20:40",
+            ("tenant", "write"): "5:10",
+            ("user", "read"): "10:20",
+            ("user", "write"): "2:5",
+        }
+        for (scope, tool_class), default in defaults.items():
+            rule = cls.parse_rule(os.getenv(f"MCP_RATE_{scope.upper()}_{tool_class.upper()}", default))
+            if rule is not None:
+                rules[(scope, tool_class)] = rule
+
+        return cls(
+            enabled=os.getenv("MCP_RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+            rules=rules,
+            tenant_in_flight=int(os.getenv("MCP_MAX_IN_FLIGHT_TENANT", "16")),
+            user_in_flight=int(os.getenv("MCP_MAX_IN_FLIGHT_USER", "4")),
+            max_queue=int(os.getenv("MCP_RATE_QUEUE_MAX", "256")),
+            queue_timeout=float(os.getenv("MCP_RATE_QUEUE_TIMEOUT", "5")),
+            shared=get_state_backend(),
+        )
+
+    @staticmethod
+    def parse_rule(text: str) -> Optional[RateRule]:
+        """'20' -> 20/s burst 20, '20:40' -> 20/s burst 40, '0' or '' -> unlimited"""
+        text = (text or "").strip()
+        if not text:
+            return None
+        rate_text, _, burst_text = text.partition(":")
+        rate = float(rate_text)
+        if rate <= 0:
+            return None
+        return RateRule(rate, float(burst_text) if burst_text else rate)
+
+    # ==================== ADMISSION ====================
+
+    def check_rate(self, identity: Identity, tool_class: str, cost: float = 1) -> None:
+        """
+        Charge the tenant and user buckets; raise RateLimited when either is empty
+
+        Both buckets are checked before either is charged, so a request
+        refused by the user limit costs the tenant nothing.
+        """
+        charges = []
+        for scope, key in (("tenant", identity.tenant), ("user", identity.user)):
+            rule = self.rules.get((scope, tool_class))
+            if rule is not None:
+                # A batch larger than the bucket drains it instead of never fitting
+                charges.append((scope, key, rule, min(cost, rule.burst)))
+        if not charges:
+            return
+        if self.shared:
+            self._charge_shared(tool_class, charges)
+        else:
+            self._charge_local(tool_class, charges)
+
+    def _refused(self, scope: str, tool_class: str, wait: float) -> RateLimited:
+        self._count(scope, f"{tool_class}_rate")
+        return RateLimited(scope, f"{tool_class} rate", wait)
+
+    def _charge_local(self, tool_class: str, charges: List[Tuple[str, str, RateRule, float]]) -> None:
+        buckets = []
+        for scope, key, rule, cost in charges:
+            bucket_key = (scope, key, tool_class)
+            bucket = self._buckets.get(bucket_key)
+            if bucket is None:
+                if len(self._buckets) > 100_000:
+                    self._buckets.clear()  # idle buckets are full anyway - start over
+                bucket = self._buckets[bucket_key] = TokenBucket(rule.burst)
+            wait = bucket.wait(rule, cost)
+            if wait > 0:
+                raise self._refused(scope, tool_class, wait)
+            buckets.append((bucket, cost))
+        for bucket, cost in buckets:
+            bucket.tokens -= cost
+
+    def _charge_shared(self, tool_class: str, charges: List[Tuple[str, str, RateRule, float]]) -> None:
+        """
+        Fixed windows of burst/rate seconds holding `burst` requests, shared by all workers
+
+        Counters are incremented atomically one at a time; when either is
+        over its limit, every increment is handed back.
+        """
+        now = time.time()
+        counted = []
+        refusal = None
+        for scope, key, rule, cost in charges:
+            window = rule.burst / rule.rate
+            slot = int(now / window)
+            counter = f"rate:{scope}:{key}:{tool_class}:{slot}"
+            used = self.shared.incr(counter, cost, ttl=window * 2)
+            counted.append((counter, cost, window))
+            if used > rule.burst:
+                refusal = (scope, (slot + 1) * window - now)
+                break
+        if refusal is not None:
+            for counter, cost, window in counted:
+                self.shared.incr(counter, -cost, ttl=window * 2)
+            raise self._refused(refusal[0], tool_class, refusal[1])
+
+    def _count(self, scope: str, reason: str) -> None:
+        self.rejected[(scope, reason)] = self.rejected.get((scope, reason), 0) + 1
+
+    def admit(self, jwt: Optional[str], tool_class: str, cost: float = 1) -> "Admission":
+        """Rate check plus an in-flight slot, released when the block exits"""
+        return Admission(self, request_identity(jwt), tool_class, cost)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "shared": self.shared is not None,
+            **self.slots.stats(),
+            "rejected": {f"{scope}:{reason}": count for (scope, reason), count in sorted(self.rejected.items())},
+        }
+
+
+class Admission:
+    """Async context manager holding one in-flight slot"""
+
+    __slots__ = ("limiter", "identity", "tool_class", "cost", "held")
+
+    def __init__(self, limiter: RateLimiter, identity: Identity, tool_class: str, cost: float):
+        self.limiter = limiter
+        self.identity = identity
+        self.tool_class = tool_class
+        self.cost = cost
+        self.held = False
+
+    async def __aenter__(self) -> "Admission":
+        limiter = self.limiter
+        if not limiter.enabled:
+            return self
+        limiter.check_rate(self.identity, self.tool_class, self.cost)
+        try:
+            await limiter.slots.acquire(self.identity, limiter.queue_timeout)
+        except RateLimited:
+            limiter._count("tenant", "concurrency")
+            raise
+        self.held = True
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self.release()
+
+    def release(self) -> None:
+        if self.held:
+            self.held = False
+            self.limiter.slots.release(self.identity)
@@ -1,10 +1,16 @@
 """
 Role-Based Access Control for MCP Tools
 Defines which roles can access which tools
+
+The lists on ToolPermissions are the single source of truth. At import
+they are compiled into one role bitmask per tool, so a check is a dict
+lookup and an AND; tool_registry asserts that every ToolSpec.rbac_class
+agrees with them.
 """
 
 from enum import Enum
-from typing import Tuple
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple
 
 
 class UserRole(Enum):
@@ -18,31 +24,45 @@ class ToolPermissions:
     """
     Define which roles can access which tools
     Based on backend's UserRole enum
+
+    The lists mirror the role checks of the backend controllers (only
+    the users and contacts controllers check roles), so a local denial
+    is always one the backend would give.
     """
     
-    # Tools that MEMBERs CAN access (read + basic operations)
+    # Tools that MEMBERs CAN access (every tool the backend allows any role)
     MEMBER_ALLOWED = [
         # Authentication (everyone)
         "login", "logout", "whoami",
         
-        # Contacts - Read & Create & Update
+        # Contacts
         "contacts_list", "contacts_get", "contacts_search",
         "contacts_create", "contacts_update",
         
-        # Deals - Read & Create & Update
+        # Deals
         "deals_list", "deals_get", "deals_create", 
-        "deals_update", "deals_move",
+        "deals_update", "deals_move", "deals_delete",
         
-        # Leads - Read & Create & Update & Convert
+        # Leads
         "leads_list", "leads_get", "leads_create",
-        "leads_update", "leads_convert",
+        "leads_update", "leads_convert", "leads_delete",
         
-       # Tickets - Read & Create & Update & Comment
+        # Tickets
         "tickets_list", "tickets_get", "tickets_create",
-        "tickets_update", "tickets_comment", "tickets_assign",
+        "tickets_update", "tickets_comment", "tickets_assign", "tickets_delete",
+        
+        # Pipelines & Stages
+        "pipelines_list", "pipelines_create", "pipelines_update", "pipelines_delete",
+        "stages_list", "stages_create", "stages_update",
+        
+        # Users - listing is open to every role
+        "users_list", "users_get",
+        
+        # Name -> ID lookup (local index, read only)
+        "resolve",
         
-        # Pipelines & Stages - Read only
-        "pipelines_list", "stages_list",
+        # Batch - each call inside is checked on its own
+        "batch_call",
         
         # Analytics - All members can view
         "analytics_dashboard", "analytics_revenue", 
@@ -58,29 +78,16 @@ class ToolPermissions:
     
     # Tools that ONLY ADMINs can use
     ADMIN_ONLY = [
-        # Delete operations (dangerous!)
-        "contacts_delete", "deals_delete", "leads_delete", "tickets_delete",
-        
-        # User management
-        "users_list", "users_get", "users_invite", 
+        # User management (PATCH /users/:id/role, DELETE /users/:id)
         "users_update_role", "users_deactivate",
-        
-        # Pipeline & Stage configuration
-        "pipelines_create", "pipelines_update", "pipelines_delete",
-        "stages_create", "stages_update",
-        
-        # Webhooks (integrations)
-        "webhooks_list", "webhooks_create", "webhooks_delete",
     ]
     
     # Tools that MANAGERs CAN access (MEMBER permissions + some admin tools)
     MANAGER_ALLOWED = [
         # All MEMBER permissions
         *MEMBER_ALLOWED,
-        # Plus: Can delete records (but not users/config)
-        "contacts_delete", "deals_delete", "leads_delete", "tickets_delete",
-        # Plus: Can view users (but not manage them)
-        "users_list", "users_get",
+        # Plus: Can delete contacts and invite users (DELETE /contacts/:id, POST /users/invite)
+        "contacts_delete", "users_invite",
     ]
     
     def check_permission(self, user_role: str, tool_name: str) -> Tuple[bool, str]:
@@ -88,38 +95,76 @@ class ToolPermissions:
         Check if user role has permission to use tool
         
         Args:
-            user_role: "ADMIN" or "MEMBER"
+            user_role: "ADMIN", "MANAGER" or "MEMBER" (any case)
             tool_name: Name of the tool being called
             
         Returns:
             (allowed: bool, reason: str)
         """
-        try:
-            role = UserRole(user_role)
-        except ValueError:
+        bit = ROLE_BITS.get(user_role.upper()) if isinstance(user_role, str) else None
+        if bit is None:
             return (False, f"Invalid role: {user_role}")
         
-        # Admin can do everything
-        if role == UserRole.ADMIN:
+        # Admin bit is set for every tool, unlisted ones included
+        if TOOL_ROLES.get(tool_name, ADMIN_BIT) & bit:
             return (True, "")
         
-        # Manager has extended permissions
-        if role == UserRole.MANAGER:
-            if tool_name in self.MANAGER_ALLOWED:
-                return (True, "")
+        if bit == MANAGER_BIT:
             # Check if it's ADMIN-only (system config)
-            if tool_name in self.ADMIN_ONLY:
+            if tool_name in ADMIN_ONLY_SET:
                 return (False, f"🔒 Only ADMINs can use '{tool_name}'. Contact your workspace admin.")
             return (False, f"🔒 MANAGERs cannot access '{tool_name}'")
-        
-        # Member has basic permissions
-        if role == UserRole.MEMBER:
-            if tool_name in self.MEMBER_ALLOWED:
-                return (True, "")
-            return (False, f"🔒 MEMBERs cannot access '{tool_name}'. Contact your manager or admin.")
-        
-        # Default: deny if not explicitly allowed
-        return (False, f"🔒 Role '{user_role}' cannot access '{tool_name}'")
+        return (False, f"🔒 MEMBERs cannot access '{tool_name}'. Contact your manager or admin.")
+    
+    def denial(self, user_role: Optional[str], tool_name: str) -> Optional[str]:
+        """
+        Reason to refuse a call locally, or None to let it through
+        
+        A missing role, or one that is not MEMBER/MANAGER/ADMIN (e.g. the
+        generic "authenticated" role of Supabase tokens), is deliberately
+        allowed here and left to the backend, which stays authoritative. Allowing never grants anything the backend would
+        refuse, since every call still goes through its checks; a local
+        refusal, however, is final, which is why the tables above must not
+        be stricter than the backend controllers. A stale or forged role
+        claim can therefore only refuse a call, never allow one.
+        """
+        if not isinstance(user_role, str) or user_role.upper() not in ROLE_BITS:
+            return None
+        allowed, reason = self.check_permission(user_role, tool_name)
+        return None if allowed else reason
+
+
+# ==================== COMPILED PERMISSIONS ====================
+
+MEMBER_BIT, MANAGER_BIT, ADMIN_BIT = 1, 2, 4
+ROLE_BITS: Mapping[str, int] = MappingProxyType({
+    UserRole.MEMBER.value: MEMBER_BIT,
+    UserRole.MANAGER.value: MANAGER_BIT,
+    UserRole.ADMIN.value: ADMIN_BIT,
+})
+
+
+def _compile_tool_roles() -> Mapping[str, int]:
+    """Bitmask of the roles allowed to call each listed tool"""
+    member = frozenset(ToolPermissions.MEMBER_ALLOWED)
+    manager = frozenset(ToolPermissions.MANAGER_ALLOWED)
+    tools = member | manager | frozenset(ToolPermissions.ADMIN_ONLY)
+    return MappingProxyType({
+        tool: ADMIN_BIT | (MANAGER_BIT if tool in manager else 0) | (MEMBER_BIT if tool in member else 0)
+        for tool in tools
+    })
+
+
+TOOL_ROLES = _compile_tool_roles()
+ADMIN_ONLY_SET = frozenset(ToolPermissions.ADMIN_ONLY)
+
+
+def rbac_class(tool_name: str) -> str:
+    """Least role allowed to call a tool, as a tool_registry RBAC class"""
+    mask = TOOL_ROLES.get(tool_name, ADMIN_BIT)
+    if mask & MEMBER_BIT:
+        return "member"
+    return "manager" if mask & MANAGER_BIT else "admin"
 
 
 # Global instance
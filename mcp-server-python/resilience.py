@@ -0,0 +1,230 @@
+"""
+Backend Resilience for MCP Servers
+Per-endpoint-family circuit breakers, adaptive timeouts and GET retries
+
+- a family is the first path segment (/contacts/42 -> contacts), so a
+  failing analytics endpoint does not take contacts down with it
+- breakers open after consecutive failures (timeouts, connection errors,
+  5xx), fail fast while open and let one probe through when half-open
+- timeouts follow each family's observed p99 latency instead of a fixed
+  30s, bounded by MCP_BACKEND_TIMEOUT
+- idempotent GETs are retried with full-jitter exponential backoff
+"""
+
+import os
+import time
+import random
+import logging
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+# Backend statuses that count as failures (4xx are the caller's problem)
+FAILURE_STATUSES = frozenset({500, 502, 503, 504})
+# Statuses worth retrying for idempotent requests
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+
+def endpoint_family(path: str) -> str:
+    """Breaker/latency family of a backend path: /contacts/42 -> contacts"""
+    segment = path.lstrip("/").split("/", 1)[0].split("?", 1)[0]
+    return segment or "root"
+
+
+class BackendUnavailable(Exception):
+    """Raised without calling the backend while a family's breaker is open"""
+
+    def __init__(self, family: str, retry_after: float):
+        self.family = family
+        self.retry_after = retry_after
+        super().__init__(
+            f"Backend {family} endpoints are unavailable (circuit open after repeated failures) - "
+            f"retry in {max(1, round(retry_after))}s"
+        )
+
+
+class BackendTimeout(Exception):
+    """Raised when a backend call exceeds its (adaptive) timeout on every attempt"""
+
+    def __init__(self, family: str, timeout: float):
+        self.family = family
+        self.timeout = timeout
+        super().__init__(f"Backend {family} endpoints did not answer within {timeout:.3g}s")
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure breaker with half-open probing
+
+    closed -> open after failure_threshold failures in a row; open ->
+    half_open once open_seconds pass; half_open lets half_open_probes
+    requests through and closes on success or reopens on failure.
+    """
+
+    def __init__(self, family: str, failure_threshold: int = 5, open_seconds: float = 30.0, half_open_probes: int = 1):
+        self.family = family
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_started = 0.0
+        self.rejected = 0
+
+    def before_request(self) -> None:
+        """Raise BackendUnavailable when the call must not reach the backend"""
+        if self.state == CLOSED:
+            return
+        now = time.monotonic()
+        if self.state == OPEN:
+            remaining = self.opened_at + self.open_seconds - now
+            if remaining > 0:
+                self.rejected += 1
+                raise BackendUnavailable(self.family, remaining)
+            self.state = HALF_OPEN
+            self.probes = 0
+            logger.info(f"🟡 Circuit {self.family}: half-open, probing")
+        if self.probes >= self.half_open_probes:
+            if now - self.probe_started < self.open_seconds:
+                self.rejected += 1
+                raise BackendUnavailable(self.family, self.probe_started + self.open_seconds - now)
+            self.probes = 0  # the probe never reported back (e.g. cancelled) - allow another
+        if self.probes == 0:
+            self.probe_started = now
+        self.probes += 1
+
+    def record_success(self) -> None:
+        if self.state != CLOSED:
+            logger.info(f"🟢 Circuit {self.family}: closed")
+        self.state = CLOSED
+        self.failures = 0
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                logger.warning(f"🔴 Circuit {self.family}: open for {self.open_seconds:.0f}s after {self.failures} failure(s)")
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "failures": self.failures, "rejected": self.rejected}
+
+
+class LatencyWindow:
+    """Recent latencies of one family - successes and timeouts (for adaptive timeouts)"""
+
+    def __init__(self, size: int = 200):
+        self.samples: Deque[float] = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class ResiliencePolicy:
+    """Breakers, latency windows and retry settings shared by one BackendClient"""
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        failure_threshold: int = 5,
+        open_seconds: float = 30.0,
+        max_timeout: float = 30.0,
+        min_timeout: float = 2.0,
+        timeout_multiplier: float = 3.0,
+        min_samples: int = 20,
+        retries: int = 2,
+        backoff_base: float = 0.1,
+        backoff_max: float = 1.0,
+    ):
+        self.enabled = enabled
+        self.failure_threshold = failure_threshold
+        self.open_seconds = open_seconds
+        self.max_timeout = max_timeout
+        self.min_timeout = min(min_timeout, max_timeout)
+        self.timeout_multiplier = timeout_multiplier
+        self.min_samples = min_samples
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.latencies: Dict[str, LatencyWindow] = {}
+        self.retried = 0
+
+    @classmethod
+    def from_env(cls, max_timeout: float = 30.0) -> "ResiliencePolicy":
+        """
+        MCP_BREAKER_* / MCP_ADAPTIVE_TIMEOUT_* / MCP_BACKEND_RETRIES settings
+
+        Args:
+            max_timeout: Ceiling for adaptive timeouts (MCP_BACKEND_TIMEOUT)
+        """
+        return cls(
+            enabled=os.getenv("MCP_BREAKER_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+            failure_threshold=int(os.getenv("MCP_BREAKER_FAILURES", "5")),
+            open_seconds=float(os.getenv("MCP_BREAKER_OPEN_SECONDS", "30")),
+            max_timeout=max_timeout,
+            min_timeout=float(os.getenv("MCP_ADAPTIVE_TIMEOUT_MIN", "2")),
+            timeout_multiplier=float(os.getenv("MCP_ADAPTIVE_TIMEOUT_MULTIPLIER", "3")),
+            min_samples=int(os.getenv("MCP_ADAPTIVE_TIMEOUT_MIN_SAMPLES", "20")),
+            retries=int(os.getenv("MCP_BACKEND_RETRIES", "2")),
+            backoff_base=float(os.getenv("MCP_BACKEND_RETRY_BACKOFF", "0.1")),
+        )
+
+    def breaker(self, family: str) -> CircuitBreaker:
+        breaker = self.breakers.get(family)
+        if breaker is None:
+            breaker = self.breakers[family] = CircuitBreaker(family, self.failure_threshold, self.open_seconds)
+        return breaker
+
+    def timeout_for(self, family: str) -> float:
+        """p99 x multiplier of recent latencies, within [min_timeout, max_timeout]"""
+        window = self.latencies.get(family)
+        if not self.enabled or window is None or len(window.samples) < self.min_samples:
+            return self.max_timeout
+        p99 = window.percentile(0.99)
+        return max(self.min_timeout, min(self.max_timeout, p99 * self.timeout_multiplier))
+
+    def record(self, family: str, seconds: float, failed: bool, timed_out: bool = False) -> None:
+        """
+        Feed one finished attempt into the family's breaker and latency window
+
+        Timeouts count as latency samples too, so a backend that became
+        slower (but healthy) raises its own timeout instead of timing out forever.
+        """
+        if not self.enabled:
+            return
+        breaker = self.breaker(family)
+        if failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        if failed and not timed_out:
+            return
+        window = self.latencies.get(family)
+        if window is None:
+            window = self.latencies[family] = LatencyWindow()
+        window.add(seconds)
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number `attempt` (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-family breaker state and current timeout (for /health)"""
+        return {
+            family: {**breaker.stats(), "timeout": round(self.timeout_for(family), 3)}
+            for family, breaker in sorted(self.breakers.items())
+        }
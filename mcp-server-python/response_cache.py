@@ -0,0 +1,284 @@
+"""
+Read-Through Response Cache for MCP List Tools
+Per-subject TTL cache with LRU bounds, byte accounting and
+entity-family invalidation on writes
+
+With a shared state backend (MCP_STATE_BACKEND=sqlite) entries live in
+the shared store instead, so every HTTP worker sees the same cache and
+the same invalidations.
+"""
+
+import os
+import json
+import time
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+
+from shared_state import StateBackend, get_state_backend
+from serialization import dumps_bytes, loads
+from session_claims import session_claims
+
+logger = logging.getLogger(__name__)
+
+# Seconds each read tool stays cached (tools not listed are never cached)
+DEFAULT_TTLS: Dict[str, float] = {
+    "contacts_list": 30,
+    "deals_list": 30,
+    "leads_list": 30,
+    "tickets_list": 15,
+    "pipelines_list": 300,
+    "analytics_dashboard": 60,
+}
+
+# Writes to one entity family make these cached families stale
+# (list payloads embed related records, e.g. deals carry their contact)
+FAMILY_INVALIDATIONS: Dict[str, Tuple[str, ...]] = {
+    "contacts": ("contacts", "deals", "leads", "tickets", "analytics"),
+    "deals": ("deals", "contacts", "pipelines", "analytics"),
+    "leads": ("leads", "contacts", "analytics"),
+    "tickets": ("tickets", "contacts", "analytics"),
+    "pipelines": ("pipelines", "stages", "deals", "analytics"),
+    "stages": ("stages", "pipelines", "deals", "analytics"),
+    "users": ("users",),
+    "portal": ("portal", "tickets", "analytics"),
+}
+
+# Tool-specific overrides (cross-family side effects)
+TOOL_INVALIDATIONS: Dict[str, Tuple[str, ...]] = {
+    "leads_convert": ("leads", "deals", "contacts", "pipelines", "analytics"),
+}
+
+CacheKey = Tuple[str, str, str]
+
+
+def tool_family(tool_name: str) -> str:
+    """Entity family of a tool: contacts_list -> contacts"""
+    return tool_name.split("_", 1)[0]
+
+
+def session_subject(jwt: str) -> str:
+    """
+    Stable cache subject for a session token
+
+    Tokens whose signature was verified map to their tenant/user, so a
+    refreshed token keeps its cache; all other tokens map to a digest.
+    The raw token is never stored.
+    """
+    return session_claims(jwt).subject
+
+
+@dataclass
+class CacheEntry:
+    """One cached backend payload"""
+    value: Any
+    size: int
+    expires_at: float
+    family: str
+
+
+class ResponseCache:
+    """
+    In-process TTL + LRU cache for read tools
+
+    Keys are (subject, tool, normalized args). Entries are evicted when
+    they expire, when max_entries is exceeded, or when the total payload
+    size passes max_bytes (least recently used first).
+
+    When a shared StateBackend is given, values are stored there as
+    compact JSON (TTL enforced by the store, LRU bounds do not apply).
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 1024,
+        max_bytes: int = 64 * 1024 * 1024,
+        enabled: bool = True,
+        shared: Optional[StateBackend] = None,
+    ):
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self.shared = shared
+
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._scopes: Dict[Tuple[str, str], Set[CacheKey]] = {}
+        self.total_bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @classmethod
+    def from_env(cls) -> "ResponseCache":
+        """
+        Build a cache from MCP_CACHE_* environment variables
+
+        MCP_CACHE_TTLS overrides individual tools, e.g.
+        "contacts_list=10,analytics_dashboard=0" (0 disables a tool).
+        """
+        ttls = dict(DEFAULT_TTLS)
+        for item in os.getenv("MCP_CACHE_TTLS", "").split(","):
+            if "=" in item:
+                tool, seconds = item.split("=", 1)
+                ttls[tool.strip()] = float(seconds)
+
+        return cls(
+            ttls={tool: ttl for tool, ttl in ttls.items() if ttl > 0},
+            max_entries=int(os.getenv("MCP_CACHE_MAX_ENTRIES", "1024")),
+            max_bytes=int(os.getenv("MCP_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+            enabled=os.getenv("MCP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes", "on"),
+            shared=get_state_backend(),
+        )
+
+    # ==================== KEYS ====================
+
+    def is_cacheable(self, tool_name: str) -> bool:
+        return self.enabled and tool_name in self.ttls
+
+    @staticmethod
+    def make_key(subject: str, tool_name: str, args: Dict[str, Any]) -> CacheKey:
+        """Normalize arguments so equivalent calls share one entry"""
+        normalized = json.dumps(args, sort_keys=True, separators=(",", ":"), default=str)
+        return (subject, tool_name, normalized)
+
+    @staticmethod
+    def _shared_key(key: CacheKey) -> str:
+        return "cache:" + "\x1f".join(key)
+
+    @staticmethod
+    def _scope_tag(subject: str, family: str) -> str:
+        return f"cache-scope:{subject}:{family}"
+
+    # ==================== READ / WRITE ====================
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        """Return a fresh cached value, or None on miss/expiry"""
+        if self.shared is not None:
+            raw = self.shared.get(self._shared_key(key))
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return loads(raw)
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def set(self, key: CacheKey, value: Any, size: int) -> None:
+        """
+        Store a backend payload
+
+        Args:
+            key: Key from make_key()
+            value: Parsed payload
+            size: Payload size in bytes (raw response length)
+        """
+        tool_name = key[1]
+        ttl = self.ttls.get(tool_name)
+        if not self.enabled or not ttl or size > self.max_bytes:
+            return
+
+        if self.shared is not None:
+            raw = dumps_bytes(value, pretty=False)
+            tag = self._scope_tag(key[0], tool_family(tool_name))
+            self.shared.set(self._shared_key(key), raw, ttl, tags=(tag, "cache"))
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        family = tool_family(tool_name)
+        self._entries[key] = CacheEntry(value, size, time.monotonic() + ttl, family)
+        self._scopes.setdefault((key[0], family), set()).add(key)
+        self.total_bytes += size
+
+        while len(self._entries) > self.max_entries or self.total_bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: CacheKey) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self.total_bytes -= entry.size
+        scope = self._scopes.get((key[0], entry.family))
+        if scope is not None:
+            scope.discard(key)
+            if not scope:
+                del self._scopes[(key[0], entry.family)]
+
+    # ==================== INVALIDATION ====================
+
+    def invalidate_families(self, subject: str, families: Iterable[str]) -> int:
+        """Drop every entry of the given families for one subject"""
+        if self.shared is not None:
+            dropped = self.shared.delete_tags(self._scope_tag(subject, family) for family in families)
+            self.invalidations += dropped
+            return dropped
+
+        dropped = 0
+        for family in families:
+            for key in list(self._scopes.get((subject, family), ())):
+                self._remove(key)
+                dropped += 1
+        self.invalidations += dropped
+        return dropped
+
+    def invalidate_for_write(self, subject: str, tool_name: str) -> int:
+        """Invalidate the families affected by a successful write tool"""
+        family = tool_family(tool_name)
+        families = TOOL_INVALIDATIONS.get(tool_name) or FAMILY_INVALIDATIONS.get(family, (family,))
+        dropped = self.invalidate_families(subject, families)
+        if dropped:
+            logger.debug(f"Cache: {tool_name} invalidated {dropped} entries")
+        return dropped
+
+    def clear(self) -> None:
+        if self.shared is not None:
+            self.shared.delete_tags(["cache"])
+        self._entries.clear()
+        self._scopes.clear()
+        self.total_bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters for /health and metrics"""
+        lookups = self.hits + self.misses
+        if self.shared is not None:
+            shared = self.shared.stats()
+            return {
+                "enabled": self.enabled,
+                "backend": shared["backend"],
+                "entries": shared.get("entries", 0),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
@@ -0,0 +1,291 @@
+"""
+Result Shaping for LLM Consumption
+Compact, token-budgeted rendering of list tool results
+
+- each entity family is projected to the columns the model needs
+  (ids, names, key status fields)
+- rows are rendered as CSV-like text with one header line
+- output stops at a byte budget with a "truncated, N more" marker and a
+  cursor for the next rows, so the full list stays reachable
+"""
+
+import io
+import os
+import csv
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pagination import PaginationError, decode_cursor, encode_cursor, split_page_args
+from serialization import dumps
+
+RESULT_FORMATS = ("table", "json")
+
+# ~4 bytes per token for English/JSON-ish text
+BYTES_PER_TOKEN = 4
+
+
+def _default_budget() -> int:
+    tokens = os.getenv("MCP_RESULT_MAX_TOKENS")
+    if tokens:
+        return int(tokens) * BYTES_PER_TOKEN
+    return int(os.getenv("MCP_RESULT_MAX_BYTES", "16384"))
+
+
+def _path(*keys: str) -> Callable[[Dict[str, Any]], Any]:
+    def get(record: Dict[str, Any]) -> Any:
+        value: Any = record
+        for key in keys:
+            if not isinstance(value, dict):
+                return None
+            value = value.get(key)
+        return value
+    return get
+
+
+def _person(*keys: str) -> Callable[[Dict[str, Any]], Any]:
+    """First + last name of a (nested) person record"""
+    get = _path(*keys) if keys else (lambda record: record)
+
+    def name(record: Dict[str, Any]) -> Any:
+        person = get(record)
+        if not isinstance(person, dict):
+            return None
+        full = f"{person.get('firstName') or ''} {person.get('lastName') or ''}".strip()
+        return full or person.get("name") or person.get("email")
+    return name
+
+
+def _ref(field: str, nested: str) -> Callable[[Dict[str, Any]], Any]:
+    """Foreign key column: record[field], else record[nested]["id"]"""
+    def get(record: Dict[str, Any]) -> Any:
+        value = record.get(field)
+        if value is None and isinstance(record.get(nested), dict):
+            value = record[nested].get("id")
+        return value
+    return get
+
+
+def _stages(record: Dict[str, Any]) -> Any:
+    stages = record.get("stages")
+    if not isinstance(stages, list):
+        return None
+    return "; ".join(f"{s.get('name')}={s.get('id')}" for s in stages if isinstance(s, dict))
+
+
+Column = Tuple[str, Callable[[Dict[str, Any]], Any]]
+
+# Columns per entity family (first column is always the id; foreign keys
+# stay so follow-up writes such as deals_move need no extra lookup)
+COLUMNS: Dict[str, Tuple[Column, ...]] = {
+    "contacts": (
+        ("id", _path("id")),
+        ("name", _person()),
+        ("email", _path("email")),
+        ("company", _path("company")),
+        ("phone", _path("phone")),
+    ),
+    "deals": (
+        ("id", _path("id")),
+        ("title", _path("title")),
+        ("value", _path("value")),
+        ("stage", _path("stage", "name")),
+        ("stageId", _ref("stageId", "stage")),
+        ("pipeline", _path("pipeline", "name")),
+        ("pipelineId", _ref("pipelineId", "pipeline")),
+        ("contact", _person("contact")),
+        ("contactId", _ref("contactId", "contact")),
+    ),
+    "leads": (
+        ("id", _path("id")),
+        ("title", _path("title")),
+        ("status", _path("status")),
+        ("source", _path("source")),
+        ("value", _path("value")),
+        ("contact", _person("contact")),
+        ("contactId", _ref("contactId", "contact")),
+    ),
+    "tickets": (
+        ("id", _path("id")),
+        ("title", _path("title")),
+        ("status", _path("status")),
+        ("priority", _path("priority")),
+        ("contact", _person("contact")),
+        ("contactId", _ref("contactId", "contact")),
+    ),
+    "pipelines": (
+        ("id", _path("id")),
+        ("name", _path("name")),
+        ("stages", _stages),
+    ),
+    "stages": (
+        ("id", _path("id")),
+        ("name", _path("name")),
+        ("pipelineId", _path("pipelineId")),
+        ("order", _path("order")),
+    ),
+    "users": (
+        ("id", _path("id")),
+        ("name", _person()),
+        ("email", _path("email")),
+        ("role", _path("role")),
+    ),
+}
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, (dict, list)):
+        return dumps(value, pretty=False)
+    return str(value)
+
+
+class ResultShaper:
+    """
+    Render list results within a byte budget
+
+    format="table" emits CSV-like rows; format="json" keeps the
+    {items, nextCursor, total} structure but applies the same budget.
+    """
+
+    def __init__(self, result_format: str = "table", max_bytes: int = 16384):
+        self.result_format = result_format if result_format in RESULT_FORMATS else "table"
+        self.max_bytes = max_bytes
+
+    @classmethod
+    def from_env(cls) -> "ResultShaper":
+        """MCP_RESULT_FORMAT (table|json), MCP_RESULT_MAX_BYTES or MCP_RESULT_MAX_TOKENS"""
+        return cls(
+            result_format=os.getenv("MCP_RESULT_FORMAT", "table").strip().lower(),
+            max_bytes=_default_budget(),
+        )
+
+    def shapes(self, tool_name: str) -> bool:
+        """True for tools whose results are lists (rendered by this shaper)"""
+        return tool_name.endswith("_list") or tool_name.endswith("_search")
+
+    # ==================== RENDERING ====================
+
+    def render(self, tool_name: str, data: Any, args: Dict[str, Any]) -> str:
+        """
+        Render a tool result as compact text
+
+        Args:
+            tool_name: Tool that produced the data
+            data: Page dict {items, nextCursor, total} or a plain list
+            args: Tool arguments (page args locate the cursor for truncation)
+        """
+        if isinstance(data, dict) and isinstance(data.get("items"), list):
+            items, total, next_cursor = data["items"], data.get("total", len(data["items"])), data.get("nextCursor")
+        elif isinstance(data, list):
+            items, total, next_cursor = data, len(data), None
+        else:
+            return dumps(data)
+
+        page_args, _ = split_page_args(args)
+        sort = page_args.get("sort")
+        if isinstance(sort, (list, tuple)):
+            sort = ",".join(sort)
+        try:
+            offset = decode_cursor(page_args["cursor"], sort) if "cursor" in page_args else 0
+        except PaginationError:
+            offset = 0
+
+        if self.result_format == "json":
+            return self._render_json(tool_name, items, total, next_cursor, offset, sort, isinstance(data, dict))
+        return self._render_table(
+            tool_name, items, total, next_cursor, offset, sort, isinstance(data, dict), page_args.get("fields")
+        )
+
+    def _columns(self, tool_name: str, items: Sequence[Any], fields: Any) -> Tuple[Column, ...]:
+        if fields:
+            names = [f.strip() for f in (fields if isinstance(fields, (list, tuple)) else str(fields).split(","))]
+            names = ["id"] + [n for n in names if n and n != "id"]
+            return tuple((name, _path(*name.split("."))) for name in names)
+        family = tool_name.split("_", 1)[0]
+        if family in COLUMNS:
+            return COLUMNS[family]
+        # Unknown shape - use the keys of the first record
+        first = next((item for item in items if isinstance(item, dict)), {})
+        return tuple((key, _path(key)) for key in first)
+
+    def _marker(self, tool_name: str, remaining: int, cursor: Optional[str], searched: bool) -> str:
+        if cursor:
+            return f"... truncated, {remaining} more - call {tool_name} with cursor=\"{cursor}\" for the next rows"
+        if searched:
+            return f"... truncated, {remaining} more - refine the search"
+        return f"... truncated, {remaining} more"
+
+    def _render_table(
+        self,
+        tool_name: str,
+        items: List[Any],
+        total: int,
+        next_cursor: Optional[str],
+        offset: int,
+        sort: Optional[str],
+        paged: bool,
+        fields: Any,
+    ) -> str:
+        columns = self._columns(tool_name, items, fields)
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow([name for name, _ in columns])
+        header = buffer.getvalue()
+
+        rows: List[str] = []
+        used = len(header)
+        for item in items:
+            buffer.seek(0)
+            buffer.truncate()
+            record = item if isinstance(item, dict) else {"id": item}
+            writer.writerow([_cell(get(record)) for _, get in columns])
+            line = buffer.getvalue()
+            if rows and used + len(line.encode("utf-8")) > self.max_bytes:
+                break
+            rows.append(line)
+            used += len(line.encode("utf-8"))
+
+        shown = len(rows)
+        first = offset + 1 if shown else 0
+        summary = f"{tool_name}: rows {first}-{offset + shown} of {total}"
+        if sort:
+            summary += f" (sort {sort})"
+        parts = [summary + "\n", header, *rows]
+
+        if shown < len(items):
+            cursor = encode_cursor(offset + shown, sort) if paged else None
+            parts.append(self._marker(tool_name, total - offset - shown, cursor, tool_name.endswith("_search")))
+        elif next_cursor:
+            parts.append(f"More rows: call {tool_name} with cursor=\"{next_cursor}\"")
+        return "".join(parts).rstrip("\n")
+
+    def _render_json(
+        self,
+        tool_name: str,
+        items: List[Any],
+        total: int,
+        next_cursor: Optional[str],
+        offset: int,
+        sort: Optional[str],
+        paged: bool,
+    ) -> str:
+        kept: List[Any] = []
+        used = 64  # envelope
+        for item in items:
+            size = len(dumps(item, pretty=False).encode("utf-8")) + 1
+            if kept and used + size > self.max_bytes:
+                break
+            kept.append(item)
+            used += size
+
+        if len(kept) == len(items):
+            return dumps({"items": items, "nextCursor": next_cursor, "total": total} if paged else items)
+
+        remaining = total - offset - len(kept)
+        cursor = encode_cursor(offset + len(kept), sort) if paged else None
+        return dumps({
+            "items": kept,
+            "nextCursor": cursor,
+            "total": total,
+            "truncated": self._marker(tool_name, remaining, cursor, tool_name.endswith("_search")),
+        })
@@ -0,0 +1,89 @@
+"""
+JSON Serialization for MCP Servers
+orjson fast path when installed, stdlib json fallback
+
+- compact output by default (MCP_JSON_PRETTY=true restores indent=2)
+- RawJson carries backend bytes that need no transformation, so they
+  reach the client without a parse/re-encode round trip
+"""
+
+import os
+import json
+import logging
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import orjson
+except ImportError:  # optional: pip install orjson
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+PRETTY = os.getenv("MCP_JSON_PRETTY", "false").lower() in ("1", "true", "yes", "on")
+
+if orjson is not None:
+    _ORJSON_COMPACT = orjson.OPT_NON_STR_KEYS
+    _ORJSON_PRETTY = orjson.OPT_NON_STR_KEYS | orjson.OPT_INDENT_2
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """Parse JSON from bytes or text"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps_bytes(value: Any, pretty: bool = PRETTY) -> bytes:
+    """
+    Encode to UTF-8 JSON bytes
+
+    Args:
+        value: Any JSON-compatible value (unknown types fall back to str())
+        pretty: Indent output; defaults to MCP_JSON_PRETTY (framing formats
+            such as NDJSON must pass False)
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=str, option=_ORJSON_PRETTY if pretty else _ORJSON_COMPACT)
+        except TypeError:
+            pass  # e.g. integers beyond 64 bits - let stdlib handle it
+    if pretty:
+        return json.dumps(value, indent=2, default=str, ensure_ascii=False).encode("utf-8")
+    return json.dumps(value, separators=(",", ":"), default=str, ensure_ascii=False).encode("utf-8")
+
+
+def dumps(value: Any, pretty: bool = PRETTY) -> str:
+    """Encode to a JSON string (compact unless MCP_JSON_PRETTY)"""
+    return dumps_bytes(value, pretty).decode("utf-8")
+
+
+class RawJson:
+    """
+    Backend JSON body forwarded as-is
+
+    Produced when a result needs no shaping; value() parses on demand for
+    callers that need the data (e.g. batch references).
+    """
+
+    __slots__ = ("content",)
+
+    def __init__(self, content: bytes):
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode("utf-8")
+
+    def value(self) -> Any:
+        return loads(self.content)
+
+    def __len__(self) -> int:
+        return len(self.content)
+
+
+def to_text(value: Any) -> str:
+    """Tool result text: raw bodies pass through, everything else is encoded"""
+    if isinstance(value, RawJson):
+        return dumps(value.value()) if PRETTY else value.text
+    return dumps(value)
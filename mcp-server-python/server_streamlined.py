@@ -14,30 +14,29 @@ import asyncio
 import os
 import logging
 import json
-from typing import Any
-from datetime import datetime, timedelta
-from pathlib import Path
+from datetime import datetime
 from dotenv import load_dotenv
 
-import httpx
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
-# Load environment variables
+# Load environment variables (before local modules read their settings)
 load_dotenv()
 
+from backend_client import BackendClient
+# Session file shared with the unified server (cached in memory, atomic writes)
+from cache import save_session, load_session, delete_session
+from structured_logging import configure_logging, log_event
+import formatters
+
 # Configuration
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3001")
 BACKEND_API = f"{BACKEND_URL}{os.getenv('BACKEND_API_PREFIX', '/api')}"
-SESSION_FILE = Path.home() / ".synapse" / "session.json"
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(levelname)s - %(message)s",
-)
+configure_logging("%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("synapse-mcp")
 
 
@@ -89,40 +88,6 @@ def is_crm_related_query(text: str) -> tuple[bool, str]:
     return False, "⚠️ This chatbot is specialized for CRM operations (contacts, deals, leads, tickets, analytics). Please rephrase your request to include CRM-related operations."
 
 
-# ==================== SESSION MANAGEMENT ====================
-
-def save_session(data: dict):
-    """Save session to file"""
-    SESSION_FILE.parent.mkdir(parents=True, exist_ok=True)
-    SESSION_FILE.write_text(json.dumps(data, indent=2, default=str))
-    logger.info(f"✅ Session saved for {data.get('email')}")
-
-
-def load_session() -> dict | None:
-    """Load session from file"""
-    if not SESSION_FILE.exists():
-        return None
-    try:
-        session = json.loads(SESSION_FILE.read_text())
-        # Check if expired (24 hours)
-        created = datetime.fromisoformat(session.get('created_at', '2000-01-01'))
-        if datetime.now() - created > timedelta(hours=24):
-            logger.info("⚠️  Session expired")
-            delete_session()
-            return None
-        return session
-    except Exception as e:
-        logger.error(f"❌ Error loading session: {e}")
-        return None
-
-
-def delete_session():
-    """Delete session"""
-    if SESSION_FILE.exists():
-        SESSION_FILE.unlink()
-        logger.info("🗑️  Session deleted")
-
-
 # ==================== MCP SERVER ====================
 
 class SynapseCRMServer:
@@ -130,6 +95,7 @@ class SynapseCRMServer:
 
     def __init__(self):
         self.server = Server("synapse-crm")
+        self.backend = BackendClient.from_env(BACKEND_API)
         self.setup_handlers()
 
     def setup_handlers(self):
@@ -454,7 +420,7 @@ class SynapseCRMServer:
         async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Execute tool with automatic JWT injection"""
             try:
-                logger.info(f"🔧 Tool: {name}")
+                log_event(logger, "tool_call", transport="stdio", tool=name)
 
                 # Authentication tools (no JWT needed)
                 if name == "login":
@@ -498,66 +464,65 @@ class SynapseCRMServer:
 
     async def login(self, args: dict) -> list[TextContent]:
         """Login and save session"""
-        async with httpx.AsyncClient() as client:
-            try:
-                payload = {"email": args.get("email"), "password": args.get("password")}
-                logger.info(f"Login attempt for: {payload['email']}")
+        try:
+            payload = {"email": args.get("email"), "password": args.get("password")}
+            log_event(logger, "login_attempt", email=payload["email"])
+            
+            response = await self.backend.request(
+                "POST",
+                "/auth/signin",
+                json=payload,
+                headers={"Content-Type": "application/json"},
+            )
+            
+            # The signin body carries the access token - only the status is logged
+            log_event(logger, "login_response", logging.DEBUG, status=response.status_code)
+
+            if response.status_code in [200, 201]:
+                data = response.json()
                 
-                response = await client.post(
-                    f"{BACKEND_API}/auth/signin",
-                    json=payload,
-                    headers={"Content-Type": "application/json"},
-                    timeout=30.0,
+                # Extract JWT from nested session object or top-level
+                session_data = data.get("session", {})
+                jwt = (
+                    session_data.get("access_token") or 
+                    data.get("access_token") or 
+                    data.get("jwt") or 
+                    data.get("token")
                 )
+
+                if jwt:
+                    # Save session with user info
+                    user_info = data.get("dbUser", {})
+                    save_session({
+                        "email": args["email"],
+                        "jwt": jwt,
+                        "userId": user_info.get("id"),
+                        "tenantId": user_info.get("tenantId"),
+                        "role": user_info.get("role"),
+                        "created_at": datetime.now().isoformat(),
+                    })
+
+                    return [TextContent(
+                        type="text",
+                        text=f"✅ Logged in as {args['email']}\n"
+                             f"👤 Role: {user_info.get('role', 'USER')}\n"
+                             f"🏢 Workspace: {user_info.get('tenant', {}).get('name', 'N/A')}\n"
+                             f"✅ Session saved - use tools without JWT!\n\n"
+                             f"Try: 'Show all contacts' or 'Show my deals'"
+                    )]
+
+            # Handle error response
+            try:
+                error_data = response.json()
+                error_msg = error_data.get("message", error_data)
+            except:
+                error_msg = response.text
                 
-                logger.info(f"Response status: {response.status_code}")
-                logger.info(f"Response body: {response.text}")
-
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    
-                    # Extract JWT from nested session object or top-level
-                    session_data = data.get("session", {})
-                    jwt = (
-                        session_data.get("access_token") or 
-                        data.get("access_token") or 
-                        data.get("jwt") or 
-                        data.get("token")
-                    )
-
-                    if jwt:
-                        # Save session with user info
-                        user_info = data.get("dbUser", {})
-                        save_session({
-                            "email": args["email"],
-                            "jwt": jwt,
-                            "userId": user_info.get("id"),
-                            "tenantId": user_info.get("tenantId"),
-                            "role": user_info.get("role"),
-                            "created_at": datetime.now().isoformat(),
-                        })
-
-                        return [TextContent(
-                            type="text",
-                            text=f"✅ Logged in as {args['email']}\n"
-                                 f"👤 Role: {user_info.get('role', 'USER')}\n"
-                                 f"🏢 Workspace: {user_info.get('tenant', {}).get('name', 'N/A')}\n"
-                                 f"✅ Session saved - use tools without JWT!\n\n"
-                                 f"Try: 'Show all contacts' or 'Show my deals'"
-                        )]
-
-                # Handle error response
-                try:
-                    error_data = response.json()
-                    error_msg = error_data.get("message", error_data)
-                except:
-                    error_msg = response.text
-                    
-                return [TextContent(type="text", text=f"❌ Login failed: {error_msg}")]
-                
-            except Exception as e:
-                logger.error(f"Login error: {e}", exc_info=True)
-                return [TextContent(type="text", text=f"❌ Login error: {str(e)}")]
+            return [TextContent(type="text", text=f"❌ Login failed: {error_msg}")]
+            
+        except Exception as e:
+            logger.error(f"Login error: {e}", exc_info=True)
+            return [TextContent(type="text", text=f"❌ Login error: {str(e)}")]
 
     async def logout(self) -> list[TextContent]:
         """Logout and clear session"""
@@ -656,119 +621,23 @@ class SynapseCRMServer:
             return await self.api_call("DELETE", f"/tickets/{ticket_id}", args)
 
     # ==================== FORMATTERS ====================
+    # Generator-based renderers live in formatters.py (capped at MCP_FORMAT_MAX_RECORDS)
 
     def format_contacts(self, contacts: list) -> str:
         """Format contacts in natural language"""
-        if not contacts:
-            return "📭 No contacts found."
-        
-        result = f"📇 **Found {len(contacts)} contact(s):**\n\n"
-        for contact in contacts:
-            result += f"• **{contact.get('firstName', '')} {contact.get('lastName', '')}**\n"
-            if contact.get('email'):
-                result += f"  📧 {contact['email']}\n"
-            if contact.get('phone'):
-                result += f"  📱 {contact['phone']}\n"
-            if contact.get('company'):
-                result += f"  🏢 {contact['company']}"
-                if contact.get('jobTitle'):
-                    result += f" - {contact['jobTitle']}"
-                result += "\n"
-            
-            # Show related data counts
-            deals_count = len(contact.get('deals', []))
-            tickets_count = len(contact.get('tickets', []))
-            if deals_count or tickets_count:
-                result += f"  💼 {deals_count} deal(s), 🎫 {tickets_count} ticket(s)\n"
-            result += "\n"
-        
-        return result.strip()
+        return formatters.format_contacts(contacts)
 
     def format_deals(self, deals: list) -> str:
         """Format deals in natural language"""
-        if not deals:
-            return "📭 No deals found."
-        
-        result = f"💼 **Found {len(deals)} deal(s):**\n\n"
-        total_value = 0
-        
-        for deal in deals:
-            value = float(deal.get('value', 0))
-            total_value += value
-            
-            result += f"• **{deal.get('title', 'Untitled')}** - ${value:,.2f}\n"
-            
-            contact = deal.get('contact', {})
-            if contact:
-                result += f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')} ({contact.get('company', 'N/A')})\n"
-            
-            stage = deal.get('stage', {})
-            pipeline = deal.get('pipeline', {})
-            if stage or pipeline:
-                result += f"  📊 {pipeline.get('name', 'N/A')} → {stage.get('name', 'N/A')}\n"
-            
-            if deal.get('probability'):
-                result += f"  🎯 {deal['probability']}% probability\n"
-            
-            if deal.get('expectedCloseDate'):
-                result += f"  📅 Expected close: {deal['expectedCloseDate'][:10]}\n"
-            
-            result += "\n"
-        
-        result += f"💰 **Total pipeline value:** ${total_value:,.2f}"
-        return result
+        return formatters.format_deals(deals)
 
     def format_leads(self, leads: list) -> str:
         """Format leads in natural language"""
-        if not leads:
-            return "📭 No leads found."
-        
-        result = f"🎯 **Found {len(leads)} lead(s):**\n\n"
-        
-        for lead in leads:
-            result += f"• **{lead.get('title', 'Untitled')}**\n"
-            result += f"  📌 Status: {lead.get('status', 'N/A')}\n"
-            result += f"  📍 Source: {lead.get('source', 'N/A')}\n"
-            
-            if lead.get('value'):
-                result += f"  💵 Value: ${float(lead['value']):,.2f}\n"
-            
-            contact = lead.get('contact', {})
-            if contact:
-                result += f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')}\n"
-            
-            result += "\n"
-        
-        return result.strip()
+        return formatters.format_leads(leads)
 
     def format_tickets(self, tickets: list) -> str:
         """Format tickets in natural language"""
-        if not tickets:
-            return "📭 No tickets found."
-        
-        result = f"🎫 **Found {len(tickets)} ticket(s):**\n\n"
-        
-        priority_emoji = {"LOW": "🟢", "MEDIUM": "🟡", "HIGH": "🟠", "URGENT": "🔴"}
-        status_emoji = {"OPEN": "🆕", "IN_PROGRESS": "⏳", "RESOLVED": "✅", "CLOSED": "🔒"}
-        
-        for ticket in tickets:
-            priority = ticket.get('priority', 'MEDIUM')
-            status = ticket.get('status', 'OPEN')
-            
-            result += f"• {priority_emoji.get(priority, '⚪')} **{ticket.get('title', 'Untitled')}**\n"
-            result += f"  {status_emoji.get(status, '⚪')} {status} | Priority: {priority}\n"
-            
-            if ticket.get('description'):
-                desc = ticket['description'][:100]
-                result += f"  📝 {desc}{'...' if len(ticket['description']) > 100 else ''}\n"
-            
-            contact = ticket.get('contact', {})
-            if contact:
-                result += f"  👤 {contact.get('firstName', '')} {contact.get('lastName', '')}\n"
-            
-            result += "\n"
-        
-        return result.strip()
+        return formatters.format_tickets(tickets)
 
     # ==================== API HELPER ====================
 
@@ -778,113 +647,95 @@ class SynapseCRMServer:
         if not jwt:
             return [TextContent(type="text", text="❌ Missing JWT token")]
 
-        headers = {"Authorization": f"Bearer {jwt}"}
+        try:
+            if method not in ("GET", "POST", "PATCH", "DELETE"):
+                raise ValueError(f"Unsupported method: {method}")
 
-        async with httpx.AsyncClient() as client:
-            try:
-                if method == "GET":
-                    response = await client.get(
-                        f"{BACKEND_API}{endpoint}",
-                        headers=headers,
-                        params=args,
-                        timeout=30.0,
-                    )
-                elif method == "POST":
-                    response = await client.post(
-                        f"{BACKEND_API}{endpoint}",
-                        headers=headers,
-                        json=args,
-                        timeout=30.0,
-                    )
-                elif method == "PATCH":
-                    response = await client.patch(
-                        f"{BACKEND_API}{endpoint}",
-                        headers=headers,
-                        json=args,
-                        timeout=30.0,
-                    )
-                elif method == "DELETE":
-                    response = await client.delete(
-                        f"{BACKEND_API}{endpoint}",
-                        headers=headers,
-                        timeout=30.0,
-                    )
-                else:
-                    raise ValueError(f"Unsupported method: {method}")
-
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    
-                    # Format based on endpoint for better readability
-                    if "/contacts" in endpoint and isinstance(data, list):
-                        formatted = self.format_contacts(data)
-                    elif "/deals" in endpoint and isinstance(data, list):
-                        formatted = self.format_deals(data)
-                    elif "/leads" in endpoint and isinstance(data, list):
-                        formatted = self.format_leads(data)
-                    elif "/tickets" in endpoint and isinstance(data, list):
-                        formatted = self.format_tickets(data)
-                    elif "/contacts" in endpoint and isinstance(data, dict):
-                        # Single contact created/updated
-                        formatted = f"✅ **Contact saved:** {data.get('firstName', '')} {data.get('lastName', '')}\n"
-                        formatted += f"📧 {data.get('email', 'No email')}\n"
-                        formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
-                    elif "/deals" in endpoint and isinstance(data, dict):
-                        # Single deal created/updated
-                        formatted = f"✅ **Deal saved:** {data.get('title', 'Untitled')}\n"
-                        formatted += f"💰 Value: ${float(data.get('value', 0)):,.2f}\n"
-                        formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
-                    elif "/leads" in endpoint and isinstance(data, dict):
-                        # Single lead created/updated
-                        formatted = f"✅ **Lead saved:** {data.get('title', 'Untitled')}\n"
-                        formatted += f"📌 Status: {data.get('status', 'N/A')}\n"
-                        formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
-                    elif "/tickets" in endpoint and isinstance(data, dict):
-                        # Single ticket created/updated
-                        formatted = f"✅ **Ticket saved:** {data.get('title', 'Untitled')}\n"
-                        formatted += f"📌 Status: {data.get('status', 'N/A')} | Priority: {data.get('priority', 'MEDIUM')}\n"
-                        formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
-                    elif "/analytics" in endpoint:
-                        # Analytics dashboard
-                        formatted = "📊 **Dashboard Analytics:**\n\n"
-                        formatted += f"👥 Total Contacts: {data.get('totalContacts', 0)}\n"
-                        formatted += f"🎯 Total Leads: {data.get('totalLeads', 0)}\n"
-                        formatted += f"💼 Total Deals: {data.get('totalDeals', 0)}\n"
-                        formatted += f"🎫 Total Tickets: {data.get('totalTickets', 0)}\n\n"
-                        formatted += f"💰 Total Revenue: ${data.get('totalRevenue', 0):,.2f}\n"
-                        formatted += f"📈 Win Rate: {data.get('winRate', 0):.1f}%"
-                    else:
-                        # Fallback to JSON for other responses
-                        formatted = json.dumps(data, indent=2, ensure_ascii=False)
-                        formatted = f"✅ Success!\n\n```json\n{formatted}\n```"
-                    
-                    return [TextContent(type="text", text=formatted)]
+            response = await self.backend.request(
+                method,
+                endpoint,
+                jwt=jwt,
+                params=args if method == "GET" else None,
+                json=args if method in ("POST", "PATCH") else None,
+            )
+
+            if response.status_code in [200, 201]:
+                data = response.json()
+                
+                # Format based on endpoint for better readability
+                if "/contacts" in endpoint and isinstance(data, list):
+                    formatted = self.format_contacts(data)
+                elif "/deals" in endpoint and isinstance(data, list):
+                    formatted = self.format_deals(data)
+                elif "/leads" in endpoint and isinstance(data, list):
+                    formatted = self.format_leads(data)
+                elif "/tickets" in endpoint and isinstance(data, list):
+                    formatted = self.format_tickets(data)
+                elif "/contacts" in endpoint and isinstance(data, dict):
+                    # Single contact created/updated
+                    formatted = f"✅ **Contact saved:** {data.get('firstName', '')} {data.get('lastName', '')}\n"
+                    formatted += f"📧 {data.get('email', 'No email')}\n"
+                    formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
+                elif "/deals" in endpoint and isinstance(data, dict):
+                    # Single deal created/updated
+                    formatted = f"✅ **Deal saved:** {data.get('title', 'Untitled')}\n"
+                    formatted += f"💰 Value: ${float(data.get('value', 0)):,.2f}\n"
+                    formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
+                elif "/leads" in endpoint and isinstance(data, dict):
+                    # Single lead created/updated
+                    formatted = f"✅ **Lead saved:** {data.get('title', 'Untitled')}\n"
+                    formatted += f"📌 Status: {data.get('status', 'N/A')}\n"
+                    formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
+                elif "/tickets" in endpoint and isinstance(data, dict):
+                    # Single ticket created/updated
+                    formatted = f"✅ **Ticket saved:** {data.get('title', 'Untitled')}\n"
+                    formatted += f"📌 Status: {data.get('status', 'N/A')} | Priority: {data.get('priority', 'MEDIUM')}\n"
+                    formatted += f"🆔 ID: `{data.get('id', 'N/A')}`"
+                elif "/analytics" in endpoint:
+                    # Analytics dashboard
+                    formatted = "📊 **Dashboard Analytics:**\n\n"
+                    formatted += f"👥 Total Contacts: {data.get('totalContacts', 0)}\n"
+                    formatted += f"🎯 Total Leads: {data.get('totalLeads', 0)}\n"
+                    formatted += f"💼 Total Deals: {data.get('totalDeals', 0)}\n"
+                    formatted += f"🎫 Total Tickets: {data.get('totalTickets', 0)}\n\n"
+                    formatted += f"💰 Total Revenue: ${data.get('totalRevenue', 0):,.2f}\n"
+                    formatted += f"📈 Win Rate: {data.get('winRate', 0):.1f}%"
                 else:
-                    error = response.json().get("message", "Request failed")
-                    return [TextContent(type="text", text=f"❌ Error {response.status_code}: {error}")]
+                    # Fallback to JSON for other responses
+                    formatted = json.dumps(data, indent=2, ensure_ascii=False)
+                    formatted = f"✅ Success!\n\n```json\n{formatted}\n```"
+                
+                return [TextContent(type="text", text=formatted)]
+            else:
+                error = response.json().get("message", "Request failed")
+                return [TextContent(type="text", text=f"❌ Error {response.status_code}: {error}")]
 
-            except Exception as e:
-                logger.error(f"API call error: {e}", exc_info=True)
-                return [TextContent(type="text", text=f"❌ API Error: {str(e)}")]
+        except Exception as e:
+            logger.error(f"API call error: {e}", exc_info=True)
+            return [TextContent(type="text", text=f"❌ API Error: {str(e)}")]
 
     async def run(self):
         """Run the MCP server"""
-        async with stdio_server() as (read_stream, write_stream):
-            logger.info(f"🚀 Starting Synapse CRM MCP Server (Streamlined)")
-            logger.info(f"🔗 Backend: {BACKEND_URL}")
-            logger.info(f"📦 Tools: 25 essential CRM operations")
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="synapse-crm",
-                    server_version="2.0.0-streamlined",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
+        await self.backend.open()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                logger.info(f"🚀 Starting Synapse CRM MCP Server (Streamlined)")
+                logger.info(f"🔗 Backend: {BACKEND_URL}")
+                logger.info(f"📦 Tools: 25 essential CRM operations")
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="synapse-crm",
+                        server_version="2.0.0-streamlined",
+                        capabilities=self.server.get_capabilities(
+                            notification_options=NotificationOptions(),
+                            experimental_capabilities={},
+                        ),
                     ),
-                ),
-            )
+                )
+        finally:
+            await self.backend.close()
 
 
 async def main():
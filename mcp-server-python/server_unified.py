@@ -8,49 +8,79 @@ Features:
 - Strict system prompt for CRM-only scope
 - RBAC enforcement (ADMIN vs MEMBER)
 - One command starts both transports
+- Optional multi-worker HTTP (MCP_HTTP_WORKERS) with shared cache state
 
 Usage:
     python server_unified.py
+    MCP_TRANSPORT=http MCP_HTTP_WORKERS=4 python server_unified.py
 """
 
 import asyncio
 import os
+import time
+import socket
 import logging
 import json
-from typing import Any, Optional, Dict
-from datetime import datetime, timedelta
-from pathlib import Path
+import multiprocessing
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Optional, Dict, List, Set, Tuple
 from dotenv import load_dotenv
 
-import httpx
 from mcp.server.models import InitializationOptions
 from mcp.server import NotificationOptions, Server
 from mcp.server.stdio import stdio_server
 from mcp.types import Tool, TextContent
 
 # FastAPI for HTTP transport
-from fastapi import FastAPI, Header, HTTPException, Request
+from fastapi import FastAPI, Header, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel
 import uvicorn
 
-# Import our modules
-from system_prompt import STRICT_SYSTEM_PROMPT
-from cache import save_session, load_session, delete_session, is_session_expired
-
-# Load environment variables
+# Load environment variables (before local modules read their settings)
 load_dotenv()
 
+# Import our modules
+from cache import save_session, load_session, delete_session
+from backend_client import BackendClient
+from tool_registry import TOOL_REGISTRY, TOOLS, TOOLS_JSON, TOOLS_ETAG, ToolSpec
+from response_cache import ResponseCache, session_subject
+from session_claims import get_claims_cache, session_claims
+from coalescing import RequestCoalescer
+from batch import BatchError, run_batch
+from streaming import JsonArrayStreamParser, frame_records, iter_array, NDJSON_MEDIA_TYPE, SSE_MEDIA_TYPE
+from pagination import PaginationError, paginate, split_page_args
+from shared_state import get_state_backend
+from structured_logging import configure_logging, log_event
+from result_shaper import ResultShaper
+from entity_index import EntityIndex
+from pipeline_cache import VALIDATED_TOOLS, PipelineMetadataCache, PipelineTree
+from contact_search import ContactSearch
+from serialization import RawJson, dumps, dumps_bytes, loads, to_text
+from resilience import STATE_VALUES
+from rate_limit import Admission, RateLimited, RateLimiter
+from rbac import rbac
+from transcripts import TranscriptRecorder
+from metrics import REGISTRY, CONTENT_TYPE, METRICS_ENABLED, CallbackCounter, Gauge, track_tool_call, record_backend_call
+
 # Configuration
 BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:3001")
 BACKEND_API = f"{BACKEND_URL}{os.getenv('BACKEND_API_PREFIX', '/api')}"
 HTTP_PORT = int(os.getenv("MCP_HTTP_PORT", "5000"))
+HTTP_HOST = os.getenv("MCP_HTTP_HOST", "0.0.0.0")
+
+# Transports: both (default), http or stdio
+TRANSPORTS = ("both", "http", "stdio")
+MCP_TRANSPORT = os.getenv("MCP_TRANSPORT", "both").strip().lower()
+# HTTP worker processes (>1 runs uvicorn's multi-process supervisor)
+HTTP_WORKERS = max(1, int(os.getenv("MCP_HTTP_WORKERS", "1")))
+# SO_REUSEPORT: several independent server processes may bind the same port
+HTTP_REUSE_PORT = os.getenv("MCP_HTTP_REUSE_PORT", "false").lower() in ("1", "true", "yes", "on")
 
 # Setup logging
-logging.basicConfig(
-    level=getattr(logging, os.getenv("LOG_LEVEL", "INFO")),
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
+configure_logging("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 logger = logging.getLogger("synapse-mcp")
 
 
@@ -67,6 +97,11 @@ class ToolResponse(BaseModel):
     result: list
 
 
+class BatchToolCallRequest(BaseModel):
+    """HTTP request model for running several tools in one round trip"""
+    calls: List[ToolCallRequest]
+
+
 # ==================== UNIFIED MCP SERVER ====================
 
 class UnifiedMCPServer:
@@ -82,11 +117,49 @@ class UnifiedMCPServer:
         # MCP Server for stdio transport
         self.server = Server("synapse-crm")
         
+        # Shared connection pool to the backend (one per server instance)
+        self.backend = BackendClient.from_env(BACKEND_API)
+        
+        # Read-through cache for list tools (per session subject)
+        self.response_cache = ResponseCache.from_env()
+        
+        # Compact, budgeted rendering of list results for the model
+        self.result_shaper = ResultShaper.from_env()
+        
+        # Per-tenant name -> ID index fed by contact/pipeline/stage results
+        self.entity_index = EntityIndex.from_env()
+        
+        # Pipeline -> stages tree per tenant (prefetched, validates IDs before writes)
+        self.pipeline_cache = PipelineMetadataCache.from_env()
+        self._prefetch_tasks: Set[asyncio.Task] = set()
+        
+        # Optional local fuzzy contacts_search (MCP_CONTACT_SEARCH=local)
+        self.contact_search = ContactSearch.from_env()
+        
+        # Local views kept current from backend results (tracks() + observe())
+        self.result_observers = (self.entity_index, self.pipeline_cache, self.contact_search)
+        
+        # Singleflight for identical concurrent reads
+        self.coalescer = RequestCoalescer(
+            enabled=os.getenv("MCP_COALESCE_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+        )
+        
+        # Per-tenant/per-user token buckets and in-flight caps (HTTP only)
+        self.rate_limiter = RateLimiter.from_env()
+        
+        # Anonymized tool-call transcripts for load replay (MCP_TRANSCRIPT_PATH)
+        self.transcripts = TranscriptRecorder.from_env()
+        
+        # Refuse calls the session role may not make before any backend request
+        self.rbac_enabled = os.getenv("MCP_RBAC_ENABLED", "true").lower() in ("1", "true", "yes", "on")
+        self.rbac_denied: Dict[Tuple[str, str], int] = {}
+        
         # FastAPI for HTTP transport
         self.http_app = FastAPI(
             title="Synapse MCP Server",
             description="Unified MCP Server with dual transport",
-            version="3.0.0"
+            version="3.0.0",
+            lifespan=self.http_lifespan,
         )
         
         # Add CORS for web clients
@@ -101,467 +174,23 @@ class UnifiedMCPServer:
         # Setup handlers
         self.setup_mcp_handlers()
         self.setup_http_endpoints()
+        self.setup_metrics()
+    
+    @asynccontextmanager
+    async def http_lifespan(self, app: FastAPI):
+        """Open the backend pool on HTTP startup, release it on shutdown"""
+        await self.backend.open()
+        try:
+            yield
+        finally:
+            await self.backend.close()
+            self.transcripts.close()
     
     # ==================== TOOL DEFINITIONS ====================
     
     def get_tool_list(self) -> list[Tool]:
-        """Get list of all 25 CRM tools"""
-        return [
-            # AUTH (3)
-            Tool(
-                name="login",
-                description="Login with email and password (CLI only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "email": {"type": "string", "format": "email"},
-                        "password": {"type": "string"},
-                    },
-                    "required": ["email", "password"],
-                },
-            ),
-            Tool(
-                name="logout",
-                description="Logout and clear session",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="whoami",
-                description="Show current user info",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            # CONTACTS (5)
-            Tool(
-                name="contacts_list",
-                description="List all contacts",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="contacts_create",
-                description="Create new contact. Only firstName is required, all other fields are optional.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "firstName": {"type": "string", "description": "REQUIRED: First name"},
-                        "lastName": {"type": "string", "description": "Optional: Last name"},
-                        "email": {"type": "string", "description": "Optional: Email address"},
-                        "phone": {"type": "string", "description": "Optional: Phone number"},
-                        "company": {"type": "string", "description": "Optional: Company name"},
-                        "jobTitle": {"type": "string", "description": "Optional: Job title"},
-                        "notes": {"type": "string", "description": "Optional: Additional notes"},
-                    },
-                    "required": ["firstName"],
-                },
-            ),
-            Tool(
-                name="contacts_get",
-                description="Get contact by ID",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"contactId": {"type": "string"}},
-                    "required": ["contactId"],
-                },
-            ),
-            Tool(
-                name="contacts_update",
-                description="Update contact",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "contactId": {"type": "string"},
-                        "firstName": {"type": "string"},
-                        "lastName": {"type": "string"},
-                        "email": {"type": "string"},
-                        "phone": {"type": "string"},
-                    },
-                    "required": ["contactId"],
-                },
-            ),
-            Tool(
-                name="contacts_delete",
-                description="Delete contact (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"contactId": {"type": "string"}},
-                    "required": ["contactId"],
-                },
-            ),
-            # DEALS (5)
-            Tool(
-                name="deals_list",
-                description="List all deals",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="deals_create",
-                description="Create new deal. MUST provide pipelineId and stageId - use pipelines_list and stages_list tools first to get valid IDs.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string", "description": "REQUIRED: Deal title"},
-                        "contactId": {"type": "string", "description": "REQUIRED: Associated contact ID"},
-                        "pipelineId": {"type": "string", "description": "REQUIRED: Pipeline ID (use pipelines_list)"},
-                        "stageId": {"type": "string", "description": "REQUIRED: Initial stage ID (use stages_list)"},
-                        "value": {"type": "number", "description": "Optional: Deal value in dollars"},
-                        "probability": {"type": "number", "description": "Optional: Win probability (0-100)"},
-                        "notes": {"type": "string", "description": "Optional: Additional notes"},
-                    },
-                    "required": ["title", "contactId", "pipelineId", "stageId"],
-                },
-            ),
-            Tool(
-                name="deals_get",
-                description="Get deal by ID",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"dealId": {"type": "string"}},
-                    "required": ["dealId"],
-                },
-            ),
-            Tool(
-                name="deals_update",
-                description="Update deal",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "dealId": {"type": "string"},
-                        "title": {"type": "string"},
-                        "value": {"type": "number"},
-                    },
-                    "required": ["dealId"],
-                },
-            ),
-            Tool(
-                name="deals_delete",
-                description="Delete deal (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"dealId": {"type": "string"}},
-                    "required": ["dealId"],
-                },
-            ),
-            # LEADS (5)
-            Tool(
-                name="leads_list",
-                description="List leads",
-               inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="leads_create",
-                description="Create new lead. MUST provide contactId, title, and source. Get contactId from contacts_list or contacts_search first.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "contactId": {"type": "string", "description": "REQUIRED: ID of contact to associate with this lead. Use contacts_list to get contact IDs."},
-                        "title": {"type": "string", "description": "REQUIRED: Lead title/name (min 2 chars, max 200)"},
-                        "source": {"type": "string", "description": "REQUIRED: Lead source (e.g., 'Cold Call', 'Website', 'Referral')"},
-                        "value": {"type": "number", "description": "Optional: Estimated deal value in dollars"},
-                        "notes": {"type": "string", "description": "Optional: Additional notes"},
-                    },
-                    "required": ["contactId", "title", "source"],
-                },
-            ),
-            Tool(
-                name="leads_update",
-                description="Update lead details like status, source, or value.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "leadId": {"type": "string", "description": "REQUIRED: Lead ID to update"},
-                        "title": {"type": "string", "description": "Optional: Lead title"},
-                        "contactId": {"type": "string", "description": "Optional: Associated contact ID"},
-                        "status": {"type": "string", "description": "Optional: Status (NEW, CONTACTED, QUALIFIED, UNQUALIFIED, CONVERTED)"},
-                        "source": {"type": "string", "description": "Optional: Lead source"},
-                        "value": {"type": "number", "description": "Optional: Estimated value in dollars"},
-                        "notes": {"type": "string", "description": "Optional: Additional notes"},
-                    },
-                    "required": ["leadId"],
-                },
-            ),
-            Tool(
-                name="leads_convert",
-                description="Convert lead to deal. Deal will inherit title and value from the lead. MUST provide pipelineId and stageId.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "leadId": {"type": "string", "description": "REQUIRED: Lead ID to convert"},
-                        "pipelineId": {"type": "string", "description": "REQUIRED: Pipeline ID (use pipelines_list)"},
-                        "stageId": {"type": "string", "description": "REQUIRED: Initial stage ID (use stages_list)"},
-                        "probability": {"type": "number", "description": "Optional: Win probability (0-100)"},
-                        "expectedCloseDate": {"type": "string", "description": "Optional: Expected close date (ISO format)"},
-                    },
-                    "required": ["leadId", "pipelineId", "stageId"],
-                },
-            ),
-            Tool(
-                name="leads_delete",
-                description="Delete lead (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"leadId": {"type": "string"}},
-                    "required": ["leadId"],
-                },
-            ),
-            # TICKETS (5)
-            Tool(
-                name="tickets_list",
-                description="List tickets",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="tickets_create",
-                description="Create ticket. Requires title, priority, source, and contactId.",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string", "description": "REQUIRED: Ticket title (min 5 characters)"},
-                        "priority": {"type": "string", "enum": ["LOW", "MEDIUM", "HIGH", "URGENT"], "description": "REQUIRED: Priority level"},
-                        "source": {"type": "string", "enum": ["EMAIL", "PHONE", "CHAT", "PORTAL", "WEB_FORM", "SOCIAL_MEDIA", "OTHER"], "description": "REQUIRED: Ticket source"},
-                        "contactId": {"type": "string", "description": "REQUIRED: Associated contact ID"},
-                        "description": {"type": "string", "description": "Optional: Ticket description"},
-                        "dealId": {"type": "string", "description": "Optional: Associated deal ID"},
-                        "assignedUserId": {"type": "string", "description": "Optional: User ID to assign to"},
-                    },
-                    "required": ["title", "priority", "source", "contactId"],
-                },
-            ),
-            Tool(
-                name="tickets_get",
-                description="Get ticket by ID",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"ticketId": {"type": "string"}},
-                    "required": ["ticketId"],
-                },
-            ),
-            Tool(
-                name="tickets_update",
-                description="Update ticket",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "ticketId": {"type": "string"},
-                        "status": {"type": "string"},
-                    },
-                    "required": ["ticketId"],
-                },
-            ),
-            Tool(
-                name="tickets_delete",
-                description="Delete ticket (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"ticketId": {"type": "string"}},
-                    "required": ["ticketId"],
-                },
-            ),
-            # ANALYTICS (2 - only verified working endpoints)
-            Tool(
-                name="analytics_dashboard",
-                description="Get analytics dashboard data",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="analytics_revenue",
-                description="Get revenue forecast analytics",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            # CONTACTS - Additional (1)
-            Tool(
-                name="contacts_search",
-                description="Search contacts by query",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"query": {"type": "string"}},
-                    "required": ["query"],
-                },
-            ),
-            # DEALS - Additional (1)
-            Tool(
-                name="deals_move",
-                description="Move deal to different stage",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "dealId": {"type": "string"},
-                        "stageId": {"type": "string"},
-                    },
-                    "required": ["dealId", "stageId"],
-                },
-            ),
-            # TICKETS - Additional (2)
-            Tool(
-                name="tickets_comment",
-                description="Add comment to ticket",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "ticketId": {"type": "string"},
-                        "comment": {"type": "string"},
-                    },
-                    "required": ["ticketId", "comment"],
-                },
-            ),
-            Tool(
-                name="tickets_assign",
-                description="Assign ticket to user",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "ticketId": {"type": "string"},
-                        "userId": {"type": "string"},
-                    },
-                    "required": ["ticketId", "userId"],
-                },
-            ),
-            # USERS (5 - ADMIN ONLY)
-            Tool(
-                name="users_list",
-                description="List all workspace users (ADMIN only)",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="users_get",
-                description="Get user by ID (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"userId": {"type": "string"}},
-                    "required": ["userId"],
-                },
-            ),
-            Tool(
-                name="users_invite",
-                description="Invite new user to workspace (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "email": {"type": "string", "format": "email"},
-                        "role": {"type": "string", "enum": ["ADMIN", "MEMBER"]},
-                    },
-                    "required": ["email", "role"],
-                },
-            ),
-            Tool(
-                name="users_update_role",
-                description="Update user role (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "userId": {"type": "string"},
-                        "role": {"type": "string", "enum": ["ADMIN", "MEMBER"]},
-                    },
-                    "required": ["userId", "role"],
-                },
-            ),
-            Tool(
-                name="users_deactivate",
-                description="Deactivate user (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"userId": {"type": "string"}},
-                    "required": ["userId"],
-                },
-            ),
-            # PIPELINES (4)
-            Tool(
-                name="pipelines_list",
-                description="List all pipelines",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="pipelines_create",
-                description="Create pipeline (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "name": {"type": "string"},
-                        "description": {"type": "string"},
-                    },
-                    "required": ["name"],
-                },
-            ),
-            Tool(
-                name="pipelines_update",
-                description="Update pipeline (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pipelineId": {"type": "string"},
-                        "name": {"type": "string"},
-                        "description": {"type": "string"},
-                    },
-                    "required": ["pipelineId"],
-                },
-            ),
-            Tool(
-                name="pipelines_delete",
-                description="Delete pipeline (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"pipelineId": {"type": "string"}},
-                    "required": ["pipelineId"],
-                },
-            ),
-            # STAGES (3)
-            Tool(
-                name="stages_list",
-                description="List stages in pipeline",
-                inputSchema={
-                    "type": "object",
-                    "properties": {"pipelineId": {"type": "string"}},
-                    "required": ["pipelineId"],
-                },
-            ),
-            Tool(
-                name="stages_create",
-                description="Create stage in pipeline (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "pipelineId": {"type": "string"},
-                        "name": {"type": "string"},
-                        "order": {"type": "number"},
-                    },
-                    "required": ["pipelineId", "name"],
-                },
-            ),
-            Tool(
-                name="stages_update",
-                description="Update stage (ADMIN only)",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "stageId": {"type": "string"},
-                        "name": {"type": "string"},
-                        "order": {"type": "number"},
-                    },
-                    "required": ["stageId"],
-                },
-            ),
-            # PORTAL (3 - only working endpoints)
-            Tool(
-                name="portal_customers_list",
-                description="List portal customers",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="portal_tickets_list",
-                description="List customer portal tickets",
-                inputSchema={"type": "object", "properties": {}},
-            ),
-            Tool(
-                name="portal_tickets_create",
-                description="Create ticket from portal",
-                inputSchema={
-                    "type": "object",
-                    "properties": {
-                        "title": {"type": "string"},
-                        "description": {"type": "string"},
-                    },
-                    "required": ["title"],
-                },
-            ),
-        ]
+        """Get list of all CRM tools (prebuilt in tool_registry)"""
+        return list(TOOLS)
     
     # ==================== SESSION & AUTH ====================
     
@@ -573,25 +202,31 @@ class UnifiedMCPServer:
         3. Saved session file (CLI - logged in interactively)
         
         Priority: JWT from arguments > file-based session
-        No RBAC checks - backend SupabaseAuthGuard handles all authorization
+        Token claims (tenant/user/role) come from the claims cache; with
+        MCP_JWT_SECRET/MCP_JWT_JWKS_FILE, tokens failing verification are
+        rejected here instead of by the backend.
         """
         # Mode 1: JWT token provided (Web/Android/Telegram) - PRIORITY
         if "jwt" in arguments:
             jwt = arguments["jwt"]
+            claims = session_claims(jwt)
             
-            # Check if it's a Telegram pseudo-JWT (format: telegram:userId:tenantId)
-            if jwt.startswith("telegram:"):
-                # Telegram bot - extract userId and tenantId
-                # Backend will validate user exists and has access
-                logger.info(f"Telegram session detected: {jwt}")
-                return {"jwt": jwt}
+            if not claims.valid:
+                log_event(logger, "jwt_rejected", logging.WARNING, error=claims.error)
+                return None
             
-            # Regular Supabase JWT (web/Android)
-            return {"jwt": jwt}
+            # Telegram pseudo-JWT (telegram:userId:tenantId) - backend validates the user
+            if claims.kind == "telegram":
+                log_event(logger, "telegram_session", logging.DEBUG)
+            
+            session = {"jwt": jwt}
+            if claims.kind != "opaque":
+                session.update(userId=claims.user, tenantId=claims.tenant, role=claims.role)
+            return session
         
-        # Mode 2: Saved session (CLI) - FALLBACK
+        # Mode 2: Saved session (CLI) - FALLBACK (in memory, expiry precomputed)
         session = load_session()
-        if session and not is_session_expired(session):
+        if session:
             return session
         
         return None
@@ -601,44 +236,43 @@ class UnifiedMCPServer:
         email = args.get("email")
         password = args.get("password")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{BACKEND_API}/auth/signin",
-                    json={"email": email, "password": password},
-                    timeout=30.0,
-                )
-                
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    session_data = data.get("session", {})
-                    user_info = data.get("dbUser", {})
-                    
-                    jwt = session_data.get("access_token")
-                    
-                    if jwt:
-                        # Save session for CLI
-                        save_session({
-                            "email": email,
-                            "jwt": jwt,
-                            "userId": user_info.get("id"),
-                            "role": user_info.get("role", "MEMBER"),
-                            "tenantId": user_info.get("tenantId"),
-                        })
-                        
-                        return [TextContent(
-                            type="text",
-                            text=f"✅ Logged in as {email}\n"
-                                 f"Role: {user_info.get('role', 'MEMBER')}\n"
-                                 f"Session saved! You can now use CRM tools."
-                        )]
+        try:
+            response = await self.backend.request(
+                "POST",
+                "/auth/signin",
+                json={"email": email, "password": password},
+            )
+            
+            if response.status_code in [200, 201]:
+                data = response.json()
+                session_data = data.get("session", {})
+                user_info = data.get("dbUser", {})
                 
-                error = response.json().get("message", "Login failed")
-                return [TextContent(type="text", text=f"❌ {error}")]
+                jwt = session_data.get("access_token")
                 
-            except Exception as e:
-                logger.error(f"Login error: {e}")
-                return [TextContent(type="text", text=f"❌ Login error: {str(e)}")]
+                if jwt:
+                    # Save session for CLI
+                    save_session({
+                        "email": email,
+                        "jwt": jwt,
+                        "userId": user_info.get("id"),
+                        "role": user_info.get("role", "MEMBER"),
+                        "tenantId": user_info.get("tenantId"),
+                    })
+                    
+                    return [TextContent(
+                        type="text",
+                        text=f"✅ Logged in as {email}\n"
+                             f"Role: {user_info.get('role', 'MEMBER')}\n"
+                             f"Session saved! You can now use CRM tools."
+                    )]
+            
+            error = response.json().get("message", "Login failed")
+            return [TextContent(type="text", text=f"❌ {error}")]
+            
+        except Exception as e:
+            logger.error(f"Login error: {e}")
+            return [TextContent(type="text", text=f"❌ Login error: {str(e)}")]
     
     async def logout(self) -> list[TextContent]:
         """Logout and clear session"""
@@ -659,8 +293,70 @@ class UnifiedMCPServer:
     
     # ==================== TOOL EXECUTION ====================
     
-    async def execute_tool(self, name: str, arguments: dict) -> list[TextContent]:
-        """Execute tool with backend communication (no RBAC - backend handles authorization)"""
+    async def execute_tool(self, name: str, arguments: dict, transport: str = "stdio") -> list[TextContent]:
+        """Execute a tool and record its count, latency and outcome"""
+        started, clock = time.time(), time.perf_counter()
+        with track_tool_call(name if name in TOOL_REGISTRY else "unknown", transport) as call:
+            result = await self.dispatch_tool(name, arguments)
+            if result and result[0].text.startswith("❌"):
+                call.outcome = "error"
+        self.record_transcript(
+            name, arguments, transport, started, time.perf_counter() - clock,
+            ok=call.outcome != "error", result_bytes=sum(len(r.text) for r in result),
+        )
+        return result
+    
+    async def execute_stream(self, spec: ToolSpec, arguments: dict, session: Dict[str, Any], sse: bool) -> AsyncIterator[bytes]:
+        """Framed records of a streamed *_list call, counted like execute_tool"""
+        started, clock = time.time(), time.perf_counter()
+        sent = 0
+        with track_tool_call(spec.name, "http") as call:
+            async def records() -> AsyncIterator[Any]:
+                try:
+                    async for record in self.stream_records(spec, arguments, session.get("jwt")):
+                        yield record
+                except Exception:
+                    call.outcome = "error"  # frame_records turns it into an error event
+                    raise
+            
+            try:
+                async for chunk in frame_records(records(), sse=sse):
+                    sent += len(chunk)
+                    yield chunk
+            finally:
+                self.record_transcript(
+                    spec.name, arguments, "http", started, time.perf_counter() - clock,
+                    ok=call.outcome != "error", result_bytes=sent,
+                )
+    
+    def record_transcript(
+        self,
+        name: str,
+        arguments: dict,
+        transport: str,
+        started: float,
+        duration: float,
+        ok: bool,
+        result_bytes: int,
+    ) -> None:
+        """Append one call to the transcript (no-op unless MCP_TRANSCRIPT_PATH is set)"""
+        if not self.transcripts.enabled:
+            return
+        spec = TOOL_REGISTRY.get(name)
+        self.transcripts.record(
+            session_subject(arguments["jwt"]) if arguments.get("jwt") else "cli",
+            name,
+            arguments,
+            transport,
+            started,
+            duration,
+            ok=ok,
+            result_bytes=result_bytes,
+            schema=spec.input_schema if spec else None,
+        )
+    
+    async def dispatch_tool(self, name: str, arguments: dict) -> list[TextContent]:
+        """Execute tool with backend communication (local RBAC first, backend stays authoritative)"""
         
         # 1. Handle auth tools (no session needed, CLI only)
         if name == "login":
@@ -678,10 +374,66 @@ class UnifiedMCPServer:
                 text="❌ Not authenticated. Please login first or provide valid JWT."
             )]
         
-        # 3. Call backend API directly (backend SupabaseAuthGuard handles authorization)
+        # 3. Role check from the session claims (no network)
+        denial = self.rbac_denial(session, name)
+        if denial:
+            return [TextContent(type="text", text=f"❌ {denial}")]
+        
+        # Warm the pipeline/stage tree the first time this session is seen
+        self.prefetch_pipelines(session.get("jwt"))
+        
+        # 4. Batch of tools sharing this session
+        if name == "batch_call":
+            try:
+                result = await self.execute_batch(arguments.get("calls", []), session)
+            except BatchError as e:
+                return [TextContent(type="text", text=f"❌ {e}")]
+            return [TextContent(type="text", text=dumps(result))]
+        
+        # 5. Local name -> ID lookup
         jwt = session.get("jwt")
+        if name == "resolve":
+            ok, payload = await self.resolve_entity(arguments, jwt)
+            return [TextContent(type="text", text=dumps(payload) if ok else f"❌ {payload}")]
+        
+        # 6. Call backend API directly (backend SupabaseAuthGuard handles authorization)
         return await self.call_backend(name, arguments, jwt)
     
+    def rbac_denial(self, session: Dict[str, Any], name: str) -> Optional[str]:
+        """
+        Reason the session's role may not call `name`, or None
+        
+        Only registered tools are checked (unknown names keep their usual
+        error) and sessions without a recognized role are left to the backend.
+        """
+        if not self.rbac_enabled or name not in TOOL_REGISTRY:
+            return None
+        role = session.get("role")
+        denial = rbac.denial(role, name)
+        if denial:
+            key = (role.upper(), name)
+            self.rbac_denied[key] = self.rbac_denied.get(key, 0) + 1
+            log_event(logger, "rbac_denied", logging.INFO, tool=name, role=key[0])
+        return denial
+    
+    async def execute_batch(self, calls: List[Dict[str, Any]], session: Dict[str, Any]) -> Dict[str, Any]:
+        """Run an ordered list of backend tool calls with one session"""
+        jwt = session.get("jwt")
+        
+        async def execute_step(tool_name: str, arguments: Dict[str, Any]) -> Tuple[bool, Any]:
+            denial = self.rbac_denial(session, tool_name)
+            if denial:
+                return False, denial
+            if tool_name == "resolve":
+                return await self.resolve_entity(arguments, jwt)
+            return await self.invoke_backend(tool_name, arguments, jwt)
+        
+        def is_read(tool_name: str) -> bool:
+            spec = TOOL_REGISTRY.get(tool_name)
+            return spec is not None and spec.is_read
+        
+        return await run_batch(calls, execute_step, is_read)
+    
     def format_natural_language(self, tool_name: str, data: any) -> str:
         """Convert JSON response to natural language"""
         
@@ -747,110 +499,338 @@ class UnifiedMCPServer:
         
         return str(data)
     
+    # ==================== PIPELINE METADATA ====================
+    
+    def prefetch_pipelines(self, jwt: Optional[str]) -> None:
+        """Load the pipeline tree in the background for a newly seen session"""
+        if not jwt or not self.pipeline_cache.should_prefetch(session_subject(jwt)):
+            return
+        task = asyncio.create_task(self.load_pipeline_tree(jwt))
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+    
+    async def load_pipeline_tree(self, jwt: str) -> Optional[PipelineTree]:
+        """Fetch pipelines_list (coalesced with any in-flight prefetch) and return the tree"""
+        # One-row page keeps the result small; the full list feeds the tree
+        ok, _ = await self.invoke_backend("pipelines_list", {"limit": 1}, jwt)
+        if not ok:
+            logger.debug("⚠️  Pipeline prefetch failed - IDs are not validated locally")
+        return self.pipeline_cache.get(session_subject(jwt))
+    
+    async def check_pipeline_args(self, tool_name: str, args: dict, jwt: str) -> Optional[str]:
+        """
+        Validate pipelineId/stageId of a write against the tenant tree
+        
+        Returns:
+            Error message with the valid IDs, or None to forward the call
+        """
+        if not self.pipeline_cache.enabled or tool_name not in VALIDATED_TOOLS:
+            return None
+        subject = session_subject(jwt)
+        tree = self.pipeline_cache.get(subject)
+        fresh = tree is None
+        if tree is None:
+            tree = await self.load_pipeline_tree(jwt)
+            if tree is None:
+                return None
+        error = self.pipeline_cache.validate(tree, tool_name, args)
+        if error and not fresh:
+            # The tree may predate a change made elsewhere - reload once before rejecting
+            self.pipeline_cache.invalidate(subject)
+            self.response_cache.invalidate_families(subject, ("pipelines", "stages"))
+            tree = await self.load_pipeline_tree(jwt)
+            error = self.pipeline_cache.validate(tree, tool_name, args) if tree else None
+        if error:
+            self.pipeline_cache.rejected += 1
+        return error
+    
+    async def search_contacts_locally(self, args: dict, jwt: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Answer contacts_search from the local trigram index
+        
+        Loads the tenant's full contacts_list first when it is not indexed
+        (or older than MCP_CONTACT_SEARCH_TTL).
+        
+        Returns:
+            Ranked contacts, or None to fall back to the backend search
+        """
+        subject = session_subject(jwt)
+        if self.contact_search.should_load(subject):
+            await self.invoke_backend("contacts_list", {"limit": 1}, jwt)
+        return self.contact_search.search(subject, str(args.get("query") or ""))
+    
+    # ==================== RESOLVE ====================
+    
+    async def resolve_entity(self, args: dict, jwt: str) -> Tuple[bool, Any]:
+        """
+        Resolve a contact/company/pipeline/stage name to IDs
+        
+        Answers from the tenant's entity index; on a miss (including one
+        against a fully loaded kind - the record may have been created
+        elsewhere) the index is refreshed with one backend lookup
+        (contacts_search, stages_list or pipelines_list) and consulted
+        again. Contact misses also go through contacts_search, which is
+        answered locally (typo tolerant) when MCP_CONTACT_SEARCH=local.
+        
+        Returns:
+            (True, [{"id", "type", "name", "match", ...}]) or (False, error message)
+        """
+        kind = args.get("type")
+        query = str(args.get("query") or "").strip()
+        pipeline_id = args.get("pipelineId")
+        if kind not in ("contact", "company", "pipeline", "stage"):
+            return False, "type must be one of contact, company, pipeline, stage"
+        if not query:
+            return False, "query is required"
+        
+        subject = session_subject(jwt)
+        matches = self.entity_index.resolve(subject, kind, query, pipeline_id)
+        if matches:
+            return True, matches
+        
+        # Miss - refresh from the backend once
+        if kind in ("contact", "company"):
+            ok, found = await self.invoke_backend("contacts_search", {"query": query}, jwt)
+        elif kind == "stage" and pipeline_id:
+            ok, found = await self.invoke_backend("stages_list", {"pipelineId": pipeline_id, "limit": 1}, jwt)
+        else:
+            ok, found = await self.invoke_backend("pipelines_list", {"limit": 1}, jwt)
+        if not ok:
+            return False, found
+        
+        matches = self.entity_index.resolve(subject, kind, query, pipeline_id)
+        if not matches and kind in ("contact", "company") and isinstance(found, list):
+            # The search matched on something the index does not key (phone, typos)
+            matches = [
+                {
+                    "id": contact.get("id"),
+                    "type": "contact",
+                    "name": f"{contact.get('firstName') or ''} {contact.get('lastName') or ''}".strip(),
+                    "match": "search",
+                    "email": contact.get("email"),
+                    "company": contact.get("company"),
+                }
+                for contact in found[:10] if isinstance(contact, dict)
+            ]
+        return True, matches
+    
     async def call_backend(self, tool_name: str, args: dict, jwt: str) -> list[TextContent]:
         """Call backend API for tool execution"""
+        shaped = self.result_shaper.shapes(tool_name)
+        ok, payload = await self.invoke_backend(tool_name, args, jwt, raw=not shaped)
+        if ok:
+            # Lists: projected rows within the token budget (cursor for the rest)
+            if shaped:
+                return [TextContent(type="text", text=self.result_shaper.render(tool_name, payload, args))]
+            # Return raw JSON - Gemini will format it nicely for users
+            # while still having access to IDs for internal use
+            # (compact; unshaped backend bodies are forwarded without re-encoding)
+            return [TextContent(type="text", text=to_text(payload))]
+        return [TextContent(type="text", text=f"❌ {payload}")]
+    
+    async def invoke_backend(self, tool_name: str, args: dict, jwt: str, raw: bool = False) -> Tuple[bool, Any]:
+        """
+        Run one backend tool and return structured data
+        
+        Args:
+            raw: Return the backend body as RawJson when no shaping is needed
+        
+        Returns:
+            (True, parsed JSON or RawJson) on success, (False, error message) otherwise
+        """
         # Remove jwt from args if present
         args = {k: v for k, v in args.items() if k != "jwt"}
         
-        # Map tool names to backend endpoints
-        endpoint_map = {
-            # Contacts (6)
-            "contacts_list": ("GET", "/contacts"),
-            "contacts_create": ("POST", "/contacts"),
-            "contacts_get": ("GET", "/contacts/{contactId}"),
-            "contacts_update": ("PATCH", "/contacts/{contactId}"),
-            "contacts_delete": ("DELETE", "/contacts/{contactId}"),
-            "contacts_search": ("GET", "/contacts/search?q={query}"),
-            # Deals (6)
-            "deals_list": ("GET", "/deals"),
-            "deals_create": ("POST", "/deals"),
-            "deals_get": ("GET", "/deals/{dealId}"),
-            "deals_update": ("PATCH", "/deals/{dealId}"),
-            "deals_delete": ("DELETE", "/deals/{dealId}"),
-            "deals_move": ("PATCH", "/deals/{dealId}/move"),
-            # Leads (5)
-            "leads_list": ("GET", "/leads"),
-            "leads_create": ("POST", "/leads"),
-            "leads_update": ("PATCH", "/leads/{leadId}"),
-            "leads_convert": ("POST", "/leads/{leadId}/convert"),
-            "leads_delete": ("DELETE", "/leads/{leadId}"),
-            # Tickets (7)
-            "tickets_list": ("GET", "/tickets"),
-            "tickets_create": ("POST", "/tickets"),
-            "tickets_get": ("GET", "/tickets/{ticketId}"),
-            "tickets_update": ("PATCH", "/tickets/{ticketId}"),
-            "tickets_delete": ("DELETE", "/tickets/{ticketId}"),
-            "tickets_comment": ("POST", "/tickets/{ticketId}/comments"),
-            "tickets_assign": ("PATCH", "/tickets/{ticketId}/assign"),
-            # Analytics (2 - only verified working endpoints)
-            "analytics_dashboard": ("GET", "/analytics/dashboard"),
-            "analytics_revenue": ("GET", "/analytics/revenue"),
-            # Users (5 - ADMIN)
-            "users_list": ("GET", "/users"),
-            "users_get": ("GET", "/users/{userId}"),
-            "users_invite": ("POST", "/users/invite"),
-            "users_update_role": ("PATCH", "/users/{userId}/role"),
-            "users_deactivate": ("DELETE", "/users/{userId}"),
-            # Pipelines (4)
-            "pipelines_list": ("GET", "/pipelines"),
-            "pipelines_create": ("POST", "/pipelines"),
-            "pipelines_update": ("PATCH", "/pipelines/{pipelineId}"),
-            "pipelines_delete": ("DELETE", "/pipelines/{pipelineId}"),
-            # Stages (3)
-            "stages_list": ("GET", "/stages"),  # Uses ?pipelineId=X query param
-            "stages_create": ("POST", "/stages"),
-            "stages_update": ("PATCH", "/stages/{stageId}"),
-            # Portal (3 - only working endpoints)
-            "portal_customers_list": ("GET", "/portal/customers"),
-            "portal_tickets_list": ("GET", "/portal/tickets"),
-            "portal_tickets_create": ("POST", "/portal/tickets"),
-        }
-        
-        if tool_name not in endpoint_map:
-            return [TextContent(type="text", text=f"❌ Unknown tool: {tool_name}")]
-        
-        method, endpoint = endpoint_map[tool_name]
-        
-        # Replace path parameters and track which keys are used in path
-        path_params = set()
-        for key, value in args.items():
-            placeholder = f"{{{key}}}"
-            if placeholder in endpoint:
-                endpoint = endpoint.replace(placeholder, str(value))
-                path_params.add(key)
-        
-        # Remove path parameters from body (they're already in the URL)
-        body_args = {k: v for k, v in args.items() if k not in path_params}
-        
-        async with httpx.AsyncClient() as client:
+        # O(1) lookup in the prebuilt registry
+        spec = TOOL_REGISTRY.get(tool_name)
+        if spec is None or spec.method is None:
+            return False, f"Unknown tool: {tool_name}"
+        
+        # limit/cursor/sort/fields are applied here unless the backend pages itself
+        page_args: Dict[str, Any] = {}
+        if spec.paginated and not spec.native_paging:
+            page_args, args = split_page_args(args)
+        
+        try:
+            endpoint, query, body_args = self.route_request(spec, args)
+        except ValueError as e:
+            return False, str(e)
+        method = spec.method
+        
+        # Wrong pipeline/stage IDs are answered locally with the valid choices
+        error = await self.check_pipeline_args(tool_name, args, jwt)
+        if error:
+            return False, error
+        
+        subject = session_subject(jwt)
+        
+        # Fuzzy contact search from the tenant's indexed contact list
+        if tool_name == "contacts_search" and self.contact_search.enabled:
+            matches = await self.search_contacts_locally(args, jwt)
+            if matches is not None:
+                return True, matches
+        
+        # Serve cached list results for this session
+        read_key = self.response_cache.make_key(subject, tool_name, args) if spec.is_read else None
+        cache_key = read_key if self.response_cache.is_cacheable(tool_name) else None
+        if cache_key is not None:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                for observer in self.result_observers:
+                    observer.observe(subject, tool_name, args, cached, refresh=False)
+                return self.shape_list(spec, cached, page_args)
+        
+        async def load() -> Tuple[int, bytes, Any]:
+            started = time.perf_counter()
             try:
-                url = f"{BACKEND_API}{endpoint}"
-                headers = {"Authorization": f"Bearer {jwt}"}
-                
-                # Debug logging
-                logger.info(f"Calling {method} {url} with body: {json.dumps(body_args, indent=2)}")
-                
-                if method == "GET":
-                    response = await client.get(url, headers=headers, timeout=30.0)
-                elif method == "POST":
-                    response = await client.post(url, headers=headers, json=body_args, timeout=30.0)
-                elif method == "PATCH":
-                    response = await client.patch(url, headers=headers, json=body_args, timeout=30.0)
-                elif method == "DELETE":
-                    response = await client.delete(url, headers=headers, timeout=30.0)
+                result = await self.fetch_backend(
+                    method,
+                    endpoint,
+                    jwt,
+                    params=query or None,
+                    body=body_args if method in ("POST", "PATCH") else None,
+                )
+            except Exception:
+                record_backend_call(tool_name, method, time.perf_counter() - started, None)
+                raise
+            status, content = result
+            record_backend_call(tool_name, method, time.perf_counter() - started, status)
+            data = None
+            if cache_key is not None and status in (200, 201):
+                data = self.parse_body(content)
+                self.response_cache.set(cache_key, data, len(content))
+            return status, content, data
+        
+        try:
+            # Debug logging (lazy - the body is only redacted/serialized when DEBUG is on)
+            log_event(logger, "backend_call", logging.DEBUG, method=method, endpoint=endpoint, query=query, body=body_args)
+            
+            # Identical concurrent reads share one backend request
+            if read_key is not None:
+                status, content, data = await self.coalescer.run(read_key, tool_name, load)
+            else:
+                status, content, data = await load()
+            
+            if status in [200, 201]:
+                if not spec.is_read:
+                    self.response_cache.invalidate_for_write(subject, tool_name)
+                observers = [o for o in self.result_observers if o.tracks(tool_name)]
+                if data is None:
+                    if raw and content and not observers and not (spec.paginated and not spec.native_paging):
+                        # Nothing to reshape - forward the backend bytes untouched
+                        return True, RawJson(content)
+                    data = self.parse_body(content)
+                for observer in observers:
+                    observer.observe(subject, tool_name, args, data)
+                return self.shape_list(spec, data, page_args)
+            else:
+                if data is None:
+                    data = self.parse_body(content)
+                error = data.get("message", "Request failed") if isinstance(data, dict) else "Request failed"
+                return False, error
                 
-                if response.status_code in [200, 201]:
-                    data = response.json()
-                    # Return raw JSON - Gemini will format it nicely for users
-                    # while still having access to IDs for internal use
-                    return [TextContent(type="text", text=json.dumps(data, indent=2))]
-                else:
-                    error = response.json().get("message", "Request failed")
-                    return [TextContent(type="text", text=f"❌ {error}")]
-                    
-            except Exception as e:
-                logger.error(f"Backend call error: {e}")
-                return [TextContent(type="text", text=f"❌ Error: {str(e)}")]
+        except Exception as e:
+            logger.error(f"Backend call error: {e}")
+            return False, f"Error: {str(e)}"
+    
+    def shape_list(self, spec: ToolSpec, data: Any, page_args: Dict[str, Any]) -> Tuple[bool, Any]:
+        """Return one page of a full backend list: {items, nextCursor, total}"""
+        if not spec.paginated or spec.native_paging or not isinstance(data, list):
+            return True, data
+        try:
+            return True, paginate(data, page_args)
+        except PaginationError as e:
+            return False, str(e)
+    
+    def route_request(self, spec: ToolSpec, args: dict) -> Tuple[str, Dict[str, Any], Dict[str, Any]]:
+        """
+        Split tool arguments into URL path, query string and JSON body
+        
+        Raises:
+            ValueError: if a path parameter is missing
+        """
+        missing = [param for param in spec.path_params if param not in args]
+        if missing:
+            raise ValueError(f"Missing required argument(s): {', '.join(missing)}")
+        
+        endpoint = spec.build_path(args)
+        
+        # Query-string arguments (e.g. contacts_search ?q=)
+        query = {key: args[arg] for arg, key in spec.query_params.items() if arg in args}
+        
+        # Remove path/query parameters from body (they're already in the URL)
+        url_params = set(spec.path_params).union(spec.query_params)
+        body_args = {k: v for k, v in args.items() if k not in url_params}
+        
+        # GET has no body - remaining arguments are backend filters (e.g. stages_list ?pipelineId=)
+        if spec.is_read:
+            query.update(body_args)
+            body_args = {}
+        return endpoint, query, body_args
+    
+    async def stream_records(self, spec: ToolSpec, args: dict, jwt: str) -> AsyncIterator[Any]:
+        """
+        Yield list records as the backend body arrives
+        
+        Cached lists are replayed from memory; otherwise the response is
+        parsed incrementally instead of being buffered whole.
+        """
+        args = {k: v for k, v in args.items() if k != "jwt"}
+        if spec.paginated and not spec.native_paging:
+            _, args = split_page_args(args)  # a stream always returns every record
+        endpoint, query, _ = self.route_request(spec, args)
+        
+        if self.response_cache.is_cacheable(spec.name):
+            cache_key = self.response_cache.make_key(session_subject(jwt), spec.name, args)
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                for record in iter_array(cached):
+                    yield record
+                return
+        
+        async with self.backend.stream(spec.method, endpoint, jwt=jwt, params=query or None) as response:
+            if response.status_code not in (200, 201):
+                body = await response.aread()
+                try:
+                    error = json.loads(body).get("message", "Request failed")
+                except (ValueError, AttributeError):
+                    error = "Request failed"
+                raise RuntimeError(error)
+            
+            parser = JsonArrayStreamParser()
+            async for chunk in response.aiter_bytes():
+                for record in parser.feed(chunk):
+                    yield record
+            for record in parser.close():
+                for item in iter_array(record):
+                    yield item
+    
+    async def fetch_backend(
+        self,
+        method: str,
+        endpoint: str,
+        jwt: str,
+        params: Optional[Dict[str, Any]] = None,
+        body: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[int, bytes]:
+        """
+        Send one request over the shared pool
+        
+        Returns:
+            (status_code, raw body bytes) - parsed lazily with parse_body()
+        """
+        response = await self.backend.request(method, endpoint, jwt=jwt, params=params, json=body)
+        return response.status_code, response.content
+    
+    @staticmethod
+    def parse_body(content: bytes) -> Any:
+        """Parse a backend JSON body (None when empty or not JSON)"""
+        if not content:
+            return None
+        try:
+            return loads(content)
+        except ValueError:
+            return None
     
     # ==================== MCP HANDLERS (stdio) ====================
     
@@ -865,8 +845,8 @@ class UnifiedMCPServer:
         @self.server.call_tool()
         async def handle_call_tool(name: str, arguments: dict) -> list[TextContent]:
             """Execute tool"""
-            logger.info(f"[stdio] Tool: {name}")
-            return await self.execute_tool(name, arguments)
+            log_event(logger, "tool_call", transport="stdio", tool=name)
+            return await self.execute_tool(name, arguments, transport="stdio")
     
     # ==================== HTTP ENDPOINTS ====================
     
@@ -878,15 +858,36 @@ class UnifiedMCPServer:
             """Health check"""
             return {
                 "status": "ok",
-                "transports": ["stdio", "http"],
-                "tools": len(self.get_tool_list())
+                "transports": ["stdio", "http"] if MCP_TRANSPORT == "both" and HTTP_WORKERS == 1 else ["http"],
+                "workers": HTTP_WORKERS,
+                "pid": os.getpid(),
+                "tools": len(TOOL_REGISTRY),
+                "cache": self.response_cache.stats(),
+                "coalescing": self.coalescer.stats(),
+                "entity_index": self.entity_index.stats(),
+                "pipeline_cache": self.pipeline_cache.stats(),
+                "contact_search": self.contact_search.stats(),
+                "pool": self.backend.stats(),
+                "breakers": self.backend.resilience.stats(),
+                "rate_limit": self.rate_limiter.stats(),
+                "jwt_claims": get_claims_cache().stats(),
+                "transcripts": self.transcripts.stats(),
+                "rbac": {"enabled": self.rbac_enabled, "denied": sum(self.rbac_denied.values())},
             }
         
+        if METRICS_ENABLED:
+            @self.http_app.get("/metrics")
+            async def metrics():
+                """Prometheus metrics (text exposition format)"""
+                return Response(content=REGISTRY.render(), media_type=CONTENT_TYPE)
+        
         @self.http_app.get("/mcp/tools")
-        async def list_tools():
-            """List all tools via HTTP"""
-            tools = self.get_tool_list()
-            return {"tools": [{"name": t.name, "description": t.description} for t in tools]}
+        async def list_tools(if_none_match: Optional[str] = Header(None)):
+            """List all tools via HTTP (pre-serialized, ETag-cached)"""
+            headers = {"ETag": TOOLS_ETAG, "Cache-Control": "public, max-age=300"}
+            if if_none_match == TOOLS_ETAG:
+                return Response(status_code=304, headers=headers)
+            return Response(content=TOOLS_JSON, media_type="application/json", headers=headers)
         
         @self.http_app.post("/mcp/call-tool")
         async def call_tool(
@@ -894,7 +895,7 @@ class UnifiedMCPServer:
             authorization: Optional[str] = Header(None)
         ):
             """Call tool via HTTP (with JWT)"""
-            logger.info(f"[HTTP] Tool: {request.tool_name}")
+            log_event(logger, "tool_call", transport="http", tool=request.tool_name)
             
             # Extract JWT from Authorization header
             arguments = request.arguments.copy()
@@ -902,8 +903,168 @@ class UnifiedMCPServer:
                 jwt = authorization.replace("Bearer ", "")
                 arguments["jwt"] = jwt
             
-            result = await self.execute_tool(request.tool_name, arguments)
-            return {"result": [{"type": r.type, "text": r.text} for r in result]}
+            async with self.admit(arguments.get("jwt"), [(request.tool_name, arguments)]):
+                result = await self.execute_tool(request.tool_name, arguments, transport="http")
+            content = dumps_bytes({"result": [{"type": r.type, "text": r.text} for r in result]}, pretty=False)
+            return Response(content=content, media_type="application/json")
+        
+        @self.http_app.post("/mcp/call-tool/stream")
+        async def call_tool_stream(
+            request: ToolCallRequest,
+            authorization: Optional[str] = Header(None),
+            accept: Optional[str] = Header(None),
+        ):
+            """Stream a *_list tool as NDJSON (default) or SSE (Accept: text/event-stream)"""
+            log_event(logger, "tool_stream", transport="http", tool=request.tool_name)
+            
+            spec = TOOL_REGISTRY.get(request.tool_name)
+            if spec is None or not spec.is_read or not spec.name.endswith("_list"):
+                raise HTTPException(status_code=400, detail="Streaming is only available for *_list tools")
+            
+            arguments = request.arguments.copy()
+            if authorization and authorization.startswith("Bearer "):
+                arguments["jwt"] = authorization.replace("Bearer ", "")
+            
+            session = self.get_session(arguments)
+            if not session:
+                raise HTTPException(status_code=401, detail="Not authenticated. Please login first or provide valid JWT.")
+            denial = self.rbac_denial(session, spec.name)
+            if denial:
+                raise HTTPException(status_code=403, detail=denial)
+
+            sse = bool(accept and SSE_MEDIA_TYPE in accept)
+            
+            # The slot is held until the stream ends, not just until headers go out
+            admission = self.admit(arguments.get("jwt"), [(spec.name, arguments)])
+            await admission.__aenter__()
+            
+            async def framed() -> AsyncIterator[bytes]:
+                try:
+                    async for chunk in self.execute_stream(spec, arguments, session, sse):
+                        yield chunk
+                finally:
+                    admission.release()
+            
+            return StreamingResponse(
+                framed(),
+                media_type=SSE_MEDIA_TYPE if sse else NDJSON_MEDIA_TYPE,
+                headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+                background=BackgroundTask(admission.release),  # in case the body never starts
+            )
+        
+        @self.http_app.post("/mcp/call-tools")
+        async def call_tools(
+            request: BatchToolCallRequest,
+            authorization: Optional[str] = Header(None)
+        ):
+            """Run several tools in one round trip (with JWT)"""
+            log_event(logger, "batch_call", transport="http", tools=[c.tool_name for c in request.calls])
+            
+            arguments = {}
+            if authorization and authorization.startswith("Bearer "):
+                arguments["jwt"] = authorization.replace("Bearer ", "")
+            
+            session = self.get_session(arguments)
+            if not session:
+                raise HTTPException(status_code=401, detail="Not authenticated. Please login first or provide valid JWT.")
+            
+            self.prefetch_pipelines(session.get("jwt"))
+            calls = [{"tool_name": c.tool_name, "arguments": c.arguments} for c in request.calls]
+            async with self.admit(arguments.get("jwt"), [(c.tool_name, c.arguments) for c in request.calls]):
+                with track_tool_call("batch_call", "http") as call:
+                    try:
+                        result = await self.execute_batch(calls, session)
+                        return Response(content=dumps_bytes(result, pretty=False), media_type="application/json")
+                    except BatchError as e:
+                        call.outcome = "error"
+                        raise HTTPException(status_code=400, detail=str(e))
+        
+        @self.http_app.exception_handler(RateLimited)
+        async def rate_limited(request: Request, exc: RateLimited):
+            """429 with Retry-After for calls over a tenant/user limit"""
+            log_event(logger, "rate_limited", scope=exc.scope, reason=exc.reason, retry_after=exc.retry_after)
+            return Response(
+                content=dumps_bytes({"detail": str(exc)}, pretty=False),
+                status_code=429,
+                media_type="application/json",
+                headers={"Retry-After": str(exc.retry_after)},
+            )
+    
+    def admit(self, jwt: Optional[str], calls: List[Tuple[str, Dict[str, Any]]]) -> Admission:
+        """
+        Rate-limit admission for HTTP tool calls
+        
+        Args:
+            calls: (tool_name, arguments) of every call in the request
+        
+        Writes are charged against the write buckets; a batch costs one
+        token per call and counts as a write if any call writes.
+        batch_call is charged as the calls it carries.
+        """
+        tool_names = [name for tool_name, arguments in calls for name in self.charged_tools(tool_name, arguments)]
+        specs = [TOOL_REGISTRY.get(name) for name in tool_names]
+        tool_class = "read" if all(spec is not None and spec.is_read for spec in specs) else "write"
+        return self.rate_limiter.admit(jwt, tool_class, cost=max(1, len(tool_names)))
+    
+    def charged_tools(self, tool_name: str, arguments: Any) -> List[str]:
+        """Tools a call is accounted as - batch_call expands to its inner calls"""
+        calls = arguments.get("calls") if tool_name == "batch_call" and isinstance(arguments, dict) else None
+        if not isinstance(calls, list):
+            return [tool_name]
+        names = [
+            name
+            for call in calls if isinstance(call, dict)
+            for name in self.charged_tools(str(call.get("tool_name")), call.get("arguments"))
+        ]
+        return names or [tool_name]
+    
+    # ==================== METRICS ====================
+    
+    def setup_metrics(self):
+        """Expose cache, coalescing, pool, breaker, rate-limit and RBAC stats as scrape-time metrics"""
+        cache = self.response_cache
+        pool = self.backend
+        resilience = self.backend.resilience
+        limiter = self.rate_limiter
+        
+        def coalesced():
+            return [((tool,), counts["deduplicated"]) for tool, counts in sorted(self.coalescer.stats().items())]
+        
+        callbacks = (
+            (CallbackCounter, "mcp_cache_hits_total", "Response cache hits", (),
+             lambda: [((), cache.hits)]),
+            (CallbackCounter, "mcp_cache_misses_total", "Response cache misses", (),
+             lambda: [((), cache.misses)]),
+            (Gauge, "mcp_cache_hit_ratio", "Response cache hit ratio since start", (),
+             lambda: [((), cache.stats()["hit_rate"])]),
+            (Gauge, "mcp_cache_entries", "Cached responses", (),
+             lambda: [((), cache.stats()["entries"])]),
+            (CallbackCounter, "mcp_coalesced_requests_total", "Reads served by another in-flight request", ("tool",),
+             coalesced),
+            (Gauge, "mcp_backend_pool_active", "Backend requests holding a pool connection", (),
+             lambda: [((), pool.active)]),
+            (Gauge, "mcp_backend_pool_max_connections", "Backend pool size", (),
+             lambda: [((), pool.stats()["max_connections"])]),
+            (Gauge, "mcp_backend_pool_utilization", "Active / max backend connections", (),
+             lambda: [((), pool.stats()["utilization"])]),
+            (Gauge, "mcp_backend_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ("family",),
+             lambda: [((family,), STATE_VALUES[b.state]) for family, b in sorted(resilience.breakers.items())]),
+            (Gauge, "mcp_backend_timeout_seconds", "Current adaptive backend timeout", ("family",),
+             lambda: [((family,), resilience.timeout_for(family)) for family in sorted(resilience.breakers)]),
+            (CallbackCounter, "mcp_backend_rejected_total", "Calls failed fast by an open circuit", ("family",),
+             lambda: [((family,), b.rejected) for family, b in sorted(resilience.breakers.items())]),
+            (CallbackCounter, "mcp_backend_retries_total", "Backend GET retries", (),
+             lambda: [((), resilience.retried)]),
+            (CallbackCounter, "mcp_rate_limited_total", "HTTP calls rejected by rate or concurrency limits", ("scope", "reason"),
+             lambda: [(key, count) for key, count in sorted(limiter.rejected.items())]),
+            (Gauge, "mcp_rate_limit_queued", "HTTP calls waiting for an in-flight slot", (),
+             lambda: [((), limiter.slots.stats()["queued"])]),
+            (CallbackCounter, "mcp_rbac_denied_total", "Calls refused locally for the session role", ("role", "tool"),
+             lambda: [(key, count) for key, count in sorted(self.rbac_denied.items())]),
+        )
+        for kind, name, documentation, labelnames, callback in callbacks:
+            REGISTRY.unregister(name)  # a new server instance replaces the previous one
+            REGISTRY.register(kind(name, documentation, labelnames, callback=callback))
     
     # ==================== TRANSPORT RUNNERS ====================
     
@@ -911,40 +1072,93 @@ class UnifiedMCPServer:
         """Run stdio server for CLI clients"""
         logger.info("🖥️  stdio transport: Ready for Gemini/Claude CLI")
         
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                InitializationOptions(
-                    server_name="synapse-crm",
-                    server_version="3.0.0-unified",
-                    capabilities=self.server.get_capabilities(
-                        notification_options=NotificationOptions(),
-                        experimental_capabilities={},
+        await self.backend.open()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    InitializationOptions(
+                        server_name="synapse-crm",
+                        server_version="3.0.0-unified",
+                        capabilities=self.server.get_capabilities(
+                            notification_options=NotificationOptions(),
+                            experimental_capabilities={},
+                        ),
                     ),
-                ),
-            )
+                )
+        finally:
+            await self.backend.close()
+            self.transcripts.close()
     
     async def run_http(self):
-        """Run HTTP server for web/android"""
+        """Run HTTP server for web/android (single process)"""
         logger.info(f"🌐 HTTP transport: Listening on port {HTTP_PORT}")
         
         config = uvicorn.Config(
             self.http_app,
-            host="0.0.0.0",
+            host=HTTP_HOST,
             port=HTTP_PORT,
             log_level="info",
         )
         server = uvicorn.Server(config)
-        await server.serve()
+        if HTTP_REUSE_PORT:
+            await server.serve(sockets=[bind_reuse_port_socket(HTTP_HOST, HTTP_PORT)])
+        else:
+            await server.serve()
 
 
-# ==================== MAIN ====================
+# ==================== MULTI-WORKER HTTP ====================
 
-async def main():
-    """Start both transports concurrently"""
-    server = UnifiedMCPServer()
+def create_http_app() -> FastAPI:
+    """
+    uvicorn app factory - each worker process builds its own server
+    
+    Workers have their own backend pool; response cache entries are shared
+    between them when MCP_STATE_BACKEND=sqlite.
+    """
+    return UnifiedMCPServer().http_app
+
+
+def bind_reuse_port_socket(host: str, port: int) -> socket.socket:
+    """Listening socket with SO_REUSEADDR/SO_REUSEPORT set"""
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if hasattr(socket, "SO_REUSEPORT"):
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    else:
+        logger.warning("⚠️  SO_REUSEPORT is not supported on this platform")
+    sock.bind((host, port))
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_http_workers(workers: int = HTTP_WORKERS):
+    """
+    Run the HTTP transport under N worker processes (blocking)
     
+    uvicorn binds one listening socket in the supervisor and shares it
+    with every worker, so the kernel spreads connections across cores.
+    """
+    if get_state_backend() is None:
+        logger.warning("⚠️  MCP_STATE_BACKEND=memory - each HTTP worker keeps its own cache")
+    logger.info(f"🌐 HTTP transport: {workers} workers listening on port {HTTP_PORT}")
+    
+    uvicorn.run(
+        "server_unified:create_http_app",
+        factory=True,
+        host=HTTP_HOST,
+        port=HTTP_PORT,
+        workers=workers,
+        log_level="info",
+    )
+
+
+# ==================== MAIN ====================
+
+def log_banner(transport: str, workers: int):
+    """Startup summary"""
     logger.info("=" * 60)
     logger.info("🚀 Synapse CRM - Unified MCP Server Starting...")
     logger.info("=" * 60)
@@ -952,24 +1166,66 @@ async def main():
     logger.info(f"Tools: 25 CRM operations + 3 auth")
     logger.info("")
     logger.info("Transports:")
-    logger.info("  - stdio: for Gemini CLI, Claude CLI, Claude Desktop")
-    logger.info(f"  - HTTP: for Web, Android, Telegram (port {HTTP_PORT})")
+    if transport in ("both", "stdio"):
+        logger.info("  - stdio: for Gemini CLI, Claude CLI, Claude Desktop")
+    if transport in ("both", "http"):
+        logger.info(f"  - HTTP: for Web, Android, Telegram (port {HTTP_PORT}, {workers} worker(s))")
     logger.info("")
     logger.info("Auth Modes:")
     logger.info("  - CLI: Natural language login (saves session)")
     logger.info("  - Web/Android: JWT from Supabase (Authorization header)")
     logger.info("  - Telegram: Pseudo-JWT (telegram:userId:tenantId)")
     logger.info("=" * 60)
+
+
+async def main(transport: str = "both"):
+    """Start the selected transports concurrently in this process"""
+    server = UnifiedMCPServer()
+    log_banner(transport, 1)
+    
+    runners = []
+    if transport in ("both", "stdio"):
+        runners.append(server.run_stdio())
+    if transport in ("both", "http"):
+        runners.append(server.run_http())
     
     # Run both transports concurrently!
-    await asyncio.gather(
-        server.run_stdio(),
-        server.run_http()
+    await asyncio.gather(*runners)
+
+
+def start():
+    """
+    Entry point - transports and worker count come from the environment
+    
+    With MCP_HTTP_WORKERS > 1 the HTTP transport leaves this event loop:
+    http mode runs the uvicorn supervisor directly, both mode starts it in
+    a child process and keeps stdio here.
+    """
+    if MCP_TRANSPORT not in TRANSPORTS:
+        raise SystemExit(f"MCP_TRANSPORT must be one of {', '.join(TRANSPORTS)} (got '{MCP_TRANSPORT}')")
+    
+    if HTTP_WORKERS == 1 or MCP_TRANSPORT == "stdio":
+        asyncio.run(main(MCP_TRANSPORT))
+        return
+    
+    log_banner(MCP_TRANSPORT, HTTP_WORKERS)
+    if MCP_TRANSPORT == "http":
+        run_http_workers(HTTP_WORKERS)
+        return
+    
+    http = multiprocessing.get_context("spawn").Process(
+        target=run_http_workers, args=(HTTP_WORKERS,), name="synapse-mcp-http"
     )
+    http.start()
+    try:
+        asyncio.run(UnifiedMCPServer().run_stdio())
+    finally:
+        http.terminate()
+        http.join(timeout=10)
 
 
 if __name__ == "__main__":
     try:
-        asyncio.run(main())
+        start()
     except KeyboardInterrupt:
         logger.info("\n👋 Server stopped")
@@ -0,0 +1,260 @@
+"""
+Session Claims Cache
+Tenant/user/role identity of session tokens, decoded once per token
+
+- Supabase JWTs: sub, tenant, role and exp read from the payload, and
+  verified locally when a key is configured (MCP_JWT_SECRET for HS256,
+  MCP_JWT_JWKS_FILE for RS256/ES256 keys; needs PyJWT)
+- Telegram pseudo-JWTs (telegram:userId:tenantId) parsed the same way
+- results kept in an LRU keyed by token digest, so caches, rate limits
+  and metrics get the identity in O(1) per request
+
+Without a key, claims are decoded but not verified - the backend still
+verifies every token it receives, and caches and rate limits are keyed
+by the token digest rather than the unverified tenant/user.
+"""
+
+import os
+import json
+import time
+import base64
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+try:
+    import jwt as pyjwt
+except ImportError:  # optional: pip install pyjwt[crypto]
+    pyjwt = None
+
+logger = logging.getLogger(__name__)
+
+# Claims checked for the tenant, top level first, then app/user metadata
+TENANT_CLAIMS = ("tenantId", "tenant_id", "tenant")
+ROLE_CLAIMS = ("role", "user_role")
+METADATA_CLAIMS = ("app_metadata", "user_metadata")
+
+# Supabase puts the Postgres role here, not the CRM role
+POSTGRES_ROLES = frozenset({"authenticated", "anon", "service_role"})
+
+
+def token_digest(token: str) -> str:
+    """Short digest of a session token (the raw token is never stored)"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:32]
+
+
+@dataclass(frozen=True)
+class SessionClaims:
+    """Identity extracted from one session token"""
+    digest: str
+    kind: str                       # jwt, telegram or opaque
+    user: str                       # sub (or telegram:userId, or the digest)
+    tenant: str                     # tenant claim (or the user when absent)
+    role: Optional[str] = None      # CRM role (ADMIN / MEMBER) when present
+    exp: Optional[float] = None     # expiry (epoch seconds)
+    verified: bool = False
+    valid: bool = True              # False when verification failed
+    error: Optional[str] = None
+
+    @property
+    def subject(self) -> str:
+        """
+        Cache subject: stable across token refreshes of the same user
+
+        Only verified claims are trusted with a tenant/user subject - an
+        unverified (or telegram) token could name any tenant, so it is
+        keyed by its own digest.
+        """
+        if not self.verified:
+            return self.digest
+        return hashlib.sha256(f"{self.tenant}\x00{self.user}\x00{self.role or ''}".encode("utf-8")).hexdigest()[:32]
+
+    def expired(self, now: Optional[float] = None) -> bool:
+        return self.exp is not None and (now or time.time()) >= self.exp
+
+
+def _claim(claims: Dict[str, Any], names: tuple, ignore: frozenset = frozenset()) -> Optional[str]:
+    """First non-empty claim of `names` (top level, then metadata), skipping `ignore` values"""
+    sources = [claims] + [claims[key] for key in METADATA_CLAIMS if isinstance(claims.get(key), dict)]
+    for source in sources:
+        for name in names:
+            value = source.get(name)
+            if value and value not in ignore:
+                return str(value)
+    return None
+
+
+def _unverified_payload(token: str) -> Optional[Dict[str, Any]]:
+    parts = token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(parts[1] + "=" * (-len(parts[1]) % 4)))
+    except (ValueError, TypeError):
+        return None
+    return payload if isinstance(payload, dict) else None
+
+
+class ClaimsCache:
+    """
+    LRU of SessionClaims keyed by token digest
+
+    Entries live until the token expires (or max_age for tokens without exp).
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        max_age: float = 3600,
+        secret: Optional[str] = None,
+        jwks_file: Optional[str] = None,
+        audience: Optional[str] = None,
+        leeway: float = 30,
+    ):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.audience = audience
+        self.leeway = leeway
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()   # digest -> (claims, stale_at)
+        self._keys: Dict[Optional[str], Any] = {}                   # kid -> verification key
+        self._algorithms = []
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self._load_keys(secret, jwks_file)
+
+    @classmethod
+    def from_env(cls) -> "ClaimsCache":
+        return cls(
+            max_entries=int(os.getenv("MCP_JWT_CACHE_SIZE", "4096")),
+            max_age=float(os.getenv("MCP_JWT_CACHE_MAX_AGE", "3600")),
+            secret=os.getenv("MCP_JWT_SECRET") or None,
+            jwks_file=os.getenv("MCP_JWT_JWKS_FILE") or None,
+            audience=os.getenv("MCP_JWT_AUDIENCE") or None,
+        )
+
+    @property
+    def verifying(self) -> bool:
+        return bool(self._keys)
+
+    def _load_keys(self, secret: Optional[str], jwks_file: Optional[str]) -> None:
+        if not (secret or jwks_file):
+            return
+        if pyjwt is None:
+            logger.warning("⚠️  MCP_JWT_SECRET/MCP_JWT_JWKS_FILE set but PyJWT is not installed - claims are not verified")
+            return
+        if secret:
+            self._keys[None] = secret
+            self._algorithms.append("HS256")
+        if jwks_file:
+            try:
+                with open(jwks_file, "r", encoding="utf-8") as f:
+                    jwks = pyjwt.PyJWKSet.from_dict(json.load(f))
+            except (OSError, ValueError, pyjwt.PyJWTError) as e:
+                logger.error(f"❌ Cannot load JWKS file {jwks_file}: {e}")
+                return
+            for key in jwks.keys:
+                self._keys[key.key_id] = key.key
+            self._algorithms.extend(["RS256", "ES256"])
+        logger.info(f"🔐 JWT verification enabled ({len(self._keys)} key(s))")
+
+    # ==================== LOOKUP ====================
+
+    def claims(self, token: str) -> SessionClaims:
+        """Claims of a session token, decoded (and verified) at most once per token"""
+        digest = token_digest(token)
+        entry = self._entries.get(digest)
+        now = time.time()
+        if entry is not None and now < entry[1]:
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return entry[0]
+
+        self.misses += 1
+        claims = self._decode(token, digest)
+        if not claims.valid:
+            self.rejected += 1
+        stale_at = now + self.max_age
+        if claims.exp is not None:
+            stale_at = min(stale_at, claims.exp + self.leeway)
+        self._entries[digest] = (claims, stale_at)
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return claims
+
+    def _decode(self, token: str, digest: str) -> SessionClaims:
+        if token.startswith("telegram:"):
+            parts = token.split(":")
+            if len(parts) >= 3 and parts[1] and parts[2]:
+                return SessionClaims(digest, "telegram", f"telegram:{parts[1]}", parts[2])
+            return SessionClaims(digest, "opaque", digest, digest)
+
+        payload = _unverified_payload(token)
+        if payload is None:
+            return SessionClaims(digest, "opaque", digest, digest)
+
+        verified = False
+        if self.verifying:
+            error = self._verify(token)
+            if error:
+                return SessionClaims(digest, "jwt", digest, digest, valid=False, error=error)
+            verified = True
+
+        user = str(payload.get("sub") or payload.get("email") or digest)
+        exp = payload.get("exp")
+        return SessionClaims(
+            digest=digest,
+            kind="jwt",
+            user=user,
+            tenant=_claim(payload, TENANT_CLAIMS) or user,
+            role=_claim(payload, ROLE_CLAIMS, POSTGRES_ROLES),
+            exp=float(exp) if isinstance(exp, (int, float)) else None,
+            verified=verified,
+        )
+
+    def _verify(self, token: str) -> Optional[str]:
+        """Error message, or None when the signature, exp and audience check out"""
+        try:
+            kid = pyjwt.get_unverified_header(token).get("kid")
+            key = self._keys.get(kid) or self._keys.get(None)
+            if key is None:
+                return f"unknown signing key {kid!r}"
+            pyjwt.decode(
+                token,
+                key,
+                algorithms=self._algorithms,
+                audience=self.audience,
+                leeway=self.leeway,
+                options={"verify_aud": self.audience is not None},
+            )
+        except pyjwt.PyJWTError as e:
+            return str(e)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "verifying": self.verifying,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "rejected": self.rejected,
+        }
+
+
+_cache: Optional[ClaimsCache] = None
+
+
+def get_claims_cache() -> ClaimsCache:
+    """Process-wide claims cache (MCP_JWT_* settings)"""
+    global _cache
+    if _cache is None:
+        _cache = ClaimsCache.from_env()
+    return _cache
+
+
+def session_claims(token: str) -> SessionClaims:
+    """Claims of a session token from the process-wide cache"""
+    return get_claims_cache().claims(token)
@@ -0,0 +1,217 @@
+"""
+Shared State Backends for Multi-Worker Servers
+Pluggable key/value store for caches and rate-limit counters
+
+- memory: nothing shared (default, single worker) - caches and rate
+  limiters keep their own in-process structures
+- sqlite: one WAL-mode SQLite file shared by every worker on the host
+  (placed on /dev/shm when available, so it lives in shared memory)
+"""
+
+import os
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+STATE_BACKENDS = ("memory", "sqlite")
+
+
+def default_state_path() -> Path:
+    """SQLite file location: RAM-backed /dev/shm on Linux, temp dir elsewhere"""
+    base = Path("/dev/shm") if Path("/dev/shm").is_dir() else Path(tempfile.gettempdir())
+    return base / "synapse-mcp-state.sqlite3"
+
+
+class StateBackend(ABC):
+    """
+    Minimal key/value interface for state shared between workers
+
+    Values are bytes with a TTL in seconds. Tags group keys so a whole
+    group can be dropped at once (e.g. every cached list of one family).
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Value of a live key, None when missing or expired"""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        """Store a value for `ttl` seconds under the given tags"""
+
+    @abstractmethod
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        """Remove every key carrying any of the tags; returns keys removed"""
+
+    @abstractmethod
+    def incr(self, key: str, amount: float = 1, ttl: float = 60) -> float:
+        """Atomically add to a numeric counter (created at 0 with the TTL)"""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every key and counter"""
+
+    def stats(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+    def close(self) -> None:
+        pass
+
+
+class SQLiteStateBackend(StateBackend):
+    """
+    State shared between worker processes through one SQLite file
+
+    WAL mode lets readers run alongside a writer; every statement is a
+    short autocommit transaction on a local file (tens of microseconds),
+    so calls are made inline from the event loop.
+    """
+
+    name = "sqlite"
+
+    # Expired rows are swept after this many writes
+    PRUNE_EVERY = 500
+
+    _SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS kv ("
+        " key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)",
+        "CREATE TABLE IF NOT EXISTS tags ("
+        " tag TEXT NOT NULL, key TEXT NOT NULL, PRIMARY KEY (tag, key)) WITHOUT ROWID",
+        "CREATE TABLE IF NOT EXISTS counters ("
+        " key TEXT PRIMARY KEY, value REAL NOT NULL, expires_at REAL NOT NULL)",
+    )
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else default_state_path()
+        self._local = threading.local()
+        self._writes = 0
+
+        conn = self._connection()
+        for statement in self._SCHEMA:
+            conn.execute(statement)
+        logger.info(f"🗄️  Shared state: {self.path}")
+
+    def _connection(self) -> sqlite3.Connection:
+        """One connection per thread (sqlite3 connections are not thread-safe)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        row = self._connection().execute(
+            "SELECT value FROM kv WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    def set(self, key: str, value: bytes, ttl: float, tags: Iterable[str] = ()) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), time.time() + ttl),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO tags (tag, key) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+        self._maybe_prune()
+
+    def delete_tags(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        if not tags:
+            return 0
+        marks = ",".join("?" * len(tags))
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            dropped = conn.execute(
+                f"DELETE FROM kv WHERE key IN (SELECT key FROM tags WHERE tag IN ({marks}))", tags
+            ).rowcount
+            conn.execute(f"DELETE FROM tags WHERE tag IN ({marks})", tags)
+        return dropped
+
+    def incr(self, key: str, amount: float = 1, ttl: float = 60) -> float:
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM counters WHERE key = ? AND expires_at <= ?", (key, now))
+            conn.execute(
+                "INSERT INTO counters (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+                (key, amount, now + ttl),
+            )
+            row = conn.execute("SELECT value FROM counters WHERE key = ?", (key,)).fetchone()
+        self._maybe_prune()
+        return row[0]
+
+    def _maybe_prune(self) -> None:
+        self._writes += 1
+        if self._writes % self.PRUNE_EVERY:
+            return
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute("DELETE FROM tags WHERE key IN (SELECT key FROM kv WHERE expires_at <= ?)", (now,))
+            conn.execute("DELETE FROM kv WHERE expires_at <= ?", (now,))
+            conn.execute("DELETE FROM counters WHERE expires_at <= ?", (now,))
+
+    def clear(self) -> None:
+        conn = self._connection()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            for table in ("kv", "tags", "counters"):
+                conn.execute(f"DELETE FROM {table}")
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._connection().execute(
+            "SELECT COUNT(*) FROM kv WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+        return {**super().stats(), "entries": entries, "path": str(self.path)}
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_backend: Optional[StateBackend] = None
+_resolved = False
+
+
+def get_state_backend() -> Optional[StateBackend]:
+    """
+    Process-wide shared state selected by MCP_STATE_BACKEND
+
+    MCP_STATE_BACKEND: memory (default) or sqlite
+    MCP_STATE_PATH: SQLite file (default /dev/shm/synapse-mcp-state.sqlite3)
+
+    Returns:
+        The shared backend, or None for memory (nothing is shared)
+    """
+    global _backend, _resolved
+    if not _resolved:
+        kind = os.getenv("MCP_STATE_BACKEND", "memory").strip().lower()
+        if kind == "sqlite":
+            path = os.getenv("MCP_STATE_PATH")
+            _backend = SQLiteStateBackend(Path(path) if path else None)
+        elif kind not in STATE_BACKENDS:
+            logger.warning(f"⚠️  Unknown MCP_STATE_BACKEND '{kind}' - using memory")
+        _resolved = True
+    return _backend
@@ -0,0 +1,140 @@
+"""
+Streaming Responses for Large List Tools
+Incremental JSON array parsing + NDJSON / SSE framing
+"""
+
+import json
+import codecs
+from typing import Any, AsyncIterator, Dict, Iterator, List
+
+from serialization import dumps_bytes
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+SSE_MEDIA_TYPE = "text/event-stream"
+
+_WHITESPACE = " \t\n\r"
+
+
+class JsonArrayStreamParser:
+    """
+    Parse a top-level JSON array as its bytes arrive
+
+    feed() returns every element completed by the new chunk, so records
+    can be forwarded before the whole body is downloaded. A body that is
+    not an array is buffered and returned as a single value by close().
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._text = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._is_array = None
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Add raw bytes; return the array elements completed so far"""
+        self._buffer += self._text.decode(chunk)
+        return self._drain()
+
+    def close(self) -> List[Any]:
+        """Flush the stream; returns a trailing non-array body, if any"""
+        self._buffer += self._text.decode(b"", final=True)
+        items = self._drain()
+        if self._is_array is False:
+            rest = self._buffer.strip()
+            if rest:
+                items.append(json.loads(rest))
+            self._buffer = ""
+        elif self._started and not self._finished:
+            raise ValueError("Truncated JSON array in backend response")
+        return items
+
+    def _skip_whitespace(self) -> None:
+        while self._pos < len(self._buffer) and self._buffer[self._pos] in _WHITESPACE:
+            self._pos += 1
+
+    def _drain(self) -> List[Any]:
+        items: List[Any] = []
+
+        if not self._started:
+            self._skip_whitespace()
+            if self._pos >= len(self._buffer):
+                return items
+            self._started = True
+            self._is_array = self._buffer[self._pos] == "["
+            if not self._is_array:
+                return items
+            self._pos += 1
+
+        if not self._is_array:
+            return items
+
+        while not self._finished:
+            self._skip_whitespace()
+            if self._pos >= len(self._buffer):
+                break
+            char = self._buffer[self._pos]
+            if char == ",":
+                self._pos += 1
+                continue
+            if char == "]":
+                self._pos += 1
+                self._finished = True
+                break
+            try:
+                value, end = self._decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                break  # element not complete yet
+            # Bare numbers/literals may be cut mid-token; wait for a delimiter
+            if end >= len(self._buffer) and char not in '{["':
+                break
+            items.append(value)
+            self._pos = end
+
+        # Drop consumed text so the buffer stays bounded by one element
+        if self._pos:
+            self._buffer = self._buffer[self._pos:]
+            self._pos = 0
+        return items
+
+
+def iter_array(data: Any) -> Iterator[Any]:
+    """Iterate an already-parsed payload as records"""
+    if isinstance(data, list):
+        yield from data
+    else:
+        yield data
+
+
+def encode_ndjson(event: str, payload: Dict[str, Any]) -> bytes:
+    """One NDJSON line: {"type": event, ...payload}"""
+    return dumps_bytes({"type": event, **payload}, pretty=False) + b"\n"
+
+
+def encode_sse(event: str, payload: Dict[str, Any]) -> bytes:
+    """One Server-Sent Event frame"""
+    return b"event: " + event.encode("utf-8") + b"\ndata: " + dumps_bytes(payload, pretty=False) + b"\n\n"
+
+
+async def frame_records(
+    records: AsyncIterator[Any],
+    sse: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Wrap a record iterator as NDJSON lines or SSE events
+
+    Emits one "item" per record, then "end" with the count, or "error"
+    if the source fails part way through.
+    """
+    encode = encode_sse if sse else encode_ndjson
+    count = 0
+    try:
+        async for record in records:
+            count += 1
+            yield encode("item", {"data": record})
+    except Exception as e:
+        yield encode("error", {"message": str(e), "count": count})
+        return
+    yield encode("end", {"count": count})
@@ -0,0 +1,166 @@
+"""
+Structured Logging for MCP Servers
+Lazy, sampled, redacted event logging on the hot path
+
+- log_event() checks the level and sample rate before touching the
+  fields, so filtered events cost a method call and a comparison
+- fields are redacted (password, jwt, tokens) and serialized only when
+  a handler actually formats the record
+- LOG_FORMAT=json emits one compact JSON object per line
+"""
+
+import os
+import sys
+import json
+import logging
+from typing import Any, Dict, Optional
+
+# Keys whose values never reach the logs (matched case-insensitively)
+SENSITIVE_KEYS = frozenset({
+    "password",
+    "jwt",
+    "token",
+    "access_token",
+    "refresh_token",
+    "authorization",
+    "secret",
+    "api_key",
+})
+REDACTED = "***"
+
+# Free-text fields (notes, descriptions) are cut to this many characters
+MAX_FIELD_CHARS = int(os.getenv("MCP_LOG_MAX_FIELD_CHARS", "200"))
+
+
+def redact(value: Any, depth: int = 0) -> Any:
+    """Copy of value with sensitive keys masked and long strings shortened"""
+    if depth > 8:
+        return "..."
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if str(key).lower() in SENSITIVE_KEYS else redact(item, depth + 1)
+            for key, item in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [redact(item, depth + 1) for item in value]
+    if isinstance(value, str):
+        if value.startswith("telegram:"):
+            return "telegram:***"
+        if len(value) > MAX_FIELD_CHARS:
+            return f"{value[:MAX_FIELD_CHARS]}...(+{len(value) - MAX_FIELD_CHARS} chars)"
+    return value
+
+
+def _compact(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), default=str, ensure_ascii=False)
+
+
+class EventFields:
+    """Deferred event payload - redacted and serialized on first use"""
+
+    __slots__ = ("raw", "_redacted")
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self._redacted: Optional[Dict[str, Any]] = None
+
+    def redacted(self) -> Dict[str, Any]:
+        if self._redacted is None:
+            self._redacted = redact(self.raw)
+        return self._redacted
+
+    def __str__(self) -> str:
+        return " ".join(f"{key}={_compact(value)}" for key, value in self.redacted().items())
+
+
+class EventSampler:
+    """
+    Deterministic 1-in-N sampling per event name
+
+    Rates come from MCP_LOG_SAMPLE, e.g. "tool_call=0.1,backend_call=0.01".
+    Events without a rate are always logged.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None):
+        self.every: Dict[str, int] = {
+            event: max(1, round(1 / rate)) for event, rate in (rates or {}).items() if rate > 0
+        }
+        self._seen: Dict[str, int] = {}
+
+    @classmethod
+    def from_env(cls) -> "EventSampler":
+        rates = {}
+        for item in os.getenv("MCP_LOG_SAMPLE", "").split(","):
+            if "=" in item:
+                event, rate = item.split("=", 1)
+                rates[event.strip()] = float(rate)
+        return cls(rates)
+
+    def allow(self, event: str) -> bool:
+        every = self.every.get(event)
+        if every is None:
+            return True
+        seen = self._seen.get(event, 0)
+        self._seen[event] = seen + 1
+        return seen % every == 0
+
+
+sampler = EventSampler.from_env()
+
+
+def log_event(logger: logging.Logger, event: str, level: int = logging.INFO, **fields: Any) -> None:
+    """
+    Log a structured event
+
+    Args:
+        logger: Destination logger
+        event: Short event name (e.g. "backend_call")
+        level: Logging level; nothing is evaluated when it is filtered out
+        **fields: Event data (redacted and serialized lazily)
+    """
+    if not logger.isEnabledFor(level) or not sampler.allow(event):
+        return
+    payload = EventFields(fields)
+    every = sampler.every.get(event)
+    if every:
+        fields["sampled"] = every
+    logger.log(level, "%s %s", event, payload, extra={"event": event, "fields": payload})
+
+
+class JsonLineFormatter(logging.Formatter):
+    """One compact JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        payload = getattr(record, "fields", None)
+        if isinstance(payload, EventFields):
+            entry["event"] = record.event
+            entry.update(payload.redacted())
+        else:
+            entry["msg"] = record.getMessage()
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return _compact(entry)
+
+
+def configure_logging(text_format: str) -> None:
+    """
+    Configure the root logger from LOG_LEVEL / LOG_FORMAT
+
+    Args:
+        text_format: Format string used when LOG_FORMAT=text (default)
+    """
+    handler = logging.StreamHandler(sys.stderr)
+    if os.getenv("LOG_FORMAT", "text").strip().lower() == "json":
+        handler.setFormatter(JsonLineFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(text_format))
+
+    logging.basicConfig(
+        level=getattr(logging, os.getenv("LOG_LEVEL", "INFO").upper(), logging.INFO),
+        handlers=[handler],
+    )
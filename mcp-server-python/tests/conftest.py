@@ -0,0 +1,34 @@
+"""
+Shared pytest setup for the MCP server modules
+The server is a flat set of modules, so tests import them from the parent directory
+"""
+
+import sys
+from pathlib import Path
+
+import httpx
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def make_server(monkeypatch):
+    """
+    UnifiedMCPServer whose backend pool is served by an httpx.MockTransport
+
+    Usage:
+        server = make_server(handler, MCP_CACHE_ENABLED="false")
+    """
+    def build(handler, **env):
+        for key, value in env.items():
+            monkeypatch.setenv(key, value)
+        from server_unified import UnifiedMCPServer
+
+        server = UnifiedMCPServer()
+        server.backend._client = httpx.AsyncClient(
+            base_url=server.backend.base_url, transport=httpx.MockTransport(handler)
+        )
+        return server
+
+    return build
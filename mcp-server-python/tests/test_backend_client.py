@@ -0,0 +1,51 @@
+"""Shared backend pool: reference-counted lifecycle and forwarded auth"""
+
+import asyncio
+
+import httpx
+
+from backend_client import BackendClient
+
+
+def make_client(handler) -> BackendClient:
+    backend = BackendClient("http://backend.test/api")
+    backend._client = httpx.AsyncClient(base_url=backend.base_url, transport=httpx.MockTransport(handler))
+    return backend
+
+
+def test_pool_closes_only_after_last_transport():
+    async def scenario():
+        backend = make_client(lambda request: httpx.Response(200, json=[]))
+        await backend.open()
+        await backend.open()
+        pool = backend.client
+
+        await backend.close()
+        assert backend._client is pool and not pool.is_closed
+
+        await backend.close()
+        assert backend._client is None and pool.is_closed
+
+    asyncio.run(scenario())
+
+
+def test_requests_share_the_pool_and_forward_the_token():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append((request.url.path, request.headers.get("authorization")))
+        return httpx.Response(200, json={"ok": True})
+
+    async def scenario():
+        backend = make_client(handler)
+        await backend.open()
+        pool = backend.client
+        for _ in range(3):
+            response = await backend.request("GET", "/contacts", jwt="token-1")
+            assert response.json() == {"ok": True}
+        assert backend.client is pool
+        assert backend.active == 0
+        await backend.close()
+
+    asyncio.run(scenario())
+    assert seen == [("/api/contacts", "Bearer token-1")] * 3
@@ -0,0 +1,143 @@
+"""Batch references: whole-value substitution, escaping and dependency planning"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from batch import BatchError, find_references, is_reference, plan_dependencies, resolve_references, run_batch
+
+RESULTS = [
+    [{"id": "contact-1", "firstName": "Jane"}],
+    {"items": [{"id": "pipeline-1", "stages": [{"id": "stage-1"}, {"id": "stage-2"}]}], "total": 1},
+    {"id": "deal-9", "value": 2500},
+]
+
+
+def test_whole_value_reference_keeps_type():
+    assert resolve_references("$0.0.id", RESULTS) == "contact-1"
+    assert resolve_references("$1.items.0.stages.1.id", RESULTS) == "stage-2"
+    assert resolve_references("$2.value", RESULTS) == 2500
+    assert resolve_references("$2", RESULTS) == RESULTS[2]
+
+
+def test_references_nested_in_arguments():
+    args = {"contactId": "$0.0.id", "tags": ["$2.id", "vip"], "meta": {"deal": "$2.id"}}
+    assert resolve_references(args, RESULTS) == {
+        "contactId": "contact-1", "tags": ["deal-9", "vip"], "meta": {"deal": "deal-9"},
+    }
+
+
+@pytest.mark.parametrize("text", [
+    "$2 million renewal",
+    "$5 upsell",
+    "Upgrade from $1.5 to $3 per seat",
+    "Paid $0.id in cash",
+    "$",
+    "US$100",
+])
+def test_dollar_amounts_in_text_are_not_references(text):
+    assert not is_reference(text)
+    assert find_references({"notes": text}) == set()
+    assert resolve_references({"notes": text}, RESULTS) == {"notes": text}
+
+
+def test_escaped_reference_is_passed_literally():
+    assert not is_reference("$$0.id")
+    assert find_references("$$0.id") == set()
+    assert resolve_references("$$0.id", RESULTS) == "$0.id"
+    assert resolve_references("$$ money", RESULTS) == "$$ money"
+
+
+def test_bad_references_raise():
+    with pytest.raises(BatchError, match="not found"):
+        resolve_references("$0.0.email", RESULTS)
+    with pytest.raises(BatchError, match="out of range"):
+        resolve_references("$0.5.id", RESULTS)
+
+
+def test_plan_ignores_dollar_text_and_orders_writes():
+    is_read = lambda tool: tool.endswith(("_list", "_search"))
+    steps = [
+        {"tool_name": "contacts_search", "arguments": {"query": "Jane"}},
+        {"tool_name": "pipelines_list", "arguments": {}},
+        {"tool_name": "deals_create", "arguments": {"contactId": "$0.0.id", "title": "$1 upsell"}},
+        {"tool_name": "deals_list", "arguments": {}},
+    ]
+    assert plan_dependencies(steps, is_read) == [set(), set(), {0, 1}, {2}]
+
+
+def test_forward_reference_is_rejected():
+    steps = [{"tool_name": "contacts_get", "arguments": {"contactId": "$1.id"}},
+             {"tool_name": "contacts_list", "arguments": {}}]
+    with pytest.raises(BatchError, match="has not run yet"):
+        plan_dependencies(steps, lambda tool: True)
+
+
+def test_run_batch_passes_text_through_and_skips_dependents_of_failures():
+    calls = []
+
+    async def execute(tool, args):
+        calls.append((tool, args))
+        if tool == "contacts_search":
+            return True, [{"id": "contact-7"}]
+        if tool == "tickets_get":
+            return False, "not found"
+        return True, {"id": "deal-1", **args}
+
+    steps = [
+        {"tool_name": "contacts_search", "arguments": {"query": "Jane"}},
+        {"tool_name": "deals_create", "arguments": {"contactId": "$0.0.id", "title": "$2 million renewal"}},
+        {"tool_name": "tickets_get", "arguments": {"ticketId": "t-1"}},
+        {"tool_name": "tickets_comment", "arguments": {"ticketId": "$2.id", "comment": "hi"}},
+    ]
+    result = asyncio.run(run_batch(steps, execute, lambda tool: tool.endswith(("_search", "_get"))))
+    outcomes = result["results"]
+
+    assert outcomes[1]["data"]["contactId"] == "contact-7"
+    assert outcomes[1]["data"]["title"] == "$2 million renewal"
+    assert outcomes[2]["ok"] is False
+    assert outcomes[3]["error"] == "Skipped: step 2 failed"
+    assert [tool for tool, _ in calls] == ["contacts_search", "deals_create", "tickets_get"]
+
+
+def test_missing_or_null_arguments_default_to_empty():
+    seen = []
+
+    async def execute(tool, args):
+        seen.append(args)
+        return True, []
+
+    steps = [{"tool_name": "contacts_list", "arguments": None}, {"tool_name": "deals_list"}]
+    result = asyncio.run(run_batch(steps, execute, lambda tool: True))
+    assert seen == [{}, {}] and all(r["ok"] for r in result["results"])
+
+
+@pytest.mark.parametrize("arguments", ["contacts", ["a"], 3])
+def test_non_object_arguments_are_rejected(arguments):
+    async def execute(tool, args):
+        return True, []
+
+    with pytest.raises(BatchError, match="Step 0 arguments must be an object"):
+        asyncio.run(run_batch([{"tool_name": "contacts_list", "arguments": arguments}], execute, lambda tool: True))
+
+
+def test_unexpected_step_error_fails_only_that_step():
+    async def execute(tool, args):
+        if tool == "deals_list":
+            raise AttributeError("'NoneType' object has no attribute 'items'")
+        return True, [{"id": "contact-1"}]
+
+    steps = [{"tool_name": "deals_list"}, {"tool_name": "contacts_list"}]
+    outcomes = asyncio.run(run_batch(steps, execute, lambda tool: True))["results"]
+    assert outcomes[0]["ok"] is False and "NoneType" in outcomes[0]["error"]
+    assert outcomes[1]["ok"] is True
+
+
+def test_batch_call_tool_with_null_arguments(make_server):
+    server = make_server(lambda request: httpx.Response(200, json=[{"id": "contact-1"}]),
+                         MCP_CACHE_ENABLED="false", MCP_PIPELINE_PREFETCH="false")
+    result = asyncio.run(server.execute_tool(
+        "batch_call", {"calls": [{"tool_name": "contacts_list", "arguments": None}], "jwt": "opaque-token"},
+    ))
+    assert '"ok":true' in result[0].text.replace(" ", "")
@@ -0,0 +1,90 @@
+"""Request coalescing: one backend call per key, failures shared and never kept"""
+
+import asyncio
+
+import httpx
+
+from coalescing import RequestCoalescer
+
+
+def test_concurrent_callers_share_one_call():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"items": [1]}
+
+    async def scenario():
+        return await asyncio.gather(*(coalescer.run("key", "contacts_list", load) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1 and all(result is results[0] for result in results)
+    assert coalescer.stats() == {"contacts_list": {"requests": 5, "deduplicated": 4}}
+    assert coalescer.in_flight == 0
+
+
+def test_failing_leader_fails_waiters_and_is_forgotten():
+    coalescer = RequestCoalescer()
+    calls = []
+
+    async def failing():
+        calls.append("fail")
+        await asyncio.sleep(0.01)
+        raise httpx.ConnectError("backend down")
+
+    async def working():
+        calls.append("ok")
+        return "fresh"
+
+    async def scenario():
+        outcomes = await asyncio.gather(
+            *(coalescer.run("key", "deals_list", failing) for _ in range(3)), return_exceptions=True,
+        )
+        assert coalescer.in_flight == 0
+        return outcomes, await coalescer.run("key", "deals_list", working)
+
+    outcomes, retry = asyncio.run(scenario())
+    assert all(isinstance(outcome, httpx.ConnectError) for outcome in outcomes)
+    assert calls == ["fail", "ok"] and retry == "fresh"
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    coalescer = RequestCoalescer()
+
+    async def load():
+        await asyncio.sleep(0.02)
+        return "shared"
+
+    async def scenario():
+        leader = asyncio.ensure_future(coalescer.run("key", "deals_list", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(coalescer.run("key", "deals_list", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+        return await waiter
+
+    assert asyncio.run(scenario()) == "shared"
+
+
+def test_server_failure_reaches_every_caller_and_is_not_cached(make_server):
+    calls = []
+
+    async def backend(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        await asyncio.sleep(0.01)
+        if len(calls) == 1:
+            return httpx.Response(500, json={"message": "boom"})
+        return httpx.Response(200, json=[{"id": "deal-1"}])
+
+    server = make_server(backend, MCP_PIPELINE_PREFETCH="false", MCP_BACKEND_RETRIES="0")
+    invoke = server.invoke_backend
+
+    async def scenario():
+        failed = await asyncio.gather(*(invoke("deals_list", {}, "opaque-token") for _ in range(3)))
+        return failed, await invoke("deals_list", {}, "opaque-token")
+
+    failed, retried = asyncio.run(scenario())
+    assert failed == [(False, "boom")] * 3
+    assert retried[0] is True and len(calls) == 2
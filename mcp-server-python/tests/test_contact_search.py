@@ -0,0 +1,30 @@
+"""Local contact search: exact and prefix matches rank first, typos still match"""
+
+from contact_search import TenantContacts
+
+
+def tenant(records):
+    contacts = TenantContacts(max_contacts=10000)
+    contacts.replace_all(records)
+    return contacts
+
+
+def ids(results):
+    return [record["id"] for record in results]
+
+
+def test_broad_query_keeps_exact_match_first():
+    records = [{"id": f"c{i}", "firstName": "Johnathan", "lastName": f"Smith{i}"} for i in range(500)]
+    records.append({"id": "john", "firstName": "John"})
+    assert ids(tenant(records).search("john", 3, 0.5))[0] == "john"
+
+
+def test_prefix_beats_substring_in_broad_query():
+    records = [{"id": f"c{i}", "firstName": "Ann", "lastName": f"Marjohnson{i}"} for i in range(300)]
+    records.append({"id": "prefix", "firstName": "Johnny", "lastName": "Walker"})
+    assert ids(tenant(records).search("john", 1, 0.5)) == ["prefix"]
+
+
+def test_typo_still_matches():
+    contacts = tenant([{"id": "c1", "firstName": "John", "lastName": "Smith"}, {"id": "c2", "firstName": "Mary"}])
+    assert ids(contacts.search("jhon smith", 5, 0.4)) == ["c1"]
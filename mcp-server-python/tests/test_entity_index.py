@@ -0,0 +1,101 @@
+"""Entity index: entries expire, full lists replace, misses re-fetch from the backend"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import entity_index
+from entity_index import EntityIndex
+
+PIPELINES = [
+    {"id": "pipeline-1", "name": "Sales", "stages": [{"id": "stage-1", "name": "Proposal"}]},
+    {"id": "pipeline-2", "name": "Renewals", "stages": [{"id": "stage-2", "name": "Closing"}]},
+]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(entity_index, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def names(matches):
+    return [match["name"] for match in matches]
+
+
+def test_entries_expire_after_ttl(clock):
+    index = EntityIndex(ttl=60)
+    index.observe("tenant", "pipelines_list", {}, PIPELINES)
+    assert names(index.resolve("tenant", "pipeline", "sales")) == ["Sales"]
+    assert index.tenant("tenant").is_fresh("pipeline") and index.tenant("tenant").is_fresh("stage")
+
+    clock[0] += 61
+    assert not index.tenant("tenant").is_fresh("pipeline")
+    assert index.resolve("tenant", "pipeline", "sales") == []
+    assert index.resolve("tenant", "stage", "proposal") == []
+
+
+def test_full_list_replaces_entries(clock):
+    index = EntityIndex()
+    index.observe("tenant", "pipelines_list", {}, PIPELINES)
+    index.observe("tenant", "pipelines_list", {}, PIPELINES[:1])
+    assert index.resolve("tenant", "pipeline", "renewals") == []
+    assert index.resolve("tenant", "stage", "closing") == []
+
+    index.observe("tenant", "contacts_list", {}, [{"id": "c1", "firstName": "Ann"}, {"id": "c2", "firstName": "Bob"}])
+    index.observe("tenant", "contacts_list", {}, [{"id": "c1", "firstName": "Ann"}])
+    assert index.resolve("tenant", "contact", "bob") == []
+    assert names(index.resolve("tenant", "contact", "ann")) == ["Ann"]
+
+    # A filtered search only adds
+    index.observe("tenant", "contacts_search", {"query": "cy"}, [{"id": "c3", "firstName": "Cy"}])
+    assert names(index.resolve("tenant", "contact", "ann")) == ["Ann"]
+
+
+def test_stages_list_replaces_only_its_pipeline(clock):
+    index = EntityIndex()
+    index.observe("tenant", "pipelines_list", {}, PIPELINES)
+    index.observe("tenant", "stages_list", {"pipelineId": "pipeline-1"}, [{"id": "stage-3", "name": "Won"}])
+    assert index.resolve("tenant", "stage", "proposal") == []
+    assert names(index.resolve("tenant", "stage", "won")) == ["Won"]
+    assert names(index.resolve("tenant", "stage", "closing")) == ["Closing"]
+
+
+def test_cached_full_list_is_reindexed_once_stale(clock):
+    index = EntityIndex(ttl=60)
+    index.observe("tenant", "pipelines_list", {}, PIPELINES)
+    index.observe("tenant", "pipelines_list", {}, PIPELINES[:1], refresh=False)
+    assert names(index.resolve("tenant", "pipeline", "renewals")) == ["Renewals"]
+
+    clock[0] += 61
+    index.observe("tenant", "pipelines_list", {}, PIPELINES[:1], refresh=False)
+    assert index.resolve("tenant", "pipeline", "renewals") == []
+    assert names(index.resolve("tenant", "pipeline", "sales")) == ["Sales"]
+
+
+def test_resolve_refetches_once_on_a_miss(make_server):
+    pipelines = list(PIPELINES[:1])
+    calls = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/pipelines"):
+            calls.append(request.url.path)
+            return httpx.Response(200, json=pipelines)
+        return httpx.Response(404, json={"message": "not found"})
+
+    server = make_server(backend, MCP_CACHE_ENABLED="false", MCP_PIPELINE_PREFETCH="false")
+    resolve = server.resolve_entity
+
+    ok, found = asyncio.run(resolve({"type": "pipeline", "query": "sales"}, "opaque-token"))
+    assert ok and names(found) == ["Sales"] and len(calls) == 1
+
+    # Created elsewhere after the full list was indexed
+    pipelines.append(PIPELINES[1])
+    ok, found = asyncio.run(resolve({"type": "pipeline", "query": "renewals"}, "opaque-token"))
+    assert ok and names(found) == ["Renewals"] and len(calls) == 2
+
+    ok, found = asyncio.run(resolve({"type": "pipeline", "query": "renewals"}, "opaque-token"))
+    assert ok and len(calls) == 2
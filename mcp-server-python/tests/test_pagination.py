@@ -0,0 +1,78 @@
+"""List paging: cursors, limits and sort order"""
+
+import pytest
+
+from pagination import PaginationError, decode_cursor, encode_cursor, paginate, sort_items, split_page_args
+
+DEALS = [
+    {"id": "d1", "title": "beta", "value": 300},
+    {"id": "d2", "title": "Alpha", "value": None},
+    {"id": "d3", "title": "gamma", "value": 100},
+    {"id": "d4", "title": "delta"},
+    {"id": "d5", "title": "alpha", "value": 300},
+]
+
+
+def ids(items):
+    return [item["id"] for item in items]
+
+
+def test_split_page_args():
+    page, rest = split_page_args({"limit": 5, "cursor": "", "status": "OPEN", "sort": None})
+    assert page == {"limit": 5}
+    assert rest == {"status": "OPEN"}
+
+
+def test_ascending_sort_puts_missing_values_last():
+    assert ids(sort_items(DEALS, "value")) == ["d3", "d1", "d5", "d2", "d4"]
+
+
+def test_descending_sort_puts_missing_values_last():
+    assert ids(sort_items(DEALS, "-value")) == ["d1", "d5", "d3", "d2", "d4"]
+
+
+def test_multi_key_sort_is_stable_and_case_insensitive():
+    assert ids(sort_items(DEALS, "-value,title")) == ["d5", "d1", "d3", "d2", "d4"]
+    assert ids(sort_items(DEALS, "title")) == ["d2", "d5", "d1", "d4", "d3"]
+
+
+def test_sort_by_nested_field():
+    items = [{"id": "a", "contact": {"name": "Zed"}}, {"id": "b"}, {"id": "c", "contact": {"name": "Amy"}}]
+    assert ids(sort_items(items, "-contact.name")) == ["a", "c", "b"]
+
+
+def test_cursor_walks_every_item_once():
+    items = [{"id": str(i), "value": i % 7} for i in range(23)]
+    seen, cursor = [], None
+    while True:
+        args = {"limit": 5, "sort": "-value"}
+        if cursor:
+            args["cursor"] = cursor
+        page = paginate(items, args)
+        assert page["total"] == 23
+        seen += ids(page["items"])
+        cursor = page["nextCursor"]
+        if cursor is None:
+            break
+    assert seen == ids(sort_items(items, "-value"))
+    assert len(set(seen)) == 23
+
+
+def test_cursor_must_match_sort():
+    cursor = encode_cursor(10, "-value")
+    assert decode_cursor(cursor, "-value") == 10
+    with pytest.raises(PaginationError, match="different sort"):
+        decode_cursor(cursor, "title")
+    with pytest.raises(PaginationError, match="Invalid cursor"):
+        decode_cursor("not-a-cursor!", None)
+
+
+@pytest.mark.parametrize("limit", [0, -3, "many"])
+def test_invalid_limit(limit):
+    with pytest.raises(PaginationError):
+        paginate(DEALS, {"limit": limit})
+
+
+def test_limit_is_capped():
+    items = [{"id": str(i)} for i in range(600)]
+    assert len(paginate(items, {"limit": 10_000})["items"]) == 500
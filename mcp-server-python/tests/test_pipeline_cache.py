@@ -0,0 +1,95 @@
+"""Pipeline metadata: wrong pipeline/stage IDs are refused locally with the valid choices"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import pipeline_cache
+from pipeline_cache import PipelineMetadataCache
+
+PIPELINES = [
+    {"id": "p1", "name": "Sales", "stages": [{"id": "s1", "name": "Lead"}, {"id": "s2", "name": "Won"}]},
+    {"id": "p2", "name": "Renewals", "stages": [{"id": "s3", "name": "Due"}]},
+]
+
+
+@pytest.fixture
+def cache():
+    cache = PipelineMetadataCache(ttl=60)
+    cache.store("tenant-1", PIPELINES)
+    return cache
+
+
+def test_unknown_stage_lists_the_valid_choices(cache):
+    tree = cache.get("tenant-1")
+    error = cache.validate(tree, "deals_create", {"pipelineId": "p1", "stageId": "bogus"})
+    assert error == "Unknown stageId 'bogus'. Stages in pipeline Sales: Lead=s1, Won=s2"
+    error = cache.validate(tree, "deals_move", {"stageId": "bogus"})
+    assert error == "Unknown stageId 'bogus'. Stages: Lead=s1, Won=s2, Due=s3"
+
+
+def test_unknown_pipeline_and_foreign_stage(cache):
+    tree = cache.get("tenant-1")
+    error = cache.validate(tree, "deals_create", {"pipelineId": "p9", "stageId": "s1"})
+    assert error == "Unknown pipelineId 'p9'. Pipelines: Sales=p1, Renewals=p2"
+    error = cache.validate(tree, "deals_create", {"pipelineId": "p2", "stageId": "s1"})
+    assert error.startswith("Stage 'Lead' (s1) belongs to pipeline Sales, not Renewals.")
+    assert error.endswith("Stages in Renewals: Due=s3")
+
+
+def test_valid_and_unvalidated_arguments_pass(cache):
+    tree = cache.get("tenant-1")
+    assert cache.validate(tree, "deals_create", {"pipelineId": "p1", "stageId": "s2"}) is None
+    assert cache.validate(tree, "deals_update", {"stageId": "bogus"}) is None
+
+
+def test_unlisted_stages_are_not_rejected():
+    cache = PipelineMetadataCache()
+    cache.store("tenant-1", [{"id": "p1", "name": "Sales"}])       # no nested stages
+    tree = cache.get("tenant-1")
+    assert cache.validate(tree, "deals_create", {"pipelineId": "p1", "stageId": "s9"}) is None
+
+    cache.add_stages("tenant-1", "p1", [{"id": "s1", "name": "Lead"}])
+    assert cache.validate(tree, "deals_create", {"pipelineId": "p1", "stageId": "s9"}) is not None
+
+
+def test_tree_expires_and_is_dropped_by_writes(cache, monkeypatch):
+    now = [pipeline_cache.time.monotonic()]
+    monkeypatch.setattr(pipeline_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    cache.observe("tenant-1", "stages_create", {"pipelineId": "p1"}, {"id": "s4"})
+    assert cache.get("tenant-1") is None
+
+    cache.store("tenant-1", PIPELINES)
+    cache.observe("tenant-1", "pipelines_list", {}, [], refresh=False)     # cached result keeps the tree
+    assert "p1" in cache.get("tenant-1").pipelines
+    now[0] += 61
+    assert cache.get("tenant-1") is None
+
+
+def test_server_refuses_bad_stage_without_posting(make_server):
+    calls = []
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.url.path.endswith("/pipelines"):
+            return httpx.Response(200, json=PIPELINES)
+        return httpx.Response(201, json={"id": "deal-1"})
+
+    server = make_server(backend, MCP_PIPELINE_PREFETCH="false")
+
+    async def scenario():
+        refused = await server.invoke_backend(
+            "deals_create", {"title": "Acme", "pipelineId": "p1", "stageId": "bogus"}, "opaque-token",
+        )
+        created = await server.invoke_backend(
+            "deals_create", {"title": "Acme", "pipelineId": "p1", "stageId": "s1"}, "opaque-token",
+        )
+        return refused, created
+
+    refused, created = asyncio.run(scenario())
+    assert refused == (False, "Unknown stageId 'bogus'. Stages in pipeline Sales: Lead=s1, Won=s2")
+    assert created[0] is True
+    assert [method for method, _ in calls] == ["GET", "POST"]
+    assert server.pipeline_cache.rejected == 1
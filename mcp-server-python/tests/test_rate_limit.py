@@ -0,0 +1,77 @@
+"""Rate limiting: batch_call cost and class, refused requests charge nothing"""
+
+import time
+
+import httpx
+import jwt as pyjwt
+import pytest
+
+import session_claims
+from rate_limit import Identity, RateLimited, RateLimiter, RateRule, request_identity
+from session_claims import ClaimsCache
+from shared_state import SQLiteStateBackend
+
+ALICE = Identity("tenant-1", "alice")
+BOB = Identity("tenant-1", "bob")
+
+
+def limiter(shared=None):
+    rules = {("tenant", "read"): RateRule(0.001, 5), ("user", "read"): RateRule(0.001, 2)}
+    return RateLimiter(rules=rules, shared=shared)
+
+
+@pytest.mark.parametrize("shared", [False, True])
+def test_user_refusal_leaves_tenant_bucket_untouched(shared, tmp_path):
+    rate_limiter = limiter(SQLiteStateBackend(tmp_path / "state.sqlite3") if shared else None)
+    rate_limiter.check_rate(ALICE, "read", 2)
+    for _ in range(5):
+        with pytest.raises(RateLimited) as refused:
+            rate_limiter.check_rate(ALICE, "read")
+        assert refused.value.scope == "user"
+
+    # Only alice's 2 tokens were taken from the tenant's 5
+    rate_limiter.check_rate(BOB, "read", 2)
+    rate_limiter.check_rate(Identity("tenant-1", "carol"), "read")
+    with pytest.raises(RateLimited) as refused:
+        rate_limiter.check_rate(Identity("tenant-1", "dave"), "read")
+    assert refused.value.scope == "tenant"
+
+
+def backend(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(404, json={"message": "not found"})
+
+
+def test_batch_call_is_charged_by_its_calls(make_server):
+    server = make_server(backend)
+    reads = {"calls": [{"tool_name": "contacts_list"}, {"tool_name": "deals_list"}, {"tool_name": "resolve"}]}
+    mixed = {"calls": [{"tool_name": "contacts_search"}, {"tool_name": "deals_create", "arguments": {}}]}
+
+    admission = server.admit("token", [("batch_call", reads)])
+    assert (admission.tool_class, admission.cost) == ("read", 3)
+    admission = server.admit("token", [("batch_call", mixed)])
+    assert (admission.tool_class, admission.cost) == ("write", 2)
+
+    # /mcp/call-tools with a nested batch_call
+    admission = server.admit("token", [("contacts_list", {}), ("batch_call", reads)])
+    assert (admission.tool_class, admission.cost) == ("read", 4)
+    admission = server.admit("token", [("contacts_list", {})])
+    assert (admission.tool_class, admission.cost) == ("read", 1)
+
+
+def test_default_config_limits_per_tenant_across_tokens(monkeypatch):
+    # No MCP_JWT_SECRET / JWKS: claims are decoded but not verified
+    monkeypatch.setattr(session_claims, "_cache", ClaimsCache())
+    claims = {"sub": "alice", "tenantId": "tenant-1", "exp": int(time.time()) + 600}
+    tokens = [pyjwt.encode({**claims, "iat": i}, f"key-{i}-long-enough-for-hs256-signing", algorithm="HS256")
+              for i in range(3)]
+    identities = {request_identity(token) for token in tokens}
+    assert identities == {Identity("tenant-1", "alice")}
+    assert request_identity("telegram:42:tenant-1") == Identity("tenant-1", "telegram:42")
+
+    # Switching tokens does not reset the tenant's bucket
+    rate_limiter = RateLimiter(rules={("tenant", "write"): RateRule(0.001, 2)})
+    for token in tokens[:2]:
+        rate_limiter.check_rate(request_identity(token), "write")
+    with pytest.raises(RateLimited) as refused:
+        rate_limiter.check_rate(request_identity(tokens[2]), "write")
+    assert refused.value.scope == "tenant"
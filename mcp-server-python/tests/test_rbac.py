@@ -0,0 +1,85 @@
+"""RBAC parity: the local role tables refuse exactly what the backend controllers refuse"""
+
+import re
+from pathlib import Path
+
+import pytest
+
+from rbac import ROLE_BITS, ToolPermissions, rbac, rbac_class
+from tool_registry import TOOL_REGISTRY
+
+SERVER_SRC = Path(__file__).resolve().parents[2] / "server" / "src"
+
+_CONTROLLER = re.compile(r"@Controller\('([^']*)'\)")
+_ROUTE = re.compile(r"@(Get|Post|Patch|Put|Delete)\((?:'([^']*)')?\)")
+_ROLE_CHECK = re.compile(r"\.role !== UserRole\.(\w+)")
+
+
+def backend_routes():
+    """(method, path segments, roles allowed) for every controller handler"""
+    routes = []
+    for source in SERVER_SRC.rglob("*.controller.ts"):
+        text = source.read_text(encoding="utf-8")
+        controller = _CONTROLLER.search(text)
+        if controller is None:
+            continue
+        matches = list(_ROUTE.finditer(text))
+        for index, route in enumerate(matches):
+            body = text[route.end():matches[index + 1].start() if index + 1 < len(matches) else len(text)]
+            allowed = set(_ROLE_CHECK.findall(body)) or set(ROLE_BITS)
+            path = "/".join(part for part in (controller.group(1), route.group(2) or "") if part)
+            routes.append((route.group(1).upper(), path.split("/"), allowed))
+    return routes
+
+
+def backend_roles(routes, method, path):
+    """Roles the backend lets through for a tool route (None when it has no such route)"""
+    segments = path.strip("/").split("/")
+    candidates = [
+        (sum(part.startswith(":") for part in parts), allowed)
+        for route_method, parts, allowed in routes
+        if route_method == method and len(parts) == len(segments)
+        and all(p == s or (p.startswith(":") and s.startswith("{")) for p, s in zip(parts, segments))
+    ]
+    return min(candidates, key=lambda candidate: candidate[0])[1] if candidates else None
+
+
+@pytest.fixture(scope="module")
+def routes():
+    if not SERVER_SRC.is_dir():
+        pytest.skip("backend sources not available")
+    return backend_routes()
+
+
+def test_local_denials_match_backend_controllers(routes):
+    checked = 0
+    for name, spec in TOOL_REGISTRY.items():
+        if spec.method is None:
+            continue
+        allowed = backend_roles(routes, spec.method, spec.path)
+        if allowed is None:
+            continue  # no backend route - nothing to mirror
+        checked += 1
+        for role in ROLE_BITS:
+            assert (rbac.denial(role, name) is None) == (role in allowed), f"{role} {name}"
+    assert checked > 30
+
+
+def test_backend_role_checks_are_found(routes):
+    assert backend_roles(routes, "POST", "/users/invite") == {"ADMIN", "MANAGER"}
+    assert backend_roles(routes, "PATCH", "/users/{userId}/role") == {"ADMIN"}
+    assert backend_roles(routes, "DELETE", "/contacts/{contactId}") == {"ADMIN", "MANAGER"}
+    assert backend_roles(routes, "DELETE", "/deals/{dealId}") == set(ROLE_BITS)
+
+
+def test_classes_and_messages():
+    assert rbac_class("users_invite") == "manager"
+    assert rbac_class("users_deactivate") == "admin"
+    assert rbac_class("contacts_delete") == "manager"
+    assert rbac_class("deals_delete") == "member"
+    assert "Only ADMINs" in rbac.denial("MANAGER", "users_update_role")
+    assert "MEMBERs cannot access" in rbac.denial("member", "users_invite")
+    assert rbac.denial(None, "users_deactivate") is None
+    assert rbac.denial("OWNER", "users_deactivate") is None
+    assert rbac.denial("authenticated", "users_deactivate") is None   # unknown roles: backend decides
+    assert set(ToolPermissions.ADMIN_ONLY).isdisjoint(ToolPermissions.MANAGER_ALLOWED)
@@ -0,0 +1,128 @@
+"""Backend resilience: circuit breaker states, GET-only retries, one outcome per stream"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import resilience
+from backend_client import BackendClient
+from resilience import CLOSED, HALF_OPEN, OPEN, BackendUnavailable, CircuitBreaker, ResiliencePolicy
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(resilience, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def client(handler, **policy):
+    settings = {"failure_threshold": 3, "open_seconds": 10, "retries": 2, "backoff_base": 0, **policy}
+    backend = BackendClient("http://backend.test/api", resilience=ResiliencePolicy(**settings))
+    backend._client = httpx.AsyncClient(base_url=backend.base_url, transport=httpx.MockTransport(handler))
+    return backend
+
+
+def test_breaker_opens_probes_and_closes(clock):
+    breaker = CircuitBreaker("deals", failure_threshold=2, open_seconds=10)
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(BackendUnavailable) as refused:
+        breaker.before_request()
+    assert refused.value.retry_after == pytest.approx(10)
+
+    clock[0] += 10
+    breaker.before_request()                  # the single half-open probe
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(BackendUnavailable):
+        breaker.before_request()              # no second probe while the first is out
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    breaker.before_request()
+
+
+def test_failed_probe_reopens(clock):
+    breaker = CircuitBreaker("deals", failure_threshold=1, open_seconds=10)
+    breaker.record_failure()
+    clock[0] += 10
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    with pytest.raises(BackendUnavailable):
+        breaker.before_request()
+
+
+def test_get_is_retried_and_post_is_not():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if request.method == "GET" and len(calls) < 3:
+            return httpx.Response(503)
+        return httpx.Response(503 if request.method == "POST" else 200, json=[])
+
+    backend = client(handler, failure_threshold=10)
+
+    async def scenario():
+        got = await backend.request("GET", "/deals")
+        posted = await backend.request("POST", "/deals", json={"title": "Acme"})
+        return got.status_code, posted.status_code
+
+    assert asyncio.run(scenario()) == (200, 503)
+    assert calls == ["GET", "GET", "GET", "POST"]
+    assert backend.resilience.retried == 2
+
+
+def test_open_circuit_fails_fast_without_calling_backend():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        raise httpx.ConnectError("refused")
+
+    backend = client(handler, failure_threshold=2)
+
+    async def scenario():
+        with pytest.raises(httpx.ConnectError):
+            await backend.request("GET", "/contacts")     # opens after the 2nd attempt, no 3rd
+        with pytest.raises(BackendUnavailable):
+            await backend.request("GET", "/contacts/42")
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
+    assert backend.resilience.breaker("contacts").state == OPEN
+    assert backend.resilience.breaker("deals").state == CLOSED
+
+
+class BrokenBody(httpx.AsyncByteStream):
+    async def __aiter__(self):
+        yield b'[{"id": 1},'
+        raise httpx.ReadError("connection reset")
+
+
+def test_stream_records_one_outcome_after_the_body(monkeypatch):
+    outcomes = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/broken"):
+            return httpx.Response(200, stream=BrokenBody())
+        return httpx.Response(200, json=[{"id": 1}])
+
+    backend = client(handler)
+    policy = backend.resilience
+    monkeypatch.setattr(policy, "record", lambda family, seconds, failed, timed_out=False: outcomes.append(failed))
+
+    async def read(path):
+        async with backend.stream("GET", path) as response:
+            async for _ in response.aiter_bytes():
+                pass
+
+    asyncio.run(read("/contacts"))
+    with pytest.raises(httpx.ReadError):
+        asyncio.run(read("/contacts/broken"))
+    assert outcomes == [False, True]
+    assert backend.active == 0
@@ -0,0 +1,112 @@
+"""Response cache: TTL/LRU eviction and family invalidation on writes"""
+
+import asyncio
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import response_cache
+from response_cache import ResponseCache
+from shared_state import SQLiteStateBackend
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache, "time", SimpleNamespace(monotonic=lambda: now[0]))
+    return now
+
+
+def key(tool, subject="tenant-1", **args):
+    return ResponseCache.make_key(subject, tool, args)
+
+
+@pytest.fixture(params=["local", "shared"])
+def cache(request, tmp_path):
+    shared = SQLiteStateBackend(tmp_path / "state.sqlite3") if request.param == "shared" else None
+    return ResponseCache(shared=shared)
+
+
+def test_write_invalidates_its_families_only(cache):
+    for tool in ("contacts_list", "deals_list", "tickets_list", "pipelines_list"):
+        cache.set(key(tool), [tool], 10)
+    cache.set(key("deals_list", subject="tenant-2"), ["other"], 10)
+
+    assert cache.invalidate_for_write("tenant-1", "deals_create") == 3  # deals, contacts, pipelines
+    assert cache.get(key("deals_list")) is None
+    assert cache.get(key("contacts_list")) is None
+    assert cache.get(key("pipelines_list")) is None
+    assert cache.get(key("tickets_list")) == ["tickets_list"]
+    assert cache.get(key("deals_list", subject="tenant-2")) == ["other"]
+
+
+def test_tool_override_invalidates_cross_family(cache):
+    cache.set(key("deals_list"), [], 10)
+    cache.set(key("leads_list"), [], 10)
+    cache.invalidate_for_write("tenant-1", "leads_convert")
+    assert cache.get(key("deals_list")) is None and cache.get(key("leads_list")) is None
+
+
+def test_equivalent_arguments_share_an_entry():
+    assert key("deals_list", stage="a", pipeline="b") == key("deals_list", pipeline="b", stage="a")
+
+
+def test_entries_expire_after_their_tool_ttl(clock):
+    cache = ResponseCache(ttls={"contacts_list": 30, "pipelines_list": 300})
+    cache.set(key("contacts_list"), ["c"], 10)
+    cache.set(key("pipelines_list"), ["p"], 10)
+    clock[0] += 31
+    assert cache.get(key("contacts_list")) is None
+    assert cache.get(key("pipelines_list")) == ["p"]
+    assert cache.stats()["entries"] == 1
+
+
+def test_uncached_tools_are_not_stored():
+    cache = ResponseCache()
+    cache.set(key("contacts_get", contactId="1"), {"id": "1"}, 10)
+    assert cache.get(key("contacts_get", contactId="1")) is None
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=100)
+    cache.set(key("contacts_list", page=1), [1], 10)
+    cache.set(key("contacts_list", page=2), [2], 10)
+    cache.get(key("contacts_list", page=1))                 # page 1 is now most recent
+    cache.set(key("contacts_list", page=3), [3], 10)
+    assert cache.get(key("contacts_list", page=2)) is None
+    assert cache.get(key("contacts_list", page=1)) == [1]
+
+    cache.set(key("deals_list"), ["big"], 95)
+    assert cache.total_bytes <= 100
+    assert cache.get(key("deals_list")) == ["big"]
+    assert cache.stats()["evictions"] == 3
+
+    cache.set(key("tickets_list"), ["too big"], 101)
+    assert cache.get(key("tickets_list")) is None
+
+
+def test_server_write_drops_cached_list(make_server):
+    calls = []
+    contacts = [{"id": "c1", "firstName": "Ann"}]
+
+    def backend(request: httpx.Request) -> httpx.Response:
+        calls.append((request.method, request.url.path))
+        if request.method == "POST":
+            contacts.append({"id": "c2", "firstName": "Bob"})
+            return httpx.Response(201, json=contacts[-1])
+        return httpx.Response(200, json=contacts)
+
+    server = make_server(backend, MCP_PIPELINE_PREFETCH="false", MCP_CONTACT_SEARCH="backend")
+    invoke = server.invoke_backend
+
+    async def scenario():
+        first = await invoke("contacts_list", {}, "opaque-token")
+        cached = await invoke("contacts_list", {}, "opaque-token")
+        await invoke("contacts_create", {"firstName": "Bob"}, "opaque-token")
+        fresh = await invoke("contacts_list", {}, "opaque-token")
+        return first, cached, fresh
+
+    first, cached, fresh = asyncio.run(scenario())
+    assert [m for m, _ in calls] == ["GET", "POST", "GET"]
+    assert first == cached and len(fresh[1]["items"]) == 2
@@ -0,0 +1,59 @@
+"""Result shaping: follow-up IDs in table rows, nested fields, budget cursor"""
+
+from pagination import paginate
+from result_shaper import ResultShaper
+
+DEALS = [
+    {"id": "deal-1", "title": "Renewal", "value": 5000, "stageId": "stage-1-2", "pipelineId": "pipeline-1",
+     "contactId": "contact-3", "stage": {"id": "stage-1-2", "name": "Proposal"},
+     "pipeline": {"id": "pipeline-1", "name": "Sales"},
+     "contact": {"id": "contact-3", "firstName": "Jane", "lastName": "Doe", "email": "jane@example.com"}},
+    # Backend variant that only nests the related records
+    {"id": "deal-2", "title": "Upsell", "value": 800, "stage": {"id": "stage-1-1", "name": "Lead"},
+     "pipeline": {"id": "pipeline-1", "name": "Sales"}, "contact": {"id": "contact-4", "firstName": "Sam"}},
+]
+
+
+def table(tool, data, args=None, max_bytes=16384):
+    return ResultShaper("table", max_bytes).render(tool, data, args or {}).splitlines()
+
+
+def test_deal_rows_keep_ids_for_follow_up_calls():
+    lines = table("deals_list", DEALS)
+    assert lines[1] == "id,title,value,stage,stageId,pipeline,pipelineId,contact,contactId"
+    assert lines[2] == "deal-1,Renewal,5000,Proposal,stage-1-2,Sales,pipeline-1,Jane Doe,contact-3"
+    assert lines[3] == "deal-2,Upsell,800,Lead,stage-1-1,Sales,pipeline-1,Sam,contact-4"
+
+
+def test_lead_and_ticket_rows_keep_contact_id():
+    leads = table("leads_list", [{"id": "lead-1", "title": "Inbound", "contactId": "contact-9"}])
+    tickets = table("tickets_list", [{"id": "ticket-1", "title": "Broken", "contact": {"id": "contact-2"}}])
+    assert leads[1].endswith(",contactId") and leads[2].endswith(",contact-9")
+    assert tickets[1].endswith(",contactId") and tickets[2].endswith(",contact-2")
+
+
+def test_dotted_fields_in_table_and_page():
+    lines = table("deals_list", DEALS, {"fields": "title,contact.email"})
+    assert lines[1] == "id,title,contact.email"
+    assert lines[2] == "deal-1,Renewal,jane@example.com"
+
+    page = paginate(DEALS, {"fields": "title,contact.email,stage.name,missing.field"})
+    assert page["items"][0] == {
+        "id": "deal-1", "title": "Renewal", "contact": {"email": "jane@example.com"}, "stage": {"name": "Proposal"},
+    }
+    # Missing nested fields are left out, not returned as empty objects
+    assert page["items"][1] == {"id": "deal-2", "title": "Upsell", "stage": {"name": "Lead"}}
+
+
+def test_projection_keeps_whole_parent_and_leaves_input_untouched():
+    page = paginate(DEALS, {"fields": "contact.email,contact"})
+    assert page["items"][0]["contact"] == DEALS[0]["contact"]
+    assert "lastName" in DEALS[0]["contact"]
+
+
+def test_budget_truncation_gives_a_cursor():
+    items = [{"id": f"contact-{i}", "firstName": f"First{i}", "email": f"c{i}@example.com"} for i in range(200)]
+    page = paginate(items, {"limit": 200})
+    lines = table("contacts_list", page, {"limit": 200}, max_bytes=600)
+    assert lines[0].startswith("contacts_list: rows 1-")
+    assert lines[-1].startswith("... truncated,") and 'cursor="' in lines[-1]
@@ -0,0 +1,62 @@
+"""Session subjects: only verified claims share caches per tenant/user"""
+
+import time
+
+import jwt as pyjwt
+import pytest
+
+import session_claims
+from rate_limit import request_identity
+from response_cache import ResponseCache, session_subject
+from session_claims import ClaimsCache
+
+SECRET = "test-secret-long-enough-for-hs256-keys"
+CLAIMS = {"sub": "user-1", "tenantId": "tenant-1", "role": "ADMIN"}
+
+
+def token(secret=SECRET, **extra):
+    return pyjwt.encode({**CLAIMS, "exp": int(time.time()) + 600, **extra}, secret, algorithm="HS256")
+
+
+@pytest.fixture
+def verifying(monkeypatch):
+    monkeypatch.setattr(session_claims, "_cache", ClaimsCache(secret=SECRET))
+
+
+@pytest.fixture
+def unverified(monkeypatch):
+    monkeypatch.setattr(session_claims, "_cache", ClaimsCache())
+
+
+def cache_key(jwt):
+    return ResponseCache.make_key(session_subject(jwt), "contacts_list", {})
+
+
+def test_verified_tokens_share_the_tenant_subject(verifying):
+    real, refreshed = token(), token(iat=1)
+    assert real != refreshed
+    assert session_subject(real) == session_subject(refreshed)
+    assert cache_key(real) == cache_key(refreshed)
+    assert request_identity(real) == request_identity(refreshed)
+    assert request_identity(real).tenant == "tenant-1"
+
+
+def test_forged_token_gets_its_own_subject(verifying):
+    real, forged = token(), token(secret="attacker-secret-long-enough-for-hs256")
+    assert not session_claims.session_claims(forged).valid
+    assert session_subject(forged) != session_subject(real)
+    assert cache_key(forged) != cache_key(real)
+    assert request_identity(forged).tenant != "tenant-1"
+
+
+def test_unverified_tokens_are_keyed_by_digest(unverified):
+    real, forged = token(), token(secret="attacker-secret-long-enough-for-hs256")
+    claims = session_claims.session_claims(forged)
+    assert claims.tenant == "tenant-1" and not claims.verified
+    assert session_subject(forged) == claims.digest != session_subject(real)
+    assert cache_key(forged) != cache_key(real)
+    # Rate limits still account the claimed tenant (see test_rate_limit)
+    assert request_identity(forged).tenant == "tenant-1"
+
+    telegram = session_claims.session_claims("telegram:42:tenant-1")
+    assert telegram.subject == telegram.digest
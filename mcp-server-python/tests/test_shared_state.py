@@ -0,0 +1,55 @@
+"""Shared state: backend selection and the SQLite store"""
+
+import pytest
+
+import shared_state
+from shared_state import SQLiteStateBackend, StateBackend, get_state_backend
+
+
+@pytest.fixture
+def fresh_selection(monkeypatch):
+    monkeypatch.setattr(shared_state, "_backend", None)
+    monkeypatch.setattr(shared_state, "_resolved", False)
+
+
+def test_interface_is_abstract():
+    with pytest.raises(TypeError):
+        StateBackend()
+
+
+def test_memory_mode_shares_nothing(monkeypatch, fresh_selection):
+    monkeypatch.setenv("MCP_STATE_BACKEND", "memory")
+    assert get_state_backend() is None
+
+
+def test_sqlite_mode_is_selected_once(monkeypatch, fresh_selection, tmp_path):
+    monkeypatch.setenv("MCP_STATE_BACKEND", "sqlite")
+    monkeypatch.setenv("MCP_STATE_PATH", str(tmp_path / "state.sqlite3"))
+    backend = get_state_backend()
+    assert isinstance(backend, SQLiteStateBackend)
+    assert get_state_backend() is backend
+    backend.close()
+
+
+def test_sqlite_values_tags_and_counters(tmp_path):
+    backend = SQLiteStateBackend(tmp_path / "state.sqlite3")
+    backend.set("a", b"1", ttl=60, tags=("contacts",))
+    backend.set("b", b"2", ttl=60, tags=("deals",))
+    backend.set("gone", b"3", ttl=-1)
+    assert backend.get("a") == b"1"
+    assert backend.get("gone") is None
+
+    assert backend.delete_tags(["contacts"]) == 1
+    assert backend.get("a") is None and backend.get("b") == b"2"
+
+    assert backend.incr("hits", 2) == 2
+    assert backend.incr("hits", 3) == 5
+
+    other = SQLiteStateBackend(tmp_path / "state.sqlite3")  # a second worker
+    assert other.get("b") == b"2"
+    assert other.incr("hits") == 6
+
+    backend.clear()
+    assert other.get("b") is None
+    backend.close()
+    other.close()
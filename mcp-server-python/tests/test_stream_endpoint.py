@@ -0,0 +1,44 @@
+"""Streamed *_list calls are counted in metrics and transcripts like execute_tool"""
+
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from metrics import TOOL_CALLS
+
+CONTACTS = [{"id": f"contact-{i}", "firstName": f"First{i}"} for i in range(3)]
+
+
+def backend(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/contacts"):
+        return httpx.Response(200, json=CONTACTS)
+    if request.url.path.endswith("/deals"):
+        return httpx.Response(500, json={"message": "boom"})
+    return httpx.Response(404, json={"message": "not found"})
+
+
+def stream(client: TestClient, tool: str):
+    response = client.post("/mcp/call-tool/stream", json={"tool_name": tool, "arguments": {}},
+                           headers={"Authorization": "Bearer opaque-token"})
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_stream_records_metrics_and_transcript(make_server, tmp_path):
+    transcript = tmp_path / "transcripts.jsonl"
+    server = make_server(backend, MCP_TRANSCRIPT_PATH=str(transcript), MCP_CACHE_ENABLED="false")
+    ok_before = TOOL_CALLS.value("contacts_list", "http", "ok")
+    error_before = TOOL_CALLS.value("deals_list", "http", "error")
+
+    with TestClient(server.http_app) as client:
+        events = stream(client, "contacts_list")
+        assert [e["type"] for e in events] == ["item"] * 3 + ["end"]
+        failed = stream(client, "deals_list")
+        assert failed[-1]["type"] == "error"
+
+    assert TOOL_CALLS.value("contacts_list", "http", "ok") == ok_before + 1
+    assert TOOL_CALLS.value("deals_list", "http", "error") == error_before + 1
+
+    recorded = [json.loads(line) for line in transcript.read_text().splitlines()]
+    assert [(r["tool"], r["ok"]) for r in recorded] == [("contacts_list", True), ("deals_list", False)]
+    assert recorded[0]["result_bytes"] > 0
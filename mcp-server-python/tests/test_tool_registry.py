@@ -0,0 +1,52 @@
+"""Tool registry: read-only definitions, list_tools output built once"""
+
+import hashlib
+import json
+
+import pytest
+
+from tool_registry import TOOL_REGISTRY, TOOLS, TOOLS_ETAG, TOOLS_JSON, _check_rbac, _define, thaw
+
+
+def test_spec_schemas_are_read_only():
+    schema = TOOL_REGISTRY["contacts_list"].input_schema
+    with pytest.raises(TypeError):
+        schema["properties"] = {}
+    with pytest.raises(TypeError):
+        schema["properties"]["limit"] = {"type": "string"}
+
+
+def test_list_tools_reuses_prebuilt_tools(make_server):
+    server = make_server(lambda request: None)
+    first, second = server.get_tool_list(), server.get_tool_list()
+    assert first is not second and all(a is b for a, b in zip(first, second))
+    first.clear()
+    assert len(server.get_tool_list()) == len(TOOLS) == len(TOOL_REGISTRY)
+
+
+def test_tool_schemas_are_separate_from_specs():
+    for tool in TOOLS:
+        assert tool.inputSchema is not TOOL_REGISTRY[tool.name].input_schema
+        assert isinstance(tool.inputSchema, dict)
+
+
+def test_tools_json_matches_registry_and_etag():
+    body = json.loads(TOOLS_JSON)
+    assert [tool["name"] for tool in body["tools"]] == list(TOOL_REGISTRY)
+    for tool in body["tools"]:
+        assert tool["inputSchema"] == thaw(TOOL_REGISTRY[tool["name"]].input_schema)
+    assert TOOLS_ETAG == f'"{hashlib.sha256(TOOLS_JSON).hexdigest()[:32]}"'
+
+
+def test_built_tools_serialize_like_tools_json():
+    dumped = [tool.model_dump(mode="json", exclude_none=True) for tool in TOOLS]
+    expected = json.loads(TOOLS_JSON)["tools"]
+    assert [(t["name"], t["inputSchema"]) for t in dumped] == [(t["name"], t["inputSchema"]) for t in expected]
+
+
+def test_rbac_disagreements_raise_even_without_asserts():
+    with pytest.raises(ValueError, match="Unknown RBAC class"):
+        _define("contacts_list", "List contacts", rbac="owner")
+    with pytest.raises(ValueError, match="disagrees with rbac.py"):
+        _check_rbac((_define("users_deactivate", "Deactivate a user", rbac="member"),))
+    _check_rbac(tuple(TOOL_REGISTRY.values()))
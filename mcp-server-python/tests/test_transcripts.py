@@ -0,0 +1,41 @@
+"""Transcript shaping: values are replaced, only batch references are kept"""
+
+import json
+import time
+
+from transcripts import TranscriptRecorder
+
+
+def record(tmp_path, tool, arguments, schema=None):
+    path = tmp_path / "transcripts.jsonl"
+    recorder = TranscriptRecorder(path=str(path))
+    recorder.record("subject", tool, arguments, "http", time.time(), 0.01, True, 10, schema)
+    return json.loads(path.read_text().splitlines()[-1])["args"]
+
+
+def test_values_become_placeholders(tmp_path):
+    schema = {"properties": {"status": {"enum": ["OPEN", "WON"]}}}
+    args = record(tmp_path, "deals_create", {
+        "title": "Acme renewal", "contactId": "c-1", "value": 1200, "status": "WON", "jwt": "secret",
+    }, schema)
+    assert args == {"title": "<text:12>", "contactId": "<id:0>", "value": "<num:1000>", "status": "WON"}
+
+
+def test_dollar_text_outside_batch_is_free_text(tmp_path):
+    args = record(tmp_path, "notes_create", {"content": "$0.id", "title": "$5 off this month"})
+    assert args == {"content": "<text:5>", "title": "<text:17>"}
+
+
+def test_only_whole_references_in_batch_steps_are_kept(tmp_path):
+    args = record(tmp_path, "batch_call", {"calls": [
+        {"tool_name": "contacts_search", "arguments": {"query": "$ales lead"}},
+        {"tool_name": "deals_create", "arguments": {
+            "contactId": "$0.0.id", "title": "Deal for $0.0.id", "notes": "$$0.id", "jwt": "secret",
+        }},
+    ]})
+    assert args["calls"] == [
+        {"tool_name": "contacts_search", "arguments": {"query": "<text:10>"}},
+        {"tool_name": "deals_create", "arguments": {
+            "contactId": "$0.0.id", "title": "<text:16>", "notes": "<text:6>",
+        }},
+    ]
@@ -0,0 +1,727 @@
+"""
+Declarative Tool Registry for Synapse MCP Server
+Built once at import time - schemas, backend routes and RBAC class per tool
+"""
+
+import re
+import json
+import hashlib
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from mcp.types import Tool
+
+from pagination import PAGINATION_PROPERTIES
+from rbac import rbac_class
+
+# RBAC classes (must agree with rbac.ToolPermissions - checked below)
+#   public  - auth tools, no session needed
+#   member  - MEMBER and above
+#   manager - MANAGER and ADMIN
+#   admin   - ADMIN only
+RBAC_CLASSES = ("public", "member", "manager", "admin")
+
+_PATH_PARAM = re.compile(r"\{(\w+)\}")
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Immutable definition of one MCP tool and its backend route"""
+    name: str
+    description: str
+    input_schema: Mapping[str, Any]       # read-only (see _freeze); thaw() for an editable copy
+    method: Optional[str] = None           # None for local tools (login/logout/whoami)
+    path: Optional[str] = None             # e.g. /contacts/{contactId}
+    path_params: Tuple[str, ...] = ()
+    query_params: Mapping[str, str] = field(default_factory=dict)  # argument -> query key
+    rbac_class: str = "member"
+    paginated: bool = False                # accepts limit/cursor/sort/fields
+    native_paging: bool = False            # backend pages itself (else emulated here)
+    read_only: bool = False                # local tool without side effects (e.g. resolve)
+
+    @property
+    def is_read(self) -> bool:
+        """True for idempotent GET tools and side-effect free local tools"""
+        return self.method == "GET" or self.read_only
+
+    def build_path(self, args: Dict[str, Any]) -> str:
+        """Substitute path parameters from tool arguments"""
+        path = self.path
+        for param in self.path_params:
+            path = path.replace(f"{{{param}}}", str(args[param]))
+        return path
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only deep view of a JSON schema: dicts become mappingproxies, lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: _freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Plain, caller-owned deep copy of a frozen schema"""
+    if isinstance(value, Mapping):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [thaw(item) for item in value]
+    return value
+
+
+def _define(
+    name: str,
+    description: str,
+    properties: Optional[Dict[str, Any]] = None,
+    required: Optional[List[str]] = None,
+    method: Optional[str] = None,
+    path: Optional[str] = None,
+    query: Optional[Dict[str, str]] = None,
+    rbac: str = "member",
+    paginate: bool = False,
+    native_paging: bool = False,
+    read_only: bool = False,
+) -> ToolSpec:
+    """Build a ToolSpec, deriving the JSON schema and path parameters"""
+    if rbac not in RBAC_CLASSES:
+        raise ValueError(f"Unknown RBAC class for {name}: {rbac}")
+
+    properties = dict(properties or {})
+    if paginate:
+        properties.update(PAGINATION_PROPERTIES)
+
+    schema: Dict[str, Any] = {"type": "object", "properties": properties}
+    if required:
+        schema["required"] = required
+
+    return ToolSpec(
+        name=name,
+        description=description,
+        input_schema=_freeze(schema),
+        method=method,
+        path=path,
+        path_params=tuple(_PATH_PARAM.findall(path or "")),
+        query_params=MappingProxyType(dict(query or {})),
+        rbac_class=rbac,
+        paginated=paginate,
+        native_paging=native_paging,
+        read_only=read_only,
+    )
+
+
+# ==================== TOOL DEFINITIONS ====================
+
+_SPECS: Tuple[ToolSpec, ...] = (
+    # AUTH (3)
+    _define(
+        name="login",
+        description="Login with email and password (CLI only)",
+        properties={
+            "email": {"type": "string", "format": "email"},
+            "password": {"type": "string"},
+        },
+        required=["email", "password"],
+        rbac="public",
+    ),
+    _define(
+        name="logout",
+        description="Logout and clear session",
+        rbac="public",
+    ),
+    _define(
+        name="whoami",
+        description="Show current user info",
+        rbac="public",
+    ),
+    # CONTACTS (5)
+    _define(
+        name="contacts_list",
+        description="List all contacts",
+        method="GET",
+        path="/contacts",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="contacts_create",
+        description="Create new contact. Only firstName is required, all other fields are optional.",
+        properties={
+            "firstName": {"type": "string", "description": "REQUIRED: First name"},
+            "lastName": {"type": "string", "description": "Optional: Last name"},
+            "email": {"type": "string", "description": "Optional: Email address"},
+            "phone": {"type": "string", "description": "Optional: Phone number"},
+            "company": {"type": "string", "description": "Optional: Company name"},
+            "jobTitle": {"type": "string", "description": "Optional: Job title"},
+            "notes": {"type": "string", "description": "Optional: Additional notes"},
+        },
+        required=["firstName"],
+        method="POST",
+        path="/contacts",
+        rbac="member",
+    ),
+    _define(
+        name="contacts_get",
+        description="Get contact by ID",
+        properties={
+            "contactId": {"type": "string"},
+        },
+        required=["contactId"],
+        method="GET",
+        path="/contacts/{contactId}",
+        rbac="member",
+    ),
+    _define(
+        name="contacts_update",
+        description="Update contact",
+        properties={
+            "contactId": {"type": "string"},
+            "firstName": {"type": "string"},
+            "lastName": {"type": "string"},
+            "email": {"type": "string"},
+            "phone": {"type": "string"},
+        },
+        required=["contactId"],
+        method="PATCH",
+        path="/contacts/{contactId}",
+        rbac="member",
+    ),
+    _define(
+        name="contacts_delete",
+        description="Delete contact (ADMIN or MANAGER)",
+        properties={
+            "contactId": {"type": "string"},
+        },
+        required=["contactId"],
+        method="DELETE",
+        path="/contacts/{contactId}",
+        rbac="manager",
+    ),
+    # DEALS (5)
+    _define(
+        name="deals_list",
+        description="List deals. Optional filters: pipelineId, stageId, contactId",
+        properties={
+            "pipelineId": {"type": "string", "description": "Optional: Only deals in this pipeline"},
+            "stageId": {"type": "string", "description": "Optional: Only deals in this stage"},
+            "contactId": {"type": "string", "description": "Optional: Only deals for this contact"},
+        },
+        method="GET",
+        path="/deals",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="deals_create",
+        description="Create new deal. MUST provide pipelineId and stageId - use pipelines_list and stages_list tools first to get valid IDs.",
+        properties={
+            "title": {"type": "string", "description": "REQUIRED: Deal title"},
+            "contactId": {"type": "string", "description": "REQUIRED: Associated contact ID"},
+            "pipelineId": {"type": "string", "description": "REQUIRED: Pipeline ID (use pipelines_list)"},
+            "stageId": {"type": "string", "description": "REQUIRED: Initial stage ID (use stages_list)"},
+            "value": {"type": "number", "description": "Optional: Deal value in dollars"},
+            "probability": {"type": "number", "description": "Optional: Win probability (0-100)"},
+            "notes": {"type": "string", "description": "Optional: Additional notes"},
+        },
+        required=["title", "contactId", "pipelineId", "stageId"],
+        method="POST",
+        path="/deals",
+        rbac="member",
+    ),
+    _define(
+        name="deals_get",
+        description="Get deal by ID",
+        properties={
+            "dealId": {"type": "string"},
+        },
+        required=["dealId"],
+        method="GET",
+        path="/deals/{dealId}",
+        rbac="member",
+    ),
+    _define(
+        name="deals_update",
+        description="Update deal",
+        properties={
+            "dealId": {"type": "string"},
+            "title": {"type": "string"},
+            "value": {"type": "number"},
+        },
+        required=["dealId"],
+        method="PATCH",
+        path="/deals/{dealId}",
+        rbac="member",
+    ),
+    _define(
+        name="deals_delete",
+        description="Delete deal",
+        properties={
+            "dealId": {"type": "string"},
+        },
+        required=["dealId"],
+        method="DELETE",
+        path="/deals/{dealId}",
+        rbac="member",
+    ),
+    # LEADS (5)
+    _define(
+        name="leads_list",
+        description="List leads. Optional filters: status, source, contactId",
+        properties={
+            "status": {"type": "string", "enum": ["NEW", "CONTACTED", "QUALIFIED", "UNQUALIFIED", "CONVERTED"], "description": "Optional: Lead status"},
+            "source": {"type": "string", "description": "Optional: Lead source"},
+            "contactId": {"type": "string", "description": "Optional: Only leads for this contact"},
+        },
+        method="GET",
+        path="/leads",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="leads_create",
+        description="Create new lead. MUST provide contactId, title, and source. Get contactId from contacts_list or contacts_search first.",
+        properties={
+            "contactId": {"type": "string", "description": "REQUIRED: ID of contact to associate with this lead. Use contacts_list to get contact IDs."},
+            "title": {"type": "string", "description": "REQUIRED: Lead title/name (min 2 chars, max 200)"},
+            "source": {"type": "string", "description": "REQUIRED: Lead source (e.g., 'Cold Call', 'Website', 'Referral')"},
+            "value": {"type": "number", "description": "Optional: Estimated deal value in dollars"},
+            "notes": {"type": "string", "description": "Optional: Additional notes"},
+        },
+        required=["contactId", "title", "source"],
+        method="POST",
+        path="/leads",
+        rbac="member",
+    ),
+    _define(
+        name="leads_update",
+        description="Update lead details like status, source, or value.",
+        properties={
+            "leadId": {"type": "string", "description": "REQUIRED: Lead ID to update"},
+            "title": {"type": "string", "description": "Optional: Lead title"},
+            "contactId": {"type": "string", "description": "Optional: Associated contact ID"},
+            "status": {"type": "string", "description": "Optional: Status (NEW, CONTACTED, QUALIFIED, UNQUALIFIED, CONVERTED)"},
+            "source": {"type": "string", "description": "Optional: Lead source"},
+            "value": {"type": "number", "description": "Optional: Estimated value in dollars"},
+            "notes": {"type": "string", "description": "Optional: Additional notes"},
+        },
+        required=["leadId"],
+        method="PATCH",
+        path="/leads/{leadId}",
+        rbac="member",
+    ),
+    _define(
+        name="leads_convert",
+        description="Convert lead to deal. Deal will inherit title and value from the lead. MUST provide pipelineId and stageId.",
+        properties={
+            "leadId": {"type": "string", "description": "REQUIRED: Lead ID to convert"},
+            "pipelineId": {"type": "string", "description": "REQUIRED: Pipeline ID (use pipelines_list)"},
+            "stageId": {"type": "string", "description": "REQUIRED: Initial stage ID (use stages_list)"},
+            "probability": {"type": "number", "description": "Optional: Win probability (0-100)"},
+            "expectedCloseDate": {"type": "string", "description": "Optional: Expected close date (ISO format)"},
+        },
+        required=["leadId", "pipelineId", "stageId"],
+        method="POST",
+        path="/leads/{leadId}/convert",
+        rbac="member",
+    ),
+    _define(
+        name="leads_delete",
+        description="Delete lead",
+        properties={
+            "leadId": {"type": "string"},
+        },
+        required=["leadId"],
+        method="DELETE",
+        path="/leads/{leadId}",
+        rbac="member",
+    ),
+    # TICKETS (5)
+    _define(
+        name="tickets_list",
+        description="List tickets. Optional filters: status, priority, assignedUserId, contactId",
+        properties={
+            "status": {"type": "string", "enum": ["OPEN", "IN_PROGRESS", "RESOLVED", "CLOSED"], "description": "Optional: Ticket status"},
+            "priority": {"type": "string", "enum": ["LOW", "MEDIUM", "HIGH", "URGENT"], "description": "Optional: Priority level"},
+            "assignedUserId": {"type": "string", "description": "Optional: Only tickets assigned to this user"},
+            "contactId": {"type": "string", "description": "Optional: Only tickets for this contact"},
+        },
+        method="GET",
+        path="/tickets",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="tickets_create",
+        description="Create ticket. Requires title, priority, source, and contactId.",
+        properties={
+            "title": {"type": "string", "description": "REQUIRED: Ticket title (min 5 characters)"},
+            "priority": {"type": "string", "enum": ["LOW", "MEDIUM", "HIGH", "URGENT"], "description": "REQUIRED: Priority level"},
+            "source": {"type": "string", "enum": ["EMAIL", "PHONE", "CHAT", "PORTAL", "WEB_FORM", "SOCIAL_MEDIA", "OTHER"], "description": "REQUIRED: Ticket source"},
+            "contactId": {"type": "string", "description": "REQUIRED: Associated contact ID"},
+            "description": {"type": "string", "description": "Optional: Ticket description"},
+            "dealId": {"type": "string", "description": "Optional: Associated deal ID"},
+            "assignedUserId": {"type": "string", "description": "Optional: User ID to assign to"},
+        },
+        required=["title", "priority", "source", "contactId"],
+        method="POST",
+        path="/tickets",
+        rbac="member",
+    ),
+    _define(
+        name="tickets_get",
+        description="Get ticket by ID",
+        properties={
+            "ticketId": {"type": "string"},
+        },
+        required=["ticketId"],
+        method="GET",
+        path="/tickets/{ticketId}",
+        rbac="member",
+    ),
+    _define(
+        name="tickets_update",
+        description="Update ticket",
+        properties={
+            "ticketId": {"type": "string"},
+            "status": {"type": "string"},
+        },
+        required=["ticketId"],
+        method="PATCH",
+        path="/tickets/{ticketId}",
+        rbac="member",
+    ),
+    _define(
+        name="tickets_delete",
+        description="Delete ticket",
+        properties={
+            "ticketId": {"type": "string"},
+        },
+        required=["ticketId"],
+        method="DELETE",
+        path="/tickets/{ticketId}",
+        rbac="member",
+    ),
+    # ANALYTICS (2 - only verified working endpoints)
+    _define(
+        name="analytics_dashboard",
+        description="Get analytics dashboard data",
+        method="GET",
+        path="/analytics/dashboard",
+        rbac="member",
+    ),
+    _define(
+        name="analytics_revenue",
+        description="Get revenue forecast analytics",
+        method="GET",
+        path="/analytics/revenue",
+        rbac="member",
+    ),
+    _define(
+        name="contacts_search",
+        description="Search contacts by query",
+        properties={
+            "query": {"type": "string"},
+        },
+        required=["query"],
+        method="GET",
+        path="/contacts/search",
+        query={"query": "q"},
+        rbac="member",
+    ),
+    _define(
+        name="deals_move",
+        description="Move deal to different stage",
+        properties={
+            "dealId": {"type": "string"},
+            "stageId": {"type": "string"},
+        },
+        required=["dealId", "stageId"],
+        method="PATCH",
+        path="/deals/{dealId}/move",
+        rbac="member",
+    ),
+    _define(
+        name="tickets_comment",
+        description="Add comment to ticket",
+        properties={
+            "ticketId": {"type": "string"},
+            "comment": {"type": "string"},
+        },
+        required=["ticketId", "comment"],
+        method="POST",
+        path="/tickets/{ticketId}/comments",
+        rbac="member",
+    ),
+    _define(
+        name="tickets_assign",
+        description="Assign ticket to user",
+        properties={
+            "ticketId": {"type": "string"},
+            "userId": {"type": "string"},
+        },
+        required=["ticketId", "userId"],
+        method="PATCH",
+        path="/tickets/{ticketId}/assign",
+        rbac="member",
+    ),
+    # USERS (5)
+    _define(
+        name="users_list",
+        description="List all workspace users",
+        method="GET",
+        path="/users",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="users_get",
+        description="Get user by ID",
+        properties={
+            "userId": {"type": "string"},
+        },
+        required=["userId"],
+        method="GET",
+        path="/users/{userId}",
+        rbac="member",
+    ),
+    _define(
+        name="users_invite",
+        description="Invite new user to workspace (ADMIN or MANAGER)",
+        properties={
+            "email": {"type": "string", "format": "email"},
+            "role": {"type": "string", "enum": ["ADMIN", "MEMBER"]},
+        },
+        required=["email", "role"],
+        method="POST",
+        path="/users/invite",
+        rbac="manager",
+    ),
+    _define(
+        name="users_update_role",
+        description="Update user role (ADMIN only)",
+        properties={
+            "userId": {"type": "string"},
+            "role": {"type": "string", "enum": ["ADMIN", "MEMBER"]},
+        },
+        required=["userId", "role"],
+        method="PATCH",
+        path="/users/{userId}/role",
+        rbac="admin",
+    ),
+    _define(
+        name="users_deactivate",
+        description="Deactivate user (ADMIN only)",
+        properties={
+            "userId": {"type": "string"},
+        },
+        required=["userId"],
+        method="DELETE",
+        path="/users/{userId}",
+        rbac="admin",
+    ),
+    # PIPELINES (4)
+    _define(
+        name="pipelines_list",
+        description="List all pipelines",
+        method="GET",
+        path="/pipelines",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="pipelines_create",
+        description="Create pipeline",
+        properties={
+            "name": {"type": "string"},
+            "description": {"type": "string"},
+        },
+        required=["name"],
+        method="POST",
+        path="/pipelines",
+        rbac="member",
+    ),
+    _define(
+        name="pipelines_update",
+        description="Update pipeline",
+        properties={
+            "pipelineId": {"type": "string"},
+            "name": {"type": "string"},
+            "description": {"type": "string"},
+        },
+        required=["pipelineId"],
+        method="PATCH",
+        path="/pipelines/{pipelineId}",
+        rbac="member",
+    ),
+    _define(
+        name="pipelines_delete",
+        description="Delete pipeline",
+        properties={
+            "pipelineId": {"type": "string"},
+        },
+        required=["pipelineId"],
+        method="DELETE",
+        path="/pipelines/{pipelineId}",
+        rbac="member",
+    ),
+    # STAGES (3)
+    _define(
+        name="stages_list",
+        description="List stages in pipeline",
+        properties={
+            "pipelineId": {"type": "string"},
+        },
+        required=["pipelineId"],
+        method="GET",
+        path="/stages",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="stages_create",
+        description="Create stage in pipeline",
+        properties={
+            "pipelineId": {"type": "string"},
+            "name": {"type": "string"},
+            "order": {"type": "number"},
+        },
+        required=["pipelineId", "name"],
+        method="POST",
+        path="/stages",
+        rbac="member",
+    ),
+    _define(
+        name="stages_update",
+        description="Update stage",
+        properties={
+            "stageId": {"type": "string"},
+            "name": {"type": "string"},
+            "order": {"type": "number"},
+        },
+        required=["stageId"],
+        method="PATCH",
+        path="/stages/{stageId}",
+        rbac="member",
+    ),
+    # RESOLVE (1 - local name -> ID index)
+    _define(
+        name="resolve",
+        description=(
+            "Find IDs by name without listing: contact (name or email), company, pipeline or stage. "
+            "Answers from a local index and falls back to one backend lookup on a miss. "
+            "Use it before get/update/delete calls instead of *_list or contacts_search."
+        ),
+        properties={
+            "type": {"type": "string", "enum": ["contact", "company", "pipeline", "stage"]},
+            "query": {"type": "string", "description": "Name, email or company as the user wrote it"},
+            "pipelineId": {"type": "string", "description": "Only stages of this pipeline"},
+        },
+        required=["type", "query"],
+        rbac="member",
+        read_only=True,
+    ),
+    # BATCH (1 - runs other tools in one round trip)
+    _define(
+        name="batch_call",
+        description=(
+            "Run several tools in one call, in order. Reads without dependencies run in parallel. "
+            "Later calls can use earlier results by setting an argument to exactly \"$<index>.<field>\", "
+            "e.g. \"$0.0.id\" for the first contacts_search match of call 0, or \"$1.items.0.id\" for "
+            "the first item of a *_list page. Text that merely contains $ is passed as is; "
+            "write \"$$0.id\" to send the literal \"$0.id\"."
+        ),
+        properties={
+            "calls": {
+                "type": "array",
+                "description": "Ordered tool calls",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "tool_name": {"type": "string"},
+                        "arguments": {"type": "object"},
+                    },
+                    "required": ["tool_name"],
+                },
+            },
+        },
+        required=["calls"],
+        rbac="member",
+    ),
+    # PORTAL (3 - only working endpoints)
+    _define(
+        name="portal_customers_list",
+        description="List portal customers",
+        method="GET",
+        path="/portal/customers",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="portal_tickets_list",
+        description="List customer portal tickets",
+        method="GET",
+        path="/portal/tickets",
+        paginate=True,
+        rbac="member",
+    ),
+    _define(
+        name="portal_tickets_create",
+        description="Create ticket from portal",
+        properties={
+            "title": {"type": "string"},
+            "description": {"type": "string"},
+        },
+        required=["title"],
+        method="POST",
+        path="/portal/tickets",
+        rbac="member",
+    ),
+)
+
+def _check_rbac(specs: Tuple[ToolSpec, ...]) -> None:
+    """
+    Refuse to load specs whose RBAC class disagrees with rbac.py
+
+    rbac.py decides access; a spec disagreeing with it is a definition bug.
+    Raised at import (not asserted) so it also holds under python -O.
+    """
+    for spec in specs:
+        expected = rbac_class(spec.name)
+        if spec.rbac_class not in ("public", expected) or (spec.rbac_class == "public" and expected != "member"):
+            raise ValueError(f"RBAC class of {spec.name} ({spec.rbac_class}) disagrees with rbac.py ({expected})")
+
+
+_check_rbac(_SPECS)
+
+
+# ==================== COMPILED VIEWS ====================
+
+# O(1) dispatch: tool name -> spec
+TOOL_REGISTRY: Mapping[str, ToolSpec] = MappingProxyType({spec.name: spec for spec in _SPECS})
+
+# Pre-serialized /mcp/tools body and its ETag
+TOOLS_JSON: bytes = json.dumps(
+    {
+        "tools": [
+            {"name": spec.name, "description": spec.description, "inputSchema": thaw(spec.input_schema)}
+            for spec in _SPECS
+        ]
+    },
+    separators=(",", ":"),
+    ensure_ascii=False,
+).encode("utf-8")
+TOOLS_ETAG: str = f'"{hashlib.sha256(TOOLS_JSON).hexdigest()[:32]}"'
+
+# MCP Tool objects for list_tools, built once. Their schemas are plain copies,
+# so nothing done to them can reach the frozen specs or drift from TOOLS_ETAG;
+# they are shared by every session and must not be modified.
+TOOLS: Tuple[Tool, ...] = tuple(
+    Tool.model_construct(name=spec.name, description=spec.description, inputSchema=thaw(spec.input_schema))
+    for spec in _SPECS
+)
+
+
+def get_spec(name: str) -> Optional[ToolSpec]:
+    """Look up a tool definition by name"""
+    return TOOL_REGISTRY.get(name)
@@ -4,6 +4,8 @@ Complete Tool List for Synapse CRM MCP Server
 Updated: December 3, 2025
 """
 
+from rbac import ToolPermissions
+
 COMPLETE_TOOL_LIST = {
     # ==================== AUTHENTICATION (3) ====================
     "AUTH": [
@@ -18,7 +20,7 @@ COMPLETE_TOOL_LIST = {
         "contacts_create",  # Create new contact
         "contacts_get",  # Get contact by ID
         "contacts_update",  # Update contact
-        "contacts_delete",  # Delete contact (ADMIN only)
+        "contacts_delete",  # Delete contact (ADMIN or MANAGER)
         "contacts_search",  # Search contacts by query
     ],
     
@@ -28,7 +30,7 @@ COMPLETE_TOOL_LIST = {
         "deals_create",  # Create new deal
         "deals_get",  # Get deal by ID
         "deals_update",  # Update deal
-        "deals_delete",  # Delete deal (ADMIN only)
+        "deals_delete",  # Delete deal
         "deals_move",  # Move deal to different stage
     ],
     
@@ -38,7 +40,7 @@ COMPLETE_TOOL_LIST = {
         "leads_create",  # Create new lead
         "leads_get",  # Get lead by ID
         "leads_update",  # Update lead
-        "leads_delete",  # Delete lead (ADMIN only)
+        "leads_delete",  # Delete lead
         "leads_convert",  # Convert lead to deal
     ],
     
@@ -48,15 +50,15 @@ COMPLETE_TOOL_LIST = {
         "tickets_create",  # Create new ticket
         "tickets_get",  # Get ticket by ID
         "tickets_update",  # Update ticket
-        "tickets_delete",  # Delete ticket (ADMIN only)
+        "tickets_delete",  # Delete ticket
         "tickets_comment",  # Add comment to ticket
     ],
     
-    # ==================== USERS (5 - ADMIN ONLY) ====================
+    # ==================== USERS (5) ====================
     "USERS": [
-        "users_list",  # List all workspace users (ADMIN)
-        "users_get",  # Get user by ID (ADMIN)
-        "users_invite",  # Invite new user to workspace (ADMIN)
+        "users_list",  # List all workspace users
+        "users_get",  # Get user by ID
+        "users_invite",  # Invite new user to workspace (ADMIN or MANAGER)
         "users_update_role",  # Update user role (ADMIN)
         "users_deactivate",  # Deactivate user (ADMIN)
     ],
@@ -64,16 +66,16 @@ COMPLETE_TOOL_LIST = {
     # ==================== PIPELINES (4) ====================
     "PIPELINES": [
         "pipelines_list",  # List all pipelines
-        "pipelines_create",  # Create pipeline (ADMIN)
-        "pipelines_update",  # Update pipeline (ADMIN)
-        "pipelines_delete",  # Delete pipeline (ADMIN)
+        "pipelines_create",  # Create pipeline
+        "pipelines_update",  # Update pipeline
+        "pipelines_delete",  # Delete pipeline
     ],
     
     # ==================== STAGES (3) ====================
     "STAGES": [
         "stages_list",  # List stages in pipeline (query param: ?pipelineId=X)
-        "stages_create",  # Create stage in pipeline (ADMIN)
-        "stages_update",  # Update stage (ADMIN)
+        "stages_create",  # Create stage in pipeline
+        "stages_update",  # Update stage
     ],
     
     # ==================== ANALYTICS (2) ====================
@@ -89,7 +91,17 @@ COMPLETE_TOOL_LIST = {
         "portal_tickets_create",  # Create ticket from portal
     ],
     
-    # Total: 3 + 6 + 6 + 6 + 6 + 5 + 4 + 3 + 2 + 3 = 43 tools
+    # ==================== BATCH (1) ====================
+    "BATCH": [
+        "batch_call",  # Run several tools in one round trip ($N.field references)
+    ],
+    
+    # ==================== RESOLVE (1) ====================
+    "RESOLVE": [
+        "resolve",  # Name/email/company -> IDs from the local entity index
+    ],
+    
+    # Total: 3 + 6 + 6 + 6 + 6 + 5 + 4 + 3 + 2 + 3 + 1 + 1 = 45 tools
 }
 
 # ==================== REMOVED TOOLS (No Backend Support) ====================
@@ -117,31 +129,12 @@ REMOVED_TOOLS = {
 }
 
 # ==================== RBAC CONFIGURATION ====================
-ADMIN_ONLY_TOOLS = [
-    # Delete operations
-    "contacts_delete", "deals_delete", "leads_delete", "tickets_delete",
-    # User management
-    "users_list", "users_get", "users_invite", "users_update_role", "users_deactivate",
-    # Pipeline configuration
-    "pipelines_create", "pipelines_update", "pipelines_delete",
-    "stages_create", "stages_update",
-]
+# Derived from rbac.ToolPermissions (the single source of truth) for catalog tools
+
+_CATALOG_TOOLS = frozenset(tool for tools in COMPLETE_TOOL_LIST.values() for tool in tools)
+
+MEMBER_ALLOWED_TOOLS = [tool for tool in ToolPermissions.MEMBER_ALLOWED if tool in _CATALOG_TOOLS]
+
+MANAGER_ALLOWED_TOOLS = [tool for tool in ToolPermissions.MANAGER_ALLOWED if tool in _CATALOG_TOOLS]
 
-MEMBER_ALLOWED_TOOLS = [
-    # Auth (everyone)
-    "login", "logout", "whoami",
-    # Read operations
-    "contacts_list", "contacts_get", "contacts_search",
-    "deals_list", "deals_get",
-    "leads_list", "leads_get",
-    "tickets_list", "tickets_get",
-    "pipelines_list", "stages_list",
-    "analytics_dashboard", "analytics_revenue",
-    "portal_customers_list", "portal_tickets_list",
-    # Create operations
-    "contacts_create", "deals_create", "leads_create", "tickets_create",
-    "portal_tickets_create",
-    # Update operations
-    "contacts_update", "deals_update", "deals_move", "leads_update", "tickets_update",
-    "tickets_comment", "leads_convert",
-]
+ADMIN_ONLY_TOOLS = [tool for tool in ToolPermissions.ADMIN_ONLY if tool in _CATALOG_TOOLS]
@@ -0,0 +1,212 @@
+"""
+Privacy-Safe Tool-Call Transcripts
+Records conversation-shaped tool-call sequences for load replay
+
+With MCP_TRANSCRIPT_PATH set, every tool call is appended to a JSONL file
+as one event: an anonymous conversation id, the step number, the offset
+from the conversation start, the tool, the call duration and outcome, and
+the *shape* of the arguments - never their values:
+
+- IDs become per-conversation placeholders (<id:0>, <id:1>, ...) so a
+  replay can see that deals_create reused the contact found two steps earlier
+- free text becomes <text:LENGTH>, amounts become <num:ORDER OF MAGNITUDE>
+- schema enums (status, priority, ...), paging arguments and batch
+  references ($0.0.id as a whole argument of a batch_call step) are kept
+  as they are; any other text starting with $ is free text
+
+A conversation is a session subject's calls until it is idle for
+MCP_TRANSCRIPT_IDLE_SECONDS. benchmarks.bench_replay replays the file.
+"""
+
+import os
+import hmac
+import math
+import hashlib
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from batch import is_reference
+from serialization import dumps_bytes
+
+logger = logging.getLogger(__name__)
+
+# Arguments recorded verbatim (paging and ordering carry no user data)
+KEEP_ARGS = frozenset({"limit", "cursor", "sort", "fields", "order", "probability", "type"})
+
+
+@dataclass
+class Conversation:
+    """Recording state of one session subject"""
+    id: str
+    started: float
+    last_seen: float
+    sampled: bool
+    steps: int = 0
+    ids: Dict[str, int] = field(default_factory=dict)   # raw id value -> placeholder number
+
+
+class TranscriptRecorder:
+    """
+    Appends sanitized tool-call events to a JSONL file
+
+    Each event is written with one os.write on an O_APPEND descriptor, so
+    several workers can share the file without interleaving lines.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        sample: float = 1.0,
+        idle_seconds: float = 300,
+        salt: Optional[str] = None,
+        max_conversations: int = 10000,
+    ):
+        self.path = path
+        self.enabled = bool(path)
+        self.sample = sample
+        self.idle_seconds = idle_seconds
+        self.salt = (salt or os.urandom(16).hex()).encode("utf-8")
+        self.max_conversations = max_conversations
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._fd: Optional[int] = None
+        self.recorded = 0
+
+    @classmethod
+    def from_env(cls) -> "TranscriptRecorder":
+        return cls(
+            path=os.getenv("MCP_TRANSCRIPT_PATH") or None,
+            sample=float(os.getenv("MCP_TRANSCRIPT_SAMPLE", "1.0")),
+            idle_seconds=float(os.getenv("MCP_TRANSCRIPT_IDLE_SECONDS", "300")),
+            salt=os.getenv("MCP_TRANSCRIPT_SALT") or None,
+        )
+
+    # ==================== RECORDING ====================
+
+    def record(
+        self,
+        subject: str,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        transport: str,
+        started: float,
+        duration: float,
+        ok: bool,
+        result_bytes: int,
+        schema: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """
+        Append one tool call (no-op when disabled or not sampled)
+
+        Args:
+            subject: Session subject (hashed again with the salt before writing)
+            started: time.time() when the call began
+            schema: Tool input schema, used to keep enum values
+        """
+        if not self.enabled:
+            return
+        conversation = self._conversation(subject, started)
+        if not conversation.sampled:
+            return
+
+        properties = (schema or {}).get("properties", {})
+        event = {
+            "conversation": conversation.id,
+            "step": conversation.steps,
+            "offset_ms": round((started - conversation.started) * 1000, 1),
+            "tool": tool_name,
+            "transport": transport,
+            "args": {
+                key: self._shape(key, value, conversation, properties.get(key))
+                for key, value in arguments.items()
+                if key != "jwt"
+            },
+            "duration_ms": round(duration * 1000, 2),
+            "ok": ok,
+            "result_bytes": result_bytes,
+        }
+        conversation.steps += 1
+        self._write(dumps_bytes(event, pretty=False) + b"\n")
+
+    def _conversation(self, subject: str, now: float) -> Conversation:
+        conversation = self._conversations.get(subject)
+        if conversation is None or now - conversation.last_seen > self.idle_seconds:
+            digest = hmac.new(self.salt, f"{subject}:{now}".encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+            sampled = int(digest[:8], 16) / 0xFFFFFFFF < self.sample
+            conversation = Conversation(id=digest, started=now, last_seen=now, sampled=sampled)
+            self._conversations[subject] = conversation
+            while len(self._conversations) > self.max_conversations:
+                self._conversations.popitem(last=False)
+        conversation.last_seen = now
+        self._conversations.move_to_end(subject)
+        return conversation
+
+    def _shape(
+        self,
+        key: str,
+        value: Any,
+        conversation: Conversation,
+        schema: Optional[Dict[str, Any]],
+        in_batch: bool = False,
+    ) -> Any:
+        """
+        Replace a value with a placeholder that keeps its role but not its content
+
+        Args:
+            in_batch: value is an argument of a batch_call step, where a
+                whole-value reference ($0.0.id) is kept
+        """
+        if value is None or isinstance(value, bool):
+            return value
+        if schema and value in schema.get("enum", ()):
+            return value
+        if key in KEEP_ARGS:
+            return value
+        if isinstance(value, str):
+            if in_batch and is_reference(value):
+                return value  # batch reference to an earlier result
+            if key.endswith("Id") or key == "id":
+                number = conversation.ids.setdefault(value, len(conversation.ids))
+                return f"<id:{number}>"
+            return f"<text:{len(value)}>"
+        if isinstance(value, (int, float)):
+            magnitude = 10 ** round(math.log10(abs(value))) if value else 0
+            return f"<num:{magnitude:g}>"
+        if isinstance(value, list):
+            if key == "calls":
+                return [
+                    {
+                        "tool_name": call.get("tool_name"),
+                        "arguments": {
+                            k: self._shape(k, v, conversation, None, in_batch=True)
+                            for k, v in (call.get("arguments") or {}).items()
+                            if k != "jwt"
+                        },
+                    }
+                    for call in value if isinstance(call, dict)
+                ]
+            return f"<list:{len(value)}>"
+        return "<object>"
+
+    def _write(self, line: bytes) -> None:
+        try:
+            if self._fd is None:
+                self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+            os.write(self._fd, line)
+            self.recorded += 1
+        except OSError as e:
+            logger.error(f"❌ Transcript recording disabled: {e}")
+            self.enabled = False
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "recorded": self.recorded,
+            "conversations": len(self._conversations),
+        }